@@ -1,6 +1,9 @@
+import heapq
 import json
+import random
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Set
@@ -246,44 +249,67 @@ class AccountErrorTracker:
             self.disabled_accounts = set()
         if self.last_success is None:
             self.last_success = {}
+        self._lock = threading.Lock()
     
     def record_error(self, account_name: str) -> bool:
-        current_errors = self.error_counts.get(account_name, 0) + 1
-        self.error_counts[account_name] = current_errors
+        with self._lock:
+            current_errors = self.error_counts.get(account_name, 0) + 1
+            self.error_counts[account_name] = current_errors
+            disabled = current_errors >= self.max_errors
+            if disabled:
+                self.disabled_accounts.add(account_name)
         
         logger.warning(f"[{account_name}] Ошибка #{current_errors}")
         
-        if current_errors >= self.max_errors:
-            self.disabled_accounts.add(account_name)
+        if disabled:
             logger.error(f"[{account_name}] Достигнут лимит ошибок ({self.max_errors}). Аккаунт отключен.")
             return True
         
         return False
     
     def record_success(self, account_name: str):
-        if account_name in self.error_counts and self.error_counts[account_name] > 0:
-            old_count = self.error_counts[account_name]
-            self.error_counts[account_name] = 0
-            logger.info(f"[{account_name}] Ошибки сброшены после успешного выполнения (было {old_count})")
+        with self._lock:
+            old_count = self.error_counts.get(account_name, 0)
+            if old_count > 0:
+                self.error_counts[account_name] = 0
+            self.last_success[account_name] = time.time()
         
-        self.last_success[account_name] = time.time()
+        if old_count > 0:
+            logger.info(f"[{account_name}] Ошибки сброшены после успешного выполнения (было {old_count})")
     
     def reset_account(self, account_name: str):
-        if account_name in self.error_counts:
-            self.error_counts[account_name] = 0
-        if account_name in self.disabled_accounts:
-            self.disabled_accounts.remove(account_name)
+        with self._lock:
+            if account_name in self.error_counts:
+                self.error_counts[account_name] = 0
+            self.disabled_accounts.discard(account_name)
         logger.info(f"[{account_name}] Аккаунт снова включен в автоматизацию")
     
     def is_disabled(self, account_name: str) -> bool:
-        return account_name in self.disabled_accounts
+        with self._lock:
+            return account_name in self.disabled_accounts
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'disabled_accounts': list(self.disabled_accounts),
+                'error_counts': dict(self.error_counts),
+                'last_success': dict(self.last_success),
+            }
 
 
 class BackgroundAutomationService:
     
-    def __init__(self):
+    DEFAULT_MAX_WORKERS = 8
+    JITTER_RATIO = 0.1
+    PAUSE_POLL_INTERVAL = 1.0
+    BATCH_WINDOW = 2.0
+    PREFETCH_TIMEOUT = 15.0
+    CONFIRMATION_CONSUMER = 'background_automation'
+    
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
         self.settings_manager = AutoSettingsManager()
         self.error_tracker = AccountErrorTracker()
+        self.max_workers = max(1, max_workers)
         
         self.is_running = False
         self.is_paused = False
@@ -292,6 +318,8 @@ class BackgroundAutomationService:
         
         self._last_check_times: Dict[str, float] = {}
         self._trade_managers: Dict[str, Any] = {}  
+        self._trade_managers_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
         self._stats = {
             'total_checks': 0,
             'successful_checks': 0,
@@ -376,59 +404,132 @@ class BackgroundAutomationService:
             self.is_paused = False
             logger.info("▶️ Автоматизация возобновлена")
     
+    def _increment_stat(self, key: str, amount: int = 1):
+        with self._stats_lock:
+            self._stats[key] += amount
+    
+    def _jitter(self, interval: float) -> float:
+        return random.uniform(0, interval * self.JITTER_RATIO)
+    
     def _automation_loop(self, enabled_accounts: List[str]):
-        logger.info(f"Запуск цикла автоматизации для аккаунтов: {enabled_accounts}")
+        logger.info(f"Запуск цикла автоматизации для аккаунтов: {enabled_accounts} "
+                    f"(потоков: {self.max_workers})")
         
-        while not self._stop_event.is_set():
-            try:
+        schedule = []
+        in_flight: Dict[str, Any] = {}
+        sequence = 0
+        
+        start_time = time.monotonic()
+        for account_name in dict.fromkeys(enabled_accounts):
+            settings = self.settings_manager.load_settings(account_name)
+            heapq.heappush(schedule, (start_time + self._jitter(settings.check_interval), sequence, account_name))
+            sequence += 1
+        
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="AutomationWorker")
+        
+        try:
+            while not self._stop_event.is_set() and schedule:
                 if self.is_paused:
-                    time.sleep(1)
+                    self._stop_event.wait(self.PAUSE_POLL_INTERVAL)
                     continue
                 
-                current_time = time.time()
-                processed_in_cycle = False
+                due_time, _, account_name = schedule[0]
+                delay = due_time - time.monotonic()
+                if delay > 0:
+                    self._stop_event.wait(delay)
+                    continue
                 
-                active_accounts = [acc for acc in enabled_accounts 
-                                 if not self.error_tracker.is_disabled(acc)]
+                due = []
+                batch_until = time.monotonic() + self.BATCH_WINDOW
+                while schedule and schedule[0][0] <= batch_until:
+                    due.append(heapq.heappop(schedule))
                 
-                for account_name in active_accounts:
-                    if self._stop_event.is_set():
-                        break
-                    
+                ready = []
+                for due_time, _, account_name in due:
                     try:
                         settings = self.settings_manager.load_settings(account_name)
+                        next_due = max(due_time + settings.check_interval, time.monotonic()) + self._jitter(settings.check_interval)
+                        heapq.heappush(schedule, (next_due, sequence, account_name))
+                        sequence += 1
+                        
+                        if self.error_tracker.is_disabled(account_name):
+                            continue
+                        
+                        future = in_flight.get(account_name)
+                        if future is not None and not future.done():
+                            logger.warning(f"[{account_name}] ⏭️ Предыдущая проверка еще выполняется, пропускаем цикл")
+                            continue
+                        
+                        ready.append((account_name, settings))
                         
-                        last_check = self._last_check_times.get(account_name, 0)
-                        if (current_time - last_check) >= settings.check_interval:
-                            
-                            logger.info(f"[{account_name}] 🔄 Время проверки (интервал: {settings.check_interval}с)")
-                            
-                            self._process_account_automation(account_name, settings)
-                            
-                            self._last_check_times[account_name] = time.time()
-                            processed_in_cycle = True
-                            
-                            time.sleep(2)
-                    
                     except Exception as e:
-                        logger.error(f"[{account_name}] ❌ Ошибка обработки аккаунта: {e}")
+                        logger.error(f"[{account_name}] ❌ Ошибка планирования проверки: {e}")
                         self.error_tracker.record_error(account_name)
-                        self._stats['failed_checks'] += 1
-                
-                if not processed_in_cycle:
-                    time.sleep(5)
-                else:
-                    time.sleep(1)
+                        self._increment_stat('failed_checks')
                 
-                self._stats['total_checks'] += 1
+                trade_offers = self._prefetch_trade_offers(
+                    [account_name for account_name, settings in ready if settings.auto_accept_gifts]
+                )
+                if self._stop_event.is_set():
+                    break
                 
-            except Exception as e:
-                logger.error(f"❌ Критическая ошибка в цикле автоматизации: {e}")
-                time.sleep(10)  
+                for account_name, settings in ready:
+                    logger.info(f"[{account_name}] 🔄 Время проверки (интервал: {settings.check_interval}с)")
+                    self._increment_stat('total_checks')
+                    in_flight[account_name] = executor.submit(
+                        self._run_account_check, account_name, settings, trade_offers.get(account_name)
+                    )
+                    
+        except Exception as e:
+            logger.error(f"❌ Критическая ошибка в цикле автоматизации: {e}")
+        finally:
+            for future in in_flight.values():
+                future.cancel()
+            executor.shutdown(wait=False)
         
         logger.info("🏁 Цикл автоматизации завершен")
     
-    def _process_account_automation(self, account_name: str, settings: AutoSettings):
+    def _prefetch_trade_offers(self, account_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not account_names:
+            return {}
+        
+        trade_manager = self._get_trade_manager(account_names[0])
+        if not trade_manager:
+            return {}
+        
+        # Вход в аккаунт выполняется в воркере, здесь берем только уже авторизованные
+        account_names = [name for name in account_names if trade_manager.is_account_logged_in(name)]
+        if not account_names:
+            return {}
+        
+        try:
+            results = trade_manager.get_trade_offers_many(account_names, timeout=self.PREFETCH_TIMEOUT)
+        except Exception as e:
+            logger.error(f"❌ Ошибка пакетного получения трейдов: {e}")
+            return {}
+        
+        return {
+            account_name: result['offers']
+            for account_name, result in results.items()
+            if result.get('success')
+        }
+    
+    def _run_account_check(self, account_name: str, settings: AutoSettings,
+                           trade_offers: Optional[Dict[str, Any]] = None):
+        if self._stop_event.is_set():
+            return
+        
+        try:
+            self._process_account_automation(account_name, settings, trade_offers)
+        except Exception as e:
+            logger.error(f"[{account_name}] ❌ Ошибка обработки аккаунта: {e}")
+            self.error_tracker.record_error(account_name)
+            self._increment_stat('failed_checks')
+        finally:
+            self._last_check_times[account_name] = time.time()
+    
+    def _process_account_automation(self, account_name: str, settings: AutoSettings,
+                                    trade_offers: Optional[Dict[str, Any]] = None):
         try:
             trade_manager = self._get_trade_manager(account_name)
             if not trade_manager:
@@ -442,31 +543,46 @@ class BackgroundAutomationService:
             
             if settings.auto_accept_gifts:
                 try:
-                    result = trade_manager.auto_accept_gifts(account_name)
-                    if result.get('status') == 'success':
-                        gifts_count = result.get('accepted_count', 0)
+                    result = trade_manager.auto_accept_gifts(account_name, trade_offers)
+                    if result.get('success'):
+                        gifts_count = result.get('stats', {}).get('accepted_trades', 0)
                         if gifts_count > 0:
                             logger.info(f"[{account_name}] 🎁 Принято подарков: {gifts_count}")
-                            self._stats['gifts_accepted'] += gifts_count
+                            self._increment_stat('gifts_accepted', gifts_count)
                         success_count += 1
                 except Exception as e:
                     logger.error(f"[{account_name}] ❌ Ошибка принятия подарков: {e}")
             
             if settings.auto_confirm_trades:
                 try:
-                    result = trade_manager.auto_confirm_trades(account_name)
-                    if result.get('status') == 'success':
-                        trades_count = result.get('confirmed_count', 0)
-                        if trades_count > 0:
-                            logger.info(f"[{account_name}] 🔑 Подтверждено трейдов: {trades_count}")
-                            self._stats['trades_confirmed'] += trades_count
+                    changes = trade_manager.get_confirmation_changes(account_name, self.CONFIRMATION_CONSUMER)
+                    new_confirmations = changes.get('added', []) if changes.get('success') else None
+                    
+                    if new_confirmations == []:
                         success_count += 1
+                    else:
+                        result = trade_manager.auto_confirm_trades(account_name)
+                        if result.get('success'):
+                            trades_count = result.get('confirmed_count', 0)
+                            if trades_count > 0:
+                                logger.info(f"[{account_name}] 🔑 Подтверждено трейдов: {trades_count}")
+                                self._increment_stat('trades_confirmed', trades_count)
+                            success_count += 1
+                        
+                        # Обработанными считаем только подтверждения реально подтвержденных трейдов,
+                        # остальные отпускаем, чтобы они вернулись в следующем цикле
+                        confirmed_offers = {str(offer_id) for offer_id in result.get('confirmed_offer_ids', [])}
+                        for conf in new_confirmations or []:
+                            if str(conf.get('creator_id')) in confirmed_offers:
+                                trade_manager.mark_confirmation_processed(account_name, conf['id'], self.CONFIRMATION_CONSUMER)
+                            else:
+                                trade_manager.release_confirmation(account_name, conf['id'], self.CONFIRMATION_CONSUMER)
                 except Exception as e:
                     logger.error(f"[{account_name}] ❌ Ошибка подтверждения трейдов: {e}")
             
             if success_count > 0:
                 self.error_tracker.record_success(account_name)
-                self._stats['successful_checks'] += 1
+                self._increment_stat('successful_checks')
                 logger.info(f"[{account_name}] ✅ Автоматизация выполнена успешно")
             else:
                 logger.warning(f"[{account_name}] ⚠️ Ни одна операция не выполнена")
@@ -477,13 +593,14 @@ class BackgroundAutomationService:
     
     def _get_trade_manager(self, account_name: str):
         try:
-            if account_name in self._trade_managers:
-                return self._trade_managers[account_name]
-            
-            from pysda.simple_integration import SimpleTradeManager
-            trade_manager = SimpleTradeManager()
-            
-            self._trade_managers[account_name] = trade_manager
+            with self._trade_managers_lock:
+                if account_name in self._trade_managers:
+                    return self._trade_managers[account_name]
+                
+                from pysda.simple_integration import SimpleTradeManager
+                trade_manager = SimpleTradeManager()
+                
+                self._trade_managers[account_name] = trade_manager
             
             logger.info(f"[{account_name}] ✅ Менеджер трейдов создан и закэширован")
             return trade_manager
@@ -494,18 +611,23 @@ class BackgroundAutomationService:
     
     def get_status(self) -> Dict[str, Any]:
         uptime = time.time() - self._stats['start_time'] if self._stats['start_time'] else 0
+        errors = self.error_tracker.snapshot()
         
         return {
             'is_running': self.is_running,
             'is_paused': self.is_paused,
             'uptime_seconds': uptime,
             'enabled_accounts': [],  
-            'disabled_accounts': list(self.error_tracker.disabled_accounts),
-            'error_counts': dict(self.error_tracker.error_counts),
-            'stats': self._stats.copy(),
+            'disabled_accounts': errors['disabled_accounts'],
+            'error_counts': errors['error_counts'],
+            'stats': self._snapshot_stats(),
             'last_check_times': dict(self._last_check_times)
         }
     
+    def _snapshot_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return self._stats.copy()
+    
     def reset_account_errors(self, account_name: str):
         self.error_tracker.reset_account(account_name)
         logger.info(f"[{account_name}] 🔄 Ошибки сброшены, аккаунт включен")
@@ -0,0 +1,145 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from core.settings_manager import get_application_path
+
+
+DescriptionKey = Tuple[str, str, str]
+
+
+def make_key(app_id, description: Dict[str, Any]) -> DescriptionKey:
+    return str(description.get('appid', app_id)), str(description['classid']), str(description.get('instanceid', '0'))
+
+
+class DescriptionStore:
+    FILENAME = 'descriptions.db'
+    MAX_MEMORY = 50000
+    FLUSH_DELAY = 5.0
+    FLUSH_THRESHOLD = 2000
+
+    def __init__(self, directory: Optional[str] = None, max_memory: int = MAX_MEMORY,
+                 flush_delay: float = FLUSH_DELAY):
+        self.directory = directory or os.path.join(get_application_path(), 'data', 'cache')
+        self.path = os.path.join(self.directory, self.FILENAME)
+        self.max_memory = max_memory
+        self.flush_delay = flush_delay
+        self._descriptions: 'OrderedDict[DescriptionKey, Dict[str, Any]]' = OrderedDict()
+        self._dirty: Dict[DescriptionKey, Dict[str, Any]] = {}
+        self._flush_timer: Optional[threading.Timer] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS descriptions ('
+                ' appid TEXT NOT NULL,'
+                ' classid TEXT NOT NULL,'
+                ' instanceid TEXT NOT NULL,'
+                ' data TEXT NOT NULL,'
+                ' PRIMARY KEY (appid, classid, instanceid))'
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _remember(self, key: DescriptionKey, description: Dict[str, Any]):
+        self._descriptions[key] = description
+        self._descriptions.move_to_end(key)
+        while len(self._descriptions) > self.max_memory:
+            self._descriptions.popitem(last=False)
+
+    def intern(self, app_id, description: Dict[str, Any]) -> Dict[str, Any]:
+        key = make_key(app_id, description)
+        with self._lock:
+            cached = self._descriptions.get(key)
+            if cached is not None and (cached is description or cached == description):
+                self._descriptions.move_to_end(key)
+                return cached
+            self._remember(key, description)
+            self._dirty[key] = description
+            return description
+
+    def intern_many(self, app_id, descriptions: Iterable[Dict[str, Any]]) -> Dict[DescriptionKey, Dict[str, Any]]:
+        interned = {}
+        for description in descriptions:
+            description = self.intern(app_id, description)
+            interned[make_key(app_id, description)] = description
+        self._schedule_flush()
+        return interned
+
+    def get(self, app_id, class_id, instance_id='0') -> Optional[Dict[str, Any]]:
+        key = (str(app_id), str(class_id), str(instance_id or '0'))
+        with self._lock:
+            description = self._descriptions.get(key) or self._dirty.get(key)
+            if description is not None:
+                self._remember(key, description)
+                return description
+
+            try:
+                row = self._connection().execute(
+                    'SELECT data FROM descriptions WHERE appid = ? AND classid = ? AND instanceid = ?', key
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+            if row is None:
+                return None
+
+            description = json.loads(row[0])
+            self._remember(key, description)
+            return description
+
+    def _schedule_flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            if len(self._dirty) >= self.FLUSH_THRESHOLD:
+                self.flush()
+                return
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self):
+        with self._lock:
+            timer, self._flush_timer = self._flush_timer, None
+            if timer is not None:
+                timer.cancel()
+            if not self._dirty:
+                return
+            rows = [(*key, json.dumps(description, ensure_ascii=False)) for key, description in self._dirty.items()]
+            try:
+                conn = self._connection()
+                with conn:
+                    conn.executemany(
+                        'INSERT OR REPLACE INTO descriptions (appid, classid, instanceid, data) VALUES (?, ?, ?, ?)',
+                        rows
+                    )
+                self._dirty.clear()
+            except sqlite3.Error as e:
+                print(f"Ошибка сохранения кэша описаний: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._descriptions)
+
+
+_store: Optional[DescriptionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_description_store() -> DescriptionStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DescriptionStore()
+            atexit.register(_store.flush)
+        return _store
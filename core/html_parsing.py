@@ -0,0 +1,113 @@
+import re
+from typing import Any, List, Optional
+
+from bs4 import BeautifulSoup
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+try:
+    import lxml
+except ImportError:
+    lxml = None
+
+
+SOUP_FEATURES = 'lxml' if lxml is not None else 'html.parser'
+BACKEND = 'selectolax' if HTMLParser is not None else SOUP_FEATURES
+
+TAG_RE = re.compile(r'<[^>]+>')
+SPACE_RE = re.compile(r'\s+')
+
+
+def make_soup(html: str, features: Optional[str] = None) -> BeautifulSoup:
+    return BeautifulSoup(html, features or SOUP_FEATURES)
+
+
+def strip_tags(fragment: str) -> str:
+    return SPACE_RE.sub(' ', TAG_RE.sub(' ', fragment)).strip()
+
+
+def search(pattern, text: str, group: int = 1, flags: int = 0) -> Optional[str]:
+    match = re.search(pattern, text, flags)
+    return match.group(group) if match else None
+
+
+def element_block(html: str, class_name: str, limit: int = 4000) -> Optional[str]:
+    match = re.search(r'<(\w+)[^>]*class="[^"]*\b' + re.escape(class_name) + r'\b[^"]*"[^>]*>', html)
+    if not match:
+        return None
+
+    tag = match.group(1)
+    start = match.end()
+    open_re = re.compile(r'<' + tag + r'\b', re.IGNORECASE)
+    close_re = re.compile(r'</' + tag + r'\s*>', re.IGNORECASE)
+    depth = 1
+    position = start
+
+    while depth and position - start < limit:
+        close = close_re.search(html, position)
+        if not close:
+            return None
+        opened = open_re.search(html, position, close.start())
+        if opened:
+            depth += 1
+            position = opened.end()
+        else:
+            depth -= 1
+            position = close.end()
+            if not depth:
+                return html[start:close.start()]
+    return None
+
+
+class HtmlDocument:
+
+    def __init__(self, html: str, backend: str = BACKEND):
+        self.html = html
+        self.backend = backend
+        self._tree = None
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            if self.backend == 'selectolax':
+                self._tree = HTMLParser(self.html)
+            else:
+                self._tree = make_soup(self.html, self.backend)
+        return self._tree
+
+    def select(self, selector: str) -> List[Any]:
+        if self.backend == 'selectolax':
+            return self.tree.css(selector)
+        return self.tree.select(selector)
+
+    def select_one(self, selector: str):
+        if self.backend == 'selectolax':
+            return self.tree.css_first(selector)
+        return self.tree.select_one(selector)
+
+    def text(self, *selectors: str) -> Optional[str]:
+        for selector in selectors:
+            node = self.select_one(selector)
+            if node is not None:
+                return self.node_text(node)
+        return None
+
+    def attr(self, selector: str, name: str) -> Optional[str]:
+        node = self.select_one(selector)
+        return self.node_attr(node, name) if node is not None else None
+
+    def scripts(self) -> List[str]:
+        return [text for text in (self.node_text(node, strip=False) for node in self.select('script')) if text]
+
+    def node_text(self, node, strip: bool = True) -> str:
+        if self.backend == 'selectolax':
+            return node.text(strip=strip)
+        return node.get_text(strip=strip)
+
+    def node_attr(self, node, name: str) -> Optional[str]:
+        if self.backend == 'selectolax':
+            return node.attributes.get(name)
+        return node.get(name)
@@ -0,0 +1,173 @@
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from core.rate_limiter import get_rate_limiter
+
+
+HOST_POOLS = {
+    'steamcommunity.com': {'pool_connections': 4, 'pool_maxsize': 32},
+    'api.steampowered.com': {'pool_connections': 2, 'pool_maxsize': 16},
+    'login.steampowered.com': {'pool_connections': 2, 'pool_maxsize': 8},
+    'store.steampowered.com': {'pool_connections': 2, 'pool_maxsize': 8},
+    'localhost': {'pool_connections': 2, 'pool_maxsize': 16},
+    '127.0.0.1': {'pool_connections': 2, 'pool_maxsize': 16},
+}
+DEFAULT_POOL = {'pool_connections': 10, 'pool_maxsize': 10}
+
+
+class TransportStats:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.requests_sent = 0
+
+    def connection_opened(self):
+        with self._lock:
+            self.connections_opened += 1
+
+    def request_sent(self):
+        with self._lock:
+            self.requests_sent += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'requests': self.requests_sent,
+                'connections_opened': self.connections_opened,
+                'connections_reused': max(self.requests_sent - self.connections_opened, 0)
+            }
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+
+    def __init__(self, stats: TransportStats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+        stats = self.stats
+
+        class CountingHTTPConnectionPool(HTTPConnectionPool):
+            def _new_conn(self):
+                stats.connection_opened()
+                return super()._new_conn()
+
+            def urlopen(self, *args, **kwargs):
+                stats.request_sent()
+                return super().urlopen(*args, **kwargs)
+
+        class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            def _new_conn(self):
+                stats.connection_opened()
+                return super()._new_conn()
+
+            def urlopen(self, *args, **kwargs):
+                stats.request_sent()
+                return super().urlopen(*args, **kwargs)
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool
+        }
+
+
+class SharedTransportAdapter(HTTPAdapter):
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._adapters: Dict[str, PooledHTTPAdapter] = {}
+        self._stats: Dict[str, TransportStats] = {}
+
+    @staticmethod
+    def _pool_key(url: str) -> str:
+        host = (urlsplit(url).hostname or '').lower()
+        for pool_host in HOST_POOLS:
+            if host == pool_host or host.endswith('.' + pool_host):
+                return pool_host
+        return 'default'
+
+    def _get_adapter(self, url: str) -> PooledHTTPAdapter:
+        key = self._pool_key(url)
+        with self._lock:
+            adapter = self._adapters.get(key)
+            if adapter is None:
+                stats = TransportStats()
+                adapter = PooledHTTPAdapter(stats, **HOST_POOLS.get(key, DEFAULT_POOL))
+                self._adapters[key] = adapter
+                self._stats[key] = stats
+            return adapter
+
+    def send(self, request, **kwargs):
+        return get_rate_limiter().send(self._get_adapter(request.url), request, **kwargs)
+
+    def close(self):
+        pass
+
+    def shutdown(self):
+        with self._lock:
+            for adapter in self._adapters.values():
+                adapter.close()
+            self._adapters.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {key: stats.snapshot() for key, stats in self._stats.items()}
+
+
+_shared_adapter = SharedTransportAdapter()
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+
+
+def get_shared_adapter() -> SharedTransportAdapter:
+    return _shared_adapter
+
+
+def mount_shared_adapter(session: requests.Session) -> requests.Session:
+    session.mount('https://', _shared_adapter)
+    session.mount('http://', _shared_adapter)
+    return session
+
+
+def create_session(headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    session = mount_shared_adapter(requests.Session())
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def get_shared_session() -> requests.Session:
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = create_session()
+        return _shared_session
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    return get_shared_session().request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request('GET', url, **kwargs)
+
+
+def get_transport_stats() -> Dict[str, Dict[str, int]]:
+    return _shared_adapter.stats()
+
+
+def get_rate_limit_stats() -> Dict[str, Dict[str, float]]:
+    return get_rate_limiter().stats()
+
+
+def shutdown():
+    _shared_adapter.shutdown()
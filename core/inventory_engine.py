@@ -0,0 +1,76 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from core.description_store import get_description_store
+
+
+INVENTORY_URL = 'https://steamcommunity.com/inventory/{steam_id}/{app_id}/{context_id}'
+PAGE_SIZE = 2000
+
+
+class InventoryError(Exception):
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def description_key(item: Dict[str, Any]) -> Tuple[str, str]:
+    return str(item['classid']), str(item.get('instanceid', '0'))
+
+
+def iter_inventory_pages(session: requests.Session, steam_id: str, app_id: str = "730", context_id: str = "2",
+                         count: int = PAGE_SIZE, language: str = 'english', timeout: float = 30) -> Iterator[Dict[str, Any]]:
+    url = INVENTORY_URL.format(steam_id=steam_id, app_id=app_id, context_id=context_id)
+    start_assetid = None
+
+    while True:
+        params = {'l': language, 'count': min(count, PAGE_SIZE)}
+        if start_assetid:
+            params['start_assetid'] = start_assetid
+
+        response = session.get(url, params=params, timeout=timeout)
+        if response.status_code != 200:
+            raise InventoryError(f"HTTP {response.status_code}", response.status_code)
+
+        page = response.json()
+        if not page or not page.get('success'):
+            raise InventoryError("Инвентарь недоступен", response.status_code)
+
+        yield page
+
+        last_assetid = page.get('last_assetid')
+        if not page.get('more_items') or not last_assetid or last_assetid == start_assetid:
+            return
+        start_assetid = last_assetid
+
+
+def iter_inventory(session: requests.Session, steam_id: str, app_id: str = "730", context_id: str = "2",
+                   **kwargs) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    store = get_description_store()
+    descriptions: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    pending: List[Dict[str, Any]] = []
+
+    for page in iter_inventory_pages(session, steam_id, app_id, context_id, **kwargs):
+        for description in store.intern_many(app_id, page.get('descriptions') or []).values():
+            descriptions[description_key(description)] = description
+
+        waiting, pending = pending + (page.get('assets') or []), []
+        for asset in waiting:
+            description = descriptions.get(description_key(asset))
+            if description is None:
+                pending.append(asset)
+            else:
+                yield asset, description
+
+    missing = 0
+    for asset in pending:
+        description = store.get(asset.get('appid', app_id), asset['classid'], asset.get('instanceid', '0'))
+        if description is None:
+            missing += 1
+            description = {}
+        yield asset, description
+
+    if missing:
+        print(f"⚠️ Для {missing} предметов инвентаря {steam_id} не получены описания")
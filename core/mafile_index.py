@@ -0,0 +1,166 @@
+import os
+import json
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any
+
+
+@dataclass
+class MaFileEntry:
+    filename: str
+    path: str
+    account_name: str
+    login: str
+    steam_id: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    mtime_ns: int = 0
+    size: int = 0
+    error: Optional[str] = None
+
+
+def _extract_login(mafile_data: Dict[str, Any], default: str) -> str:
+    if 'account_name' in mafile_data:
+        return mafile_data['account_name']
+    if 'AccountName' in mafile_data:
+        return mafile_data['AccountName']
+    if 'Steam' in mafile_data and 'Username' in mafile_data['Steam']:
+        return mafile_data['Steam']['Username']
+    return default
+
+
+def _extract_steam_id(mafile_data: Dict[str, Any]) -> Optional[str]:
+    session = mafile_data.get('Session') or {}
+    steam_id = session.get('SteamID') or mafile_data.get('steamid')
+    return str(steam_id) if steam_id else None
+
+
+class MaFileIndex:
+
+    RESCAN_INTERVAL = 5.0
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._accounts_dir: Optional[str] = None
+        self._dir_mtime_ns: Optional[int] = None
+        self._last_scan = 0.0
+        self._entries: Dict[str, MaFileEntry] = {}
+        self._by_key: Dict[str, MaFileEntry] = {}
+
+    def _load_entry(self, filename: str, path: str, stat: os.stat_result) -> MaFileEntry:
+        account_name = os.path.splitext(filename)[0]
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                mafile_data = json.load(f)
+        except Exception as e:
+            print(f"Ошибка при чтении {filename}: {e}")
+            return MaFileEntry(filename=filename, path=path, account_name=account_name, login=account_name,
+                               mtime_ns=stat.st_mtime_ns, size=stat.st_size, error=str(e))
+
+        return MaFileEntry(
+            filename=filename,
+            path=path,
+            account_name=account_name,
+            login=_extract_login(mafile_data, account_name),
+            steam_id=_extract_steam_id(mafile_data),
+            data=mafile_data,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size
+        )
+
+    def _rebuild_keys(self):
+        by_key = {}
+        for entry in sorted(self._entries.values(), key=lambda e: e.filename):
+            for key in (entry.steam_id, entry.filename, entry.account_name, entry.login):
+                if key:
+                    by_key[str(key)] = entry
+                    by_key.setdefault(str(key).lower(), entry)
+        self._by_key = by_key
+
+    def _rescan(self, accounts_dir: str):
+        entries = {}
+
+        try:
+            with os.scandir(accounts_dir) as it:
+                for dir_entry in it:
+                    if not dir_entry.name.lower().endswith('.mafile') or not dir_entry.is_file():
+                        continue
+
+                    stat = dir_entry.stat()
+                    cached = self._entries.get(dir_entry.name) if accounts_dir == self._accounts_dir else None
+
+                    if cached and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+                        entries[dir_entry.name] = cached
+                    else:
+                        entries[dir_entry.name] = self._load_entry(dir_entry.name, dir_entry.path, stat)
+
+            self._dir_mtime_ns = os.stat(accounts_dir).st_mtime_ns
+        except FileNotFoundError:
+            self._dir_mtime_ns = None
+
+        self._accounts_dir = accounts_dir
+        self._entries = entries
+        self._last_scan = time.monotonic()
+        self._rebuild_keys()
+
+    def _ensure_fresh(self, accounts_dir: str):
+        if accounts_dir != self._accounts_dir:
+            self._rescan(accounts_dir)
+            return
+
+        try:
+            dir_mtime_ns = os.stat(accounts_dir).st_mtime_ns
+        except OSError:
+            dir_mtime_ns = None
+
+        if dir_mtime_ns != self._dir_mtime_ns or time.monotonic() - self._last_scan >= self.RESCAN_INTERVAL:
+            self._rescan(accounts_dir)
+
+    def _revalidate(self, entry: MaFileEntry) -> Optional[MaFileEntry]:
+        try:
+            stat = os.stat(entry.path)
+        except OSError:
+            self._entries.pop(entry.filename, None)
+            self._rebuild_keys()
+            return None
+
+        if stat.st_mtime_ns == entry.mtime_ns and stat.st_size == entry.size:
+            return entry
+
+        fresh = self._load_entry(entry.filename, entry.path, stat)
+        self._entries[entry.filename] = fresh
+        self._rebuild_keys()
+        return fresh
+
+    def entries(self, accounts_dir: str) -> List[MaFileEntry]:
+        with self._lock:
+            self._ensure_fresh(accounts_dir)
+            return sorted(self._entries.values(), key=lambda e: e.filename)
+
+    def get(self, accounts_dir: str, key) -> Optional[MaFileEntry]:
+        if key is None:
+            return None
+
+        key = str(key)
+
+        with self._lock:
+            self._ensure_fresh(accounts_dir)
+            entry = self._by_key.get(key) or self._by_key.get(key.lower())
+            if entry is None:
+                return None
+
+            fresh = self._revalidate(entry)
+            if fresh is not entry:
+                fresh = self._by_key.get(key) or self._by_key.get(key.lower())
+            return fresh
+
+    def invalidate(self):
+        with self._lock:
+            self._accounts_dir = None
+            self._dir_mtime_ns = None
+            self._entries = {}
+            self._by_key = {}
+
+
+mafile_index = MaFileIndex()
@@ -0,0 +1,207 @@
+import csv
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from core.settings_manager import get_application_path
+
+
+PriceKey = Tuple[str, str, str]
+
+
+class PriceCache:
+    FILENAME = 'prices.db'
+    DEFAULT_TTL = 6 * 3600
+    DEFAULT_STALE = 24 * 3600
+    REVALIDATE_WORKERS = 2
+
+    def __init__(self, directory: Optional[str] = None, ttl: float = DEFAULT_TTL, stale: float = DEFAULT_STALE):
+        self.directory = directory or os.path.join(get_application_path(), 'data', 'cache')
+        self.path = os.path.join(self.directory, self.FILENAME)
+        self.ttl = ttl
+        self.stale = stale
+        self._memory: Dict[PriceKey, Tuple[float, float]] = {}
+        self._revalidating = set()
+        self._revalidate_executor: Optional[ThreadPoolExecutor] = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS prices ('
+                ' appid TEXT NOT NULL,'
+                ' market_hash_name TEXT NOT NULL,'
+                ' currency TEXT NOT NULL,'
+                ' price REAL NOT NULL,'
+                ' source TEXT,'
+                ' updated_at REAL NOT NULL,'
+                ' PRIMARY KEY (appid, market_hash_name, currency))'
+            )
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS dumps ('
+                ' path TEXT PRIMARY KEY,'
+                ' mtime_ns INTEGER NOT NULL,'
+                ' size INTEGER NOT NULL)'
+            )
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def _key(app_id, market_hash_name: str, currency: str) -> PriceKey:
+        return str(app_id), market_hash_name, currency.upper()
+
+    def lookup(self, app_id, market_hash_name: str, currency: str) -> Optional[Tuple[float, float]]:
+        key = self._key(app_id, market_hash_name, currency)
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is None:
+                row = self._connection().execute(
+                    'SELECT price, updated_at FROM prices WHERE appid = ? AND market_hash_name = ? AND currency = ?', key
+                ).fetchone()
+                if row is None:
+                    return None
+                cached = self._memory[key] = (row[0], row[1])
+        price, updated_at = cached
+        return price, time.time() - updated_at
+
+    def put(self, app_id, market_hash_name: str, currency: str, price: float, source: str = 'priceoverview'):
+        self.put_many([(app_id, market_hash_name, currency, price)], source)
+
+    def put_many(self, rows: Iterable[Tuple[str, str, str, float]], source: str = 'dump') -> int:
+        now = time.time()
+        records = [(*self._key(app_id, name, currency), float(price), source, now) for app_id, name, currency, price in rows]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    'INSERT OR REPLACE INTO prices (appid, market_hash_name, currency, price, source, updated_at)'
+                    ' VALUES (?, ?, ?, ?, ?, ?)',
+                    records
+                )
+            for appid, name, currency, price, _, updated_at in records:
+                self._memory[(appid, name, currency)] = (price, updated_at)
+        return len(records)
+
+    def get(self, app_id, market_hash_name: str, currency: str,
+            fetch: Callable[[], Optional[float]]) -> Optional[float]:
+        cached = self.lookup(app_id, market_hash_name, currency)
+        if cached is not None:
+            price, age = cached
+            if age <= self.ttl:
+                return price
+            if age <= self.ttl + self.stale:
+                self._revalidate(app_id, market_hash_name, currency, fetch)
+                return price
+
+        price = fetch()
+        if price is None:
+            return cached[0] if cached else None
+
+        self.put(app_id, market_hash_name, currency, price)
+        return price
+
+    def _revalidate(self, app_id, market_hash_name: str, currency: str, fetch: Callable[[], Optional[float]]):
+        key = self._key(app_id, market_hash_name, currency)
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+            if self._revalidate_executor is None:
+                self._revalidate_executor = ThreadPoolExecutor(max_workers=self.REVALIDATE_WORKERS,
+                                                               thread_name_prefix="PriceRevalidate")
+            executor = self._revalidate_executor
+
+        def worker():
+            try:
+                price = fetch()
+                if price is not None:
+                    self.put(app_id, market_hash_name, currency, price)
+            except Exception as e:
+                print(f"Ошибка фонового обновления цены {market_hash_name}: {e}")
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        executor.submit(worker)
+
+    def prefill_from_file(self, path: str, app_id: str = "730", currency: str = "USD") -> int:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return 0
+
+        abs_path = os.path.abspath(path)
+        with self._lock:
+            row = self._connection().execute('SELECT mtime_ns, size FROM dumps WHERE path = ?', (abs_path,)).fetchone()
+        if row and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+            return 0
+
+        try:
+            if path.lower().endswith('.csv'):
+                rows = list(self._read_csv_dump(path, app_id, currency))
+            else:
+                rows = list(self._read_json_dump(path, app_id, currency))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ошибка чтения файла цен {path}: {e}")
+            return 0
+
+        imported = self.put_many(rows, source='dump')
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO dumps (path, mtime_ns, size) VALUES (?, ?, ?)',
+                    (abs_path, stat.st_mtime_ns, stat.st_size)
+                )
+        print(f"Загружено {imported} цен из {path}")
+        return imported
+
+    @staticmethod
+    def _read_json_dump(path: str, app_id: str, currency: str):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if isinstance(data, dict):
+            for name, value in data.items():
+                if isinstance(value, dict):
+                    price = value.get('price')
+                    if price is not None:
+                        yield value.get('appid', app_id), name, value.get('currency', currency), float(price)
+                elif value is not None:
+                    yield app_id, name, currency, float(value)
+        else:
+            for entry in data:
+                price = entry.get('price')
+                if price is not None:
+                    yield entry.get('appid', app_id), entry['market_hash_name'], entry.get('currency', currency), float(price)
+
+    @staticmethod
+    def _read_csv_dump(path: str, app_id: str, currency: str):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for entry in csv.DictReader(f):
+                price = entry.get('price')
+                if price not in (None, ''):
+                    yield (entry.get('appid') or app_id, entry['market_hash_name'],
+                           entry.get('currency') or currency, float(price))
+
+
+_cache: Optional[PriceCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_price_cache() -> PriceCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from core.settings_manager import settings_manager
+            _cache = PriceCache(ttl=settings_manager.get_price_cache_ttl(),
+                                stale=settings_manager.get_price_cache_stale())
+        return _cache
@@ -0,0 +1,203 @@
+import asyncio
+import re
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+@dataclass(frozen=True)
+class EndpointClass:
+    name: str
+    host: str
+    path_prefix: str
+    rate: float
+    capacity: float
+    per_account: bool
+
+
+ENDPOINT_CLASSES = (
+    EndpointClass('priceoverview', 'steamcommunity.com', '/market/priceoverview', rate=0.33, capacity=5, per_account=False),
+    EndpointClass('inventory', 'steamcommunity.com', '/inventory/', rate=0.5, capacity=3, per_account=False),
+    EndpointClass('mobileconf', 'steamcommunity.com', '/mobileconf/', rate=1.0, capacity=5, per_account=True),
+    EndpointClass('econ_service', 'api.steampowered.com', '/IEconService/', rate=2.0, capacity=10, per_account=True),
+    EndpointClass('community', 'steamcommunity.com', '/', rate=5.0, capacity=10, per_account=True),
+)
+
+DEFAULT_RETRY_AFTER = 10.0
+MAX_RETRY_WAIT = 60.0
+MAX_RETRIES = 2
+
+_LOGIN_COOKIE_RE = re.compile(r'steamLoginSecure=(\d{17})')
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+
+    MIN_RATE_FACTOR = 0.1
+    RECOVERY_STEP = 0.05
+
+    def __init__(self, rate: float, capacity: float):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def _refill_locked(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _take(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill_locked(now)
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self) -> float:
+        waited = 0.0
+        while True:
+            delay = self._take()
+            if not delay:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    async def acquire_async(self) -> float:
+        waited = 0.0
+        while True:
+            delay = self._take()
+            if not delay:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def on_throttled(self, retry_after: Optional[float]) -> float:
+        delay = DEFAULT_RETRY_AFTER if retry_after is None else retry_after
+        with self._lock:
+            now = time.monotonic()
+            self.throttled += 1
+            self.rate = max(self.rate / 2, self.base_rate * self.MIN_RATE_FACTOR)
+            self.tokens = 0
+            self.updated = now
+            self.blocked_until = max(self.blocked_until, now + delay)
+        return delay
+
+    def on_success(self):
+        if self.rate >= self.base_rate:
+            return
+        with self._lock:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * self.RECOVERY_STEP)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'rate': round(self.rate, 3),
+                'base_rate': self.base_rate,
+                'tokens': round(self.tokens, 2),
+                'throttled': self.throttled,
+            }
+
+
+class RateLimiter:
+
+    def __init__(self, endpoint_classes: Tuple[EndpointClass, ...] = ENDPOINT_CLASSES):
+        self.endpoint_classes = endpoint_classes
+        self._buckets: Dict[Tuple[str, str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def classify(self, url: str) -> Optional[EndpointClass]:
+        parts = urlsplit(url)
+        host = (parts.hostname or '').lower()
+        for endpoint in self.endpoint_classes:
+            if (host == endpoint.host or host.endswith('.' + endpoint.host)) and parts.path.startswith(endpoint.path_prefix):
+                return endpoint
+        return None
+
+    @staticmethod
+    def _proxy_key(url: str, proxies: Optional[Dict[str, str]]) -> str:
+        if not proxies:
+            return 'direct'
+        scheme = urlsplit(url).scheme
+        return proxies.get(scheme) or proxies.get('all') or 'direct'
+
+    @staticmethod
+    def _account_key(url: str, headers) -> str:
+        match = _LOGIN_COOKIE_RE.search(headers.get('Cookie', '') if headers else '')
+        if match:
+            return match.group(1)
+        query = parse_qs(urlsplit(url).query)
+        for param in ('steamid', 'key', 'access_token'):
+            if query.get(param):
+                return query[param][0]
+        return 'anonymous'
+
+    def bucket_for(self, request, proxies: Optional[Dict[str, str]] = None) -> Optional[TokenBucket]:
+        return self.bucket_for_url(request.url, request.headers, proxies)
+
+    def bucket_for_url(self, url: str, headers: Optional[Dict[str, str]] = None,
+                       proxies: Optional[Dict[str, str]] = None) -> Optional[TokenBucket]:
+        endpoint = self.classify(url)
+        if endpoint is None:
+            return None
+
+        account = self._account_key(url, headers) if endpoint.per_account else '*'
+        key = (endpoint.name, self._proxy_key(url, proxies), account)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = TokenBucket(endpoint.rate, endpoint.capacity)
+                self._buckets[key] = bucket
+            return bucket
+
+    def send(self, adapter, request, **kwargs):
+        bucket = self.bucket_for(request, kwargs.get('proxies'))
+        if bucket is None:
+            return adapter.send(request, **kwargs)
+
+        for attempt in range(MAX_RETRIES + 1):
+            bucket.acquire()
+            response = adapter.send(request, **kwargs)
+            if response.status_code != 429:
+                bucket.on_success()
+                return response
+
+            delay = bucket.on_throttled(parse_retry_after(response.headers.get('Retry-After')))
+            if attempt == MAX_RETRIES or delay > MAX_RETRY_WAIT:
+                return response
+            response.close()
+
+        return response
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            buckets = list(self._buckets.items())
+        return {'/'.join(key): bucket.snapshot() for key, bucket in buckets}
+
+
+_rate_limiter = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    return _rate_limiter
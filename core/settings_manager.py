@@ -3,6 +3,8 @@ import json
 import string
 import sys
 
+from core.mafile_index import mafile_index
+
 
 def get_application_path():
     if getattr(sys, 'frozen', False):
@@ -41,7 +43,10 @@ class SettingsManager:
             "status_interval": 30,
             "account_status": {},
             "trade_links": {},
-            "trade_protection_acknowledged": {}
+            "trade_protection_acknowledged": {},
+            "price_cache_ttl": 21600,
+            "price_cache_stale": 86400,
+            "price_dump_path": ""
         }
         
         debug_log(f"Файл настроек: {self.settings_file}")
@@ -243,54 +248,15 @@ class SettingsManager:
         debug_log(f"Папка существует: {os.path.exists(accounts_dir)}")
         
         try:
-            if os.path.exists(accounts_dir):
-                files_in_dir = os.listdir(accounts_dir)
-                debug_log(f"Файлы в папке: {files_in_dir}")
+            for entry in mafile_index.entries(accounts_dir):
+                debug_log(f"Найден maFile: {entry.filename} (логин: {entry.login})")
                 
-                for filename in files_in_dir:
-                    debug_log(f"Проверяем файл: {filename}")
-                    if filename.lower().endswith('.mafile'):
-                        debug_log(f"Найден maFile: {filename}")
-                        account_name = os.path.splitext(filename)[0]
-                        
-                        try:
-                            mafile_path = os.path.join(accounts_dir, filename)
-                            debug_log(f"Читаем maFile: {mafile_path}")
-                            
-                            with open(mafile_path, 'r', encoding='utf-8') as f:
-                                mafile_data = json.load(f)
-                                
-                            login = None
-                            if 'account_name' in mafile_data:
-                                login = mafile_data['account_name']
-                            elif 'AccountName' in mafile_data:
-                                login = mafile_data['AccountName']
-                            elif 'Steam' in mafile_data and 'Username' in mafile_data['Steam']:
-                                login = mafile_data['Steam']['Username']
-                            else:
-                                login = account_name
-                            
-                            debug_log(f"Логин из maFile: {login}")
-                            
-                            discovered_accounts.append({
-                                'filename': filename,
-                                'account_name': account_name,
-                                'login': login,
-                                'has_password': login in self.settings["account_passwords"]
-                            })
-                            
-                            debug_log(f"Аккаунт добавлен: {login} (пароль: {login in self.settings['account_passwords']})")
-                            
-                        except Exception as e:
-                            debug_log(f"ОШИБКА при чтении {filename}: {e}")
-                            print(f"Ошибка при чтении {filename}: {e}")
-                            discovered_accounts.append({
-                                'filename': filename,
-                                'account_name': account_name,
-                                'login': account_name,
-                                'has_password': account_name in self.settings["account_passwords"]
-                            })
-                            debug_log(f"Аккаунт добавлен (имя файла): {account_name}")
+                discovered_accounts.append({
+                    'filename': entry.filename,
+                    'account_name': entry.account_name,
+                    'login': entry.login,
+                    'has_password': entry.login in self.settings["account_passwords"]
+                })
             
             debug_log(f"ИТОГО обнаружено аккаунтов: {len(discovered_accounts)}")
             for acc in discovered_accounts:
@@ -305,6 +271,9 @@ class SettingsManager:
             print(f"Ошибка при автообнаружении аккаунтов: {e}")
             return []
 
+    def find_mafile(self, key):
+        return mafile_index.get(self.get_accounts_dir(), key)
+
     def get_account_password(self, login):
         return self.settings["account_passwords"].get(login, "")
 
@@ -406,6 +375,27 @@ class SettingsManager:
         self.settings["status_interval"] = interval
         return self.save_settings()
 
+    def get_price_cache_ttl(self):
+        return self.settings.get("price_cache_ttl", 21600)
+
+    def set_price_cache_ttl(self, ttl):
+        self.settings["price_cache_ttl"] = ttl
+        return self.save_settings()
+
+    def get_price_cache_stale(self):
+        return self.settings.get("price_cache_stale", 86400)
+
+    def set_price_cache_stale(self, stale):
+        self.settings["price_cache_stale"] = stale
+        return self.save_settings()
+
+    def get_price_dump_path(self):
+        return self.settings.get("price_dump_path", "")
+
+    def set_price_dump_path(self, path):
+        self.settings["price_dump_path"] = path
+        return self.save_settings()
+
     def get_account_status(self, login):
         account_status = self.settings.get("account_status", {})
         return account_status.get(login, {
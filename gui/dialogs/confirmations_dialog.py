@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import threading
 from core.settings_manager import settings_manager
+from ..virtual_tree import VirtualTreeview
 
 
 class ConfirmationsDialog:
@@ -10,6 +11,8 @@ class ConfirmationsDialog:
         self.account_display_name = account_display_name
         self.trade_manager = trade_manager
         self.confirmations_data = {}
+        self.confirmations_rows = {}
+        self.confirmations_view = None
         
         self.dialog = tk.Toplevel(parent)
         self.dialog.title(f"Steam Guard подтверждения - {account_display_name}")
@@ -73,8 +76,9 @@ class ConfirmationsDialog:
         self.confirmations_tree.column("Время", width=120)
         self.confirmations_tree.column("Статус", width=80)
         
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.confirmations_tree.yview)
-        self.confirmations_tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical")
+        self.confirmations_view = VirtualTreeview(self.confirmations_tree, scrollbar,
+                                                  self.confirmation_row_values, self.confirmation_row_tags)
         
         self.confirmations_tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -122,11 +126,27 @@ class ConfirmationsDialog:
         except Exception:
             pass
     
+    def confirmation_row_values(self, key):
+        return self.confirmations_rows[key][0]
+    
+    def confirmation_row_tags(self, key):
+        return self.confirmations_rows[key][1]
+    
+    def add_confirmation_row(self, values, tags=()):
+        key = len(self.confirmations_rows)
+        self.confirmations_rows[key] = (values, tags)
+        return key
+    
+    def show_confirmations(self, keys, empty_values):
+        if keys:
+            self.confirmations_view.set_rows(keys)
+        else:
+            self.confirmations_view.set_message(empty_values)
+    
     def on_selection_change(self, event):
-        selected = self.confirmations_tree.selection()
+        selected = self.confirmations_view.selected_keys()
         if selected:
-            item_data = self.confirmations_tree.item(selected[0])
-            values = item_data['values']
+            values = self.confirmation_row_values(selected[0])
             if values and len(values) >= 2:
                 conf_type = values[0]
                 conf_desc = values[1]
@@ -135,54 +155,48 @@ class ConfirmationsDialog:
             self.dialog.title(f"Steam Guard подтверждения - {self.account_display_name}")
     
     def load_confirmations(self):
-        for item in self.confirmations_tree.get_children():
-            self.confirmations_tree.delete(item)
         self.confirmations_data.clear()
+        self.confirmations_rows.clear()
         
         try:
             from pysda import SimpleTradeManager
             
-            loading_item = self.confirmations_tree.insert("", "end", values=("🔄", "Загрузка подтверждений...", "—", "—"))
+            self.confirmations_view.set_message(("🔄", "Загрузка подтверждений...", "—", "—"))
             self.confirmations_tree.update()
             
             def load_confirmations_thread():
                 try:
                     trade_manager = SimpleTradeManager()
                     result = trade_manager.get_trade_confirmations(self.account_login)
-                    self.dialog.after(0, lambda: self.handle_pysda_confirmations_loaded(result, loading_item))
+                    self.dialog.after(0, lambda: self.handle_pysda_confirmations_loaded(result))
                 except Exception as e:
-                    self.dialog.after(0, lambda: self.handle_confirmations_error(str(e), loading_item))
+                    self.dialog.after(0, lambda: self.handle_confirmations_error(str(e)))
             
             thread = threading.Thread(target=load_confirmations_thread)
             thread.daemon = True
             thread.start()
                 
         except ImportError:
-            self.confirmations_tree.insert("", "end", values=("Ошибка", "Модуль steam_integration недоступен", "—", "—"))
+            self.confirmations_view.set_message(("Ошибка", "Модуль steam_integration недоступен", "—", "—"))
         except Exception as e:
-            self.confirmations_tree.insert("", "end", values=("Ошибка", f"Ошибка загрузки: {str(e)}", "—", "—"))
+            self.confirmations_view.set_message(("Ошибка", f"Ошибка загрузки: {str(e)}", "—", "—"))
     
-    def handle_trade_confirmations_loaded(self, result, loading_item):
-        self.confirmations_tree.delete(loading_item)
-        
+    def handle_trade_confirmations_loaded(self, result):
         if result["success"]:
-            confirmations = result.get("confirmations", [])
-            if confirmations:
-                for conf in confirmations:
-                    self.confirmations_tree.insert("", "end", values=(
-                        conf.get('type', 'Неизвестно'),
-                        conf.get('description', 'Нет описания'),
-                        conf.get('time', 'Неизвестно'),
-                        "Ожидает"
-                    ))
-            else:
-                self.confirmations_tree.insert("", "end", values=("—", "Нет активных подтверждений", "—", "—"))
+            keys = []
+            for conf in result.get("confirmations", []):
+                keys.append(self.add_confirmation_row((
+                    conf.get('type', 'Неизвестно'),
+                    conf.get('description', 'Нет описания'),
+                    conf.get('time', 'Неизвестно'),
+                    "Ожидает"
+                )))
+            self.show_confirmations(keys, ("—", "Нет активных подтверждений", "—", "—"))
         else:
-            self.confirmations_tree.insert("", "end", values=("Ошибка", result.get("error", "Неизвестная ошибка"), "—", "—"))
+            self.confirmations_view.set_message(("Ошибка", result.get("error", "Неизвестная ошибка"), "—", "—"))
 
-    def handle_confirmations_loaded(self, confirmations, loading_item):
-        self.confirmations_tree.delete(loading_item)
-        
+    def handle_confirmations_loaded(self, confirmations):
+        keys = []
         if confirmations:
             for conf in confirmations:
                 conf_type = conf.get('type', 'Unknown')
@@ -204,23 +218,20 @@ class ConfirmationsDialog:
                 }
                 type_text = type_mapping.get(str(conf_type), f"Тип {conf_type}")
                 
-                self.confirmations_tree.insert("", "end", values=(
+                keys.append(self.add_confirmation_row((
                     type_text,
                     conf.get('description', 'Нет описания'),
                     conf.get('time', 'Неизвестно'),
                     "Ожидает"
-                ), tags=(conf.get('id', ''), conf.get('key', '')))
-        else:
-            self.confirmations_tree.insert("", "end", values=("—", "Нет активных подтверждений", "—", "—"))
-    
-    def handle_confirmations_error(self, error, loading_item):
-        self.confirmations_tree.delete(loading_item)
+                ), tags=(conf.get('id', ''), conf.get('key', ''))))
         
-        self.confirmations_tree.insert("", "end", values=("Ошибка", f"Не удалось загрузить: {error}", "—", "—"))
+        self.show_confirmations(keys, ("—", "Нет активных подтверждений", "—", "—"))
     
-    def handle_new_confirmations_loaded(self, confirmations, loading_item):
-        self.confirmations_tree.delete(loading_item)
-        
+    def handle_confirmations_error(self, error):
+        self.confirmations_view.set_message(("Ошибка", f"Не удалось загрузить: {error}", "—", "—"))
+    
+    def handle_new_confirmations_loaded(self, confirmations):
+        keys = []
         if confirmations:
             for conf in confirmations:
                 print(f"[DEBUG] Loading confirmation: {conf}")
@@ -248,12 +259,13 @@ class ConfirmationsDialog:
                 conf_key = conf.get('key', '')
                 print(f"[DEBUG] Confirmation ID: {conf_id}, Key: {conf_key}")
                 
-                item_id = self.confirmations_tree.insert("", "end", values=(
+                item_id = self.add_confirmation_row((
                     type_text,
                     conf.get('title', conf.get('description', 'Нет описания')),
                     conf.get('time', 'Неизвестно'),
                     "Ожидает"
                 ))
+                keys.append(item_id)
                 
                 self.confirmations_data[item_id] = {
                     'id': conf_id,
@@ -261,26 +273,22 @@ class ConfirmationsDialog:
                     'data': conf
                 }
                 print(f"[DEBUG] Saved confirmation data for item {item_id}: id={conf_id}, key={conf_key}")
-        else:
-            self.confirmations_tree.insert("", "end", values=("—", "Нет активных подтверждений", "—", "—"))
-    
-    def handle_pysda_confirmations_loaded(self, result, loading_item):
-        try:
-            self.confirmations_tree.delete(loading_item)
-        except:
-            pass
         
+        self.show_confirmations(keys, ("—", "Нет активных подтверждений", "—", "—"))
+    
+    def handle_pysda_confirmations_loaded(self, result):
         if not result.get('success'):
             error_msg = result.get('error', 'Неизвестная ошибка')
-            self.confirmations_tree.insert("", "end", values=("❌", f"Ошибка: {error_msg}", "—", "—"))
+            self.confirmations_view.set_message(("❌", f"Ошибка: {error_msg}", "—", "—"))
             return
         
         confirmations = result.get('confirmations', [])
         
         if not confirmations:
-            self.confirmations_tree.insert("", "end", values=("📭", "Нет подтверждений", "—", "—"))
+            self.confirmations_view.set_message(("📭", "Нет подтверждений", "—", "—"))
             return
         
+        keys = []
         for conf in confirmations:
             conf_type = conf.get('type', 'Unknown')
             type_mapping = {
@@ -303,12 +311,13 @@ class ConfirmationsDialog:
             
             conf_id = conf.get('confirmation_id', conf.get('id', ''))
             
-            item_id = self.confirmations_tree.insert("", "end", values=(
+            item_id = self.add_confirmation_row((
                 type_text,
                 conf.get('description', 'Нет описания'),
                 "Неизвестно",
                 "Ожидает"
             ))
+            keys.append(item_id)
             
             self.confirmations_data[item_id] = {
                 'id': conf_id,
@@ -317,9 +326,11 @@ class ConfirmationsDialog:
                 'data': conf,
                 'type': 'pysda'
             }
+        
+        self.confirmations_view.set_rows(keys)
 
     def confirm_selected(self):
-        selected = self.confirmations_tree.selection()
+        selected = self.confirmations_view.selected_keys()
         if not selected:
             messagebox.showwarning("Выбор не сделан", 
                                  "Сначала выберите строку в списке подтверждений,\n"
@@ -399,7 +410,7 @@ class ConfirmationsDialog:
     
     def handle_confirm_result(self, success, item_id):
         if success:
-            self.confirmations_tree.delete(item_id)
+            self.confirmations_view.remove(item_id)
             if item_id in self.confirmations_data:
                 del self.confirmations_data[item_id]
             messagebox.showinfo("Успех", "Подтверждение отправлено успешно!")
@@ -410,7 +421,7 @@ class ConfirmationsDialog:
         messagebox.showerror("Ошибка", f"Ошибка при подтверждении: {error}")
     
     def cancel_selected(self):
-        selected = self.confirmations_tree.selection()
+        selected = self.confirmations_view.selected_keys()
         if not selected:
             messagebox.showwarning("Выбор не сделан", 
                                  "Сначала выберите строку в списке подтверждений,\n"
@@ -420,7 +431,7 @@ class ConfirmationsDialog:
         messagebox.showinfo("Информация", "Функция отклонения пока недоступна.\nИспользуйте мобильное приложение Steam для отклонения.")
     
     def confirm_all(self):
-        items = self.confirmations_tree.get_children()
+        items = self.confirmations_view.keys
         if not items:
             messagebox.showinfo("Информация", "Нет подтверждений для обработки")
             return
@@ -474,7 +485,7 @@ class ConfirmationsDialog:
             messagebox.showinfo("Информация", "Все подтверждения отклонены (демо)")
     
     def copy_confirmation_id(self):
-        selected = self.confirmations_tree.selection()
+        selected = self.confirmations_view.selected_keys()
         if not selected:
             messagebox.showwarning("Внимание", "Выберите подтверждение")
             return
@@ -181,34 +181,41 @@ class MassTradeConfirmDialog:
         try:
             total = len(selected_accounts)
             success_count = 0
+            done_count = 0
+            lock = threading.Lock()
             
-            for i, login in enumerate(selected_accounts):
+            self.dialog.after(0, lambda p=f"Подтверждение {total} аккаунтов...": self.progress_var.set(p))
+            
+            def on_result(login, result):
+                nonlocal success_count, done_count
+                
+                with lock:
+                    done_count += 1
+                    done = done_count
+                    if result.get("success"):
+                        success_count += 1
+                
+                if login not in self.selected_accounts:
+                    return
+                
                 display_name = self.selected_accounts[login]['display_name']
                 status_label = self.selected_accounts[login]['status_label']
                 
-                self.dialog.after(0, lambda p=f"Подтверждение {i+1}/{total}: {display_name}": 
+                if result.get("success"):
+                    status_text = f"✅ {result.get('confirmed_count', 0)}"
+                    color = "green"
+                else:
+                    status_text = "❌ Ошибка"
+                    color = "red"
+                
+                self.dialog.after(0, lambda p=f"Подтверждено {done}/{total}: {display_name}": 
                                  self.progress_var.set(p))
-                self.dialog.after(0, lambda v=(i+1)*100//total: 
+                self.dialog.after(0, lambda v=done*100//total: 
                                  self.progress_bar.config(value=v))
-                
-                try:
-                    result = self.trade_manager.confirm_all_trades(login)
-                    
-                    if result["success"]:
-                        confirmed_count = result["confirmed_count"]
-                        status_text = f"✅ {confirmed_count}"
-                        color = "green"
-                        success_count += 1
-                    else:
-                        status_text = "❌ Ошибка"
-                        color = "red"
-                    
-                    self.dialog.after(0, lambda l=status_label, t=status_text, c=color: 
-                                     (l.config(text=t, foreground=c)))
-                
-                except Exception as e:
-                    self.dialog.after(0, lambda l=status_label: 
-                                     l.config(text="❌ Ошибка", foreground="red"))
+                self.dialog.after(0, lambda l=status_label, t=status_text, c=color: 
+                                 (l.config(text=t, foreground=c)))
+            
+            self.trade_manager.bulk_confirm_trades(list(selected_accounts), on_result=on_result)
             
             final_message = f"Завершено: {success_count}/{total} аккаунтов"
             self.dialog.after(0, lambda m=final_message: self.progress_var.set(m))
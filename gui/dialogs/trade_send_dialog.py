@@ -5,6 +5,7 @@ import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 import threading
 import time
+from ..virtual_tree import VirtualTreeview
 
 
 class TradeProgressDialog:
@@ -111,7 +112,10 @@ class TradeSendDialog:
         self.receiver_var = tk.StringVar()
         self.partner_steamid_var = tk.StringVar()
         self.message_var = tk.StringVar()
-        self.selected_items = []
+        self.items_view = None
+        self.items_by_key = {}
+        self.account_keys = {}
+        self.selected_keys = set()
         
         self.create_interface()
         
@@ -215,8 +219,8 @@ class TradeSendDialog:
             self.items_tree.heading(col, text=col)
             self.items_tree.column(col, width=120)
         
-        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.items_tree.yview)
-        self.items_tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical")
+        self.items_view = VirtualTreeview(self.items_tree, scrollbar, self.item_row_values)
         
         self.items_tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -257,20 +261,55 @@ class TradeSendDialog:
         except Exception as e:
             print(f"Ошибка загрузки аккаунтов: {e}")
     
+    @property
+    def selected_items(self):
+        return [item for key, item in self.items_by_key.items() if key in self.selected_keys]
+    
+    def index_inventory_data(self):
+        self.items_by_key = {}
+        self.account_keys = {}
+        
+        for index, item in enumerate(self.inventory_data):
+            account = item.get('account', 'Unknown')
+            key = str(item.get('asset_id') or '')
+            if not key or key == '0' or key in self.items_by_key:
+                key = f"{account}#{index}"
+            
+            self.items_by_key[key] = item
+            self.account_keys.setdefault(account, []).append(key)
+        
+        self.selected_keys.intersection_update(self.items_by_key)
+    
     def load_inventory_data(self):
+        self.index_inventory_data()
         self.filter_inventory_by_sender()
     
+    def item_row_values(self, key):
+        item_data = self.items_by_key[key]
+        price = item_data.get('price', 0.0)
+        price_str = f"${price:.2f}" if isinstance(price, (int, float)) else str(price)
+        
+        return (
+            item_data.get('account', 'Unknown'),
+            item_data.get('name', 'Unknown Item'),
+            item_data.get('quantity', item_data.get('amount', 1)),
+            price_str,
+            "☑" if key in self.selected_keys else "☐"
+        )
+    
+    def sender_keys(self):
+        selected_account = self.sender_var.get()
+        if selected_account:
+            return self.account_keys.get(selected_account, [])
+        return list(self.items_by_key)
+    
     def filter_inventory_by_sender(self):
-        for item in self.items_tree.get_children():
-            self.items_tree.delete(item)
-        
         selected_account = self.sender_var.get()
         if selected_account:
-            self.selected_items = [item for item in self.selected_items 
-                                 if item.get('account') == selected_account]
+            self.selected_keys.intersection_update(self.account_keys.get(selected_account, ()))
         
         if not self.inventory_data:
-            self.items_tree.insert('', 'end', values=(
+            self.items_view.set_message((
                 "📋 Нет данных",
                 "Сначала проанализируйте инвентарь во вкладке 'Инвентарь'",
                 "0",
@@ -279,13 +318,9 @@ class TradeSendDialog:
             ))
             return
         
-        filtered_data = self.inventory_data
-        if selected_account:
-            filtered_data = [item for item in self.inventory_data 
-                           if item.get('account') == selected_account]
-        
-        if not filtered_data and selected_account:
-            self.items_tree.insert('', 'end', values=(
+        keys = self.sender_keys()
+        if not keys and selected_account:
+            self.items_view.set_message((
                 selected_account,
                 "Нет предметов для этого аккаунта",
                 "0",
@@ -294,25 +329,7 @@ class TradeSendDialog:
             ))
             return
         
-        for item_data in filtered_data:
-            account = item_data.get('account', 'Unknown')
-            name = item_data.get('name', 'Unknown Item')  
-            amount = item_data.get('quantity', item_data.get('amount', 1))
-            price = item_data.get('price', 0.0)
-            
-            price_str = f"${price:.2f}" if isinstance(price, (int, float)) else str(price)
-            
-            item_key = f"{account}_{name}"
-            selected_keys = [f"{item['account']}_{item['name']}" for item in self.selected_items]
-            checkbox = "☑" if item_key in selected_keys else "☐"
-            
-            self.items_tree.insert('', 'end', values=(
-                account,
-                name,
-                amount,
-                price_str,
-                checkbox
-            ))
+        self.items_view.set_rows(keys)
     
     def on_sender_changed(self, event=None):
         self.filter_inventory_by_sender()
@@ -320,37 +337,22 @@ class TradeSendDialog:
             self.stats_label.config(text=self.get_stats_text())
     
     def select_all_items(self):
-        selected_account = self.sender_var.get()
-        
-        filtered_data = self.inventory_data
-        if selected_account:
-            filtered_data = [item for item in self.inventory_data 
-                           if item.get('account') == selected_account]
-        
-        if selected_account:
-            self.selected_items = [item for item in self.selected_items 
-                                 if item.get('account') != selected_account]
+        if self.sender_var.get():
+            self.selected_keys.update(self.sender_keys())
         else:
-            self.selected_items = []
-        
-        for item_data in filtered_data:
-            if item_data not in self.selected_items:
-                self.selected_items.append(item_data)
+            self.selected_keys = set(self.items_by_key)
         
-        self.filter_inventory_by_sender()
+        self.items_view.refresh()
         if hasattr(self, 'stats_label'):
             self.stats_label.config(text=self.get_stats_text())
     
     def deselect_all_items(self):
-        selected_account = self.sender_var.get()
-        
-        if selected_account:
-            self.selected_items = [item for item in self.selected_items 
-                                 if item.get('account') != selected_account]
+        if self.sender_var.get():
+            self.selected_keys.difference_update(self.sender_keys())
         else:
-            self.selected_items = []
+            self.selected_keys.clear()
         
-        self.filter_inventory_by_sender()
+        self.items_view.refresh()
         if hasattr(self, 'stats_label'):
             self.stats_label.config(text=self.get_stats_text())
     
@@ -359,68 +361,34 @@ class TradeSendDialog:
         if not selection:
             return
         
-        item_id = selection[0]
-        item_values = self.items_tree.item(item_id)['values']
+        key = self.items_view.key_for_item(selection[0])
         
-        if not item_values or item_values[0] == "Нет данных":
-            messagebox.showinfo("Информация", 
-                "Сначала проанализируйте инвентарь во вкладке 'Инвентарь'.\n\n"
-                "1. Перейдите во вкладку 'Инвентарь'\n"
-                "2. Выберите нужные аккаунты\n"
-                "3. Нажмите 'Анализировать инвентарь'\n"
-                "4. После завершения анализа вернитесь к отправке трейда")
+        if key is None:
+            if not self.inventory_data:
+                messagebox.showinfo("Информация", 
+                    "Сначала проанализируйте инвентарь во вкладке 'Инвентарь'.\n\n"
+                    "1. Перейдите во вкладку 'Инвентарь'\n"
+                    "2. Выберите нужные аккаунты\n"
+                    "3. Нажмите 'Анализировать инвентарь'\n"
+                    "4. После завершения анализа вернитесь к отправке трейда")
             return
         
-        account = item_values[0]
-        name = item_values[1]
-        
-        selected_asset_ids = {item.get('asset_id') for item in self.selected_items if item.get('asset_id')}
+        item_data = self.items_by_key[key]
         
-        found_item = None
-        for original_item in self.inventory_data:
-            if (original_item.get('account') == account and 
-                original_item.get('name') == name and
-                original_item.get('asset_id') not in selected_asset_ids):
-                found_item = original_item
-                break
-        
-        if not found_item:
-            messagebox.showwarning("Внимание", "Предмет недоступен или уже выбран")
-            return
-        
-        if not found_item.get('asset_id'):
-            messagebox.showwarning("Внимание", f"У предмета '{name}' отсутствует asset_id. Возможно, инвентарь не был корректно проанализирован.")
-            return
-        
-        item_data = {
-            'account': found_item.get('account'),
-            'name': found_item.get('name'),
-            'amount': found_item.get('amount', 1),
-            'price': found_item.get('price', '$0.00'),
-            'app_id': found_item.get('app_id', 730),
-            'context_id': found_item.get('context_id', '2'),
-            'asset_id': found_item.get('asset_id'),
-            'item_id': item_id
-        }
-        
-        item_key = found_item.get('asset_id', f"{account}_{name}")
-        existing_keys = [item.get('asset_id', f"{item['account']}_{item['name']}") for item in self.selected_items]
-        
-        if item_key in existing_keys:
-            self.selected_items = [item for item in self.selected_items 
-                                 if item.get('asset_id', f"{item['account']}_{item['name']}") != item_key]
-            new_values = list(item_values)
-            new_values[4] = "☐"
-            self.items_tree.item(item_id, values=new_values)
+        if key in self.selected_keys:
+            self.selected_keys.discard(key)
         else:
-            self.selected_items.append(item_data)
-            new_values = list(item_values)
-            new_values[4] = "☑"
-            self.items_tree.item(item_id, values=new_values)
+            asset_id = item_data.get('asset_id')
+            if not asset_id or str(asset_id) == '0':
+                messagebox.showwarning("Внимание", f"У предмета '{item_data.get('name')}' отсутствует asset_id. Возможно, инвентарь не был корректно проанализирован.")
+                return
+            
+            self.selected_keys.add(key)
             
             if not self.sender_var.get():
-                self.sender_var.set(item_data['account'])
+                self.sender_var.set(item_data.get('account'))
         
+        self.items_view.refresh()
         if hasattr(self, 'stats_label'):
             self.stats_label.config(text=self.get_stats_text())
     
@@ -430,16 +398,13 @@ class TradeSendDialog:
         
         selected_account = self.sender_var.get()
         if selected_account:
-            filtered_items = [item for item in self.inventory_data 
-                            if item.get('account') == selected_account]
-            total_items = len(filtered_items)
+            total_items = len(self.account_keys.get(selected_account, ()))
             account_text = f"для {selected_account}"
         else:
-            total_items = len(self.inventory_data)
-            accounts = set(item.get('account', '') for item in self.inventory_data)
-            account_text = f"из {len(accounts)} аккаунтов"
+            total_items = len(self.items_by_key)
+            account_text = f"из {len(self.account_keys)} аккаунтов"
         
-        selected_count = len(self.selected_items)
+        selected_count = len(self.selected_keys)
         
         return f"Предметов: {total_items} | Выбрано: {selected_count} | {account_text}"
     
@@ -652,7 +617,7 @@ class TradeSendDialog:
                         item['account'] = selected_account
                         self.inventory_data.append(item)
                     
-                    self.dialog.after(0, lambda: self.filter_inventory_by_sender())
+                    self.dialog.after(0, self.load_inventory_data)
                 
             except Exception:
                 pass
@@ -5,6 +5,8 @@ from core.settings_manager import settings_manager
 
 class AutoConfirmationManager:
     
+    CONSUMER_NAME = 'auto_confirmation'
+    
     def __init__(self, settings, log_callback):
         self.settings = settings
         self.log_callback = log_callback
@@ -61,12 +63,7 @@ class AutoConfirmationManager:
             while self.running and not self.stop_event.is_set():
                 try:
                     print(f"🔄 Начало цикла проверки аккаунтов...")
-                    for account_login in accounts:
-                        if not self.running or self.stop_event.is_set():
-                            break
-                        
-                        print(f"🔍 Проверка аккаунта: {account_login}")
-                        self._check_account(account_login)
+                    self._check_accounts(accounts)
                     
                     if self.running:
                         print(f"💤 Ожидание {check_interval} сек до следующей проверки...")
@@ -83,78 +80,94 @@ class AutoConfirmationManager:
             self.running = False
             self.log_callback("🛑 Автоматизация завершена")
     
-    def _check_account(self, account_login):
-        try:
-            self.log_callback(f"🚀 Начало проверки аккаунта: {account_login}")
-            
-            accounts = settings_manager.get_accounts()
-            if account_login not in accounts:
-                self.log_callback(f"⚠️ Аккаунт {account_login} не найден")
-                return
-            
-            account_data = accounts[account_login]
-            mafile_name = account_data.get('mafile')
-            
-            if not mafile_name:
-                self.log_callback(f"⚠️ У аккаунта {account_login} нет mafile")
-                return
-            
-            display_name = account_data.get('display_name', account_login)
-            
-            mafile_basename = mafile_name
-            if mafile_basename.endswith('.maFile'):
-                mafile_basename = mafile_basename[:-7]
-            
-            self.log_callback(f"🔍 Проверка {display_name}...")
-            self.log_callback(f"🔧 Получение подтверждений для {mafile_basename}...")
-            
-            result = self.trade_manager.get_trade_confirmations(mafile_basename)
-            
-            if not result['success']:
-                self.log_callback(f"❌ {display_name}: {result.get('error', 'Неизвестная ошибка')}")
-                return
+    def _resolve_mafile_basename(self, account_login):
+        mafile_entry = settings_manager.find_mafile(account_login)
+        if not mafile_entry:
+            self.log_callback(f"⚠️ Аккаунт {account_login} не найден")
+            return None
+        return mafile_entry.account_name
+    
+    def _check_accounts(self, accounts):
+        basenames = {}
+        for account_login in accounts:
+            mafile_basename = self._resolve_mafile_basename(account_login)
+            if mafile_basename:
+                basenames[mafile_basename] = account_login
+        
+        if not basenames:
+            return
+        
+        results = self.trade_manager.get_confirmation_changes_many(list(basenames), self.CONSUMER_NAME)
+        
+        for mafile_basename, account_login in basenames.items():
+            if not self.running or self.stop_event.is_set():
+                break
             
-            confirmations = result.get('confirmations', [])
+            print(f"🔍 Проверка аккаунта: {account_login}")
+            display_name = settings_manager.get_account_display_name(account_login)
+            try:
+                self._process_changes(account_login, display_name, mafile_basename, results[mafile_basename])
+            except Exception as e:
+                self.log_callback(f"❌ Ошибка проверки {account_login}: {e}")
+    
+    def _process_changes(self, account_login, display_name, mafile_basename, result):
+        if not result['success']:
+            self.log_callback(f"❌ {display_name}: {result.get('error', 'Неизвестная ошибка')}")
+            return
+        
+        confirmations = result.get('added', [])
+        
+        if not confirmations:
+            return
+        
+        self.log_callback(f"📋 {display_name}: новых подтверждений {len(confirmations)} "
+                          f"(всего ожидает {result.get('pending_count', len(confirmations))})")
+        
+        to_accept = []
+        
+        for conf in confirmations:
+            if not self.running or self.stop_event.is_set():
+                self.trade_manager.release_confirmation(mafile_basename, conf['id'], self.CONSUMER_NAME)
+                continue
             
-            if not confirmations:
-                self.log_callback(f"✅ {display_name}: нет ожидающих подтверждений")
-                return
+            conf_type = conf.get('type', 'неизвестно')
+            conf_desc = conf.get('description', 'нет описания')
+            self.log_callback(f"🔍 {display_name}: обработка подтверждения тип={conf_type} описание='{conf_desc}'")
             
-            self.log_callback(f"📋 {display_name}: найдено {len(confirmations)} подтверждений")
+            if self._should_accept_confirmation(conf):
+                self.log_callback(f"✅ {display_name}: подтверждение пройдет фильтр, принимаем...")
+                to_accept.append(conf)
+            else:
+                self.trade_manager.mark_confirmation_processed(mafile_basename, conf['id'], self.CONSUMER_NAME)
+                self.log_callback(f"⏭️ {display_name}: пропущено {conf_type} (не соответствует фильтрам)")
+        
+        accepted_count = 0
+        
+        if to_accept:
+            self._ensure_trade_protection_acknowledged(account_login)
             
-            accepted_count = 0
+            accept_result = self.trade_manager.accept_confirmations(
+                mafile_basename, [conf['id'] for conf in to_accept]
+            )
+            confirmed_ids = {str(conf_id) for conf_id in accept_result.get('confirmed', [])}
+            missing_ids = {str(conf_id) for conf_id in accept_result.get('missing', [])}
             
-            for conf in confirmations:
-                if not self.running or self.stop_event.is_set():
-                    break
-                
+            for conf in to_accept:
                 conf_type = conf.get('type', 'неизвестно')
-                conf_desc = conf.get('description', 'нет описания')
-                self.log_callback(f"🔍 {display_name}: обработка подтверждения тип={conf_type} описание='{conf_desc}'")
-                
-                if self._should_accept_confirmation(conf):
-                    self.log_callback(f"✅ {display_name}: подтверждение пройдет фильтр, принимаем...")
-                    
-                    self._ensure_trade_protection_acknowledged(account_login)
-                    
-                    accept_result = self.trade_manager.accept_confirmation(mafile_basename, conf['id'])
-                    
-                    if accept_result['success']:
-                        accepted_count += 1
-                        self.log_callback(f"✅ {display_name}: принято {conf_type}")
+                if str(conf['id']) in confirmed_ids:
+                    accepted_count += 1
+                    self.trade_manager.mark_confirmation_processed(mafile_basename, conf['id'], self.CONSUMER_NAME)
+                    self.log_callback(f"✅ {display_name}: принято {conf_type}")
+                else:
+                    self.trade_manager.release_confirmation(mafile_basename, conf['id'], self.CONSUMER_NAME)
+                    if str(conf['id']) in missing_ids:
+                        error_msg = "подтверждение не найдено в Steam"
                     else:
                         error_msg = accept_result.get('error', 'Неизвестная ошибка')
-                        self.log_callback(f"❌ {display_name}: ошибка принятия - {error_msg}")
-                    
-                    time.sleep(2)
-                else:
-                    self.log_callback(f"⏭️ {display_name}: пропущено {conf_type} (не соответствует фильтрам)")
-            
-            if accepted_count > 0:
-                self.log_callback(f"🎉 {display_name}: принято {accepted_count} подтверждений")
-                
-        except Exception as e:
-            self.log_callback(f"❌ Ошибка проверки {account_login}: {e}")
+                    self.log_callback(f"❌ {display_name}: ошибка принятия {conf_type} - {error_msg}")
+        
+        if accepted_count > 0:
+            self.log_callback(f"🎉 {display_name}: принято {accepted_count} подтверждений")
     
     def _should_accept_confirmation(self, confirmation):
         try:
@@ -4,6 +4,8 @@ import threading
 import time
 from .base_tab import BaseTab
 from core.settings_manager import settings_manager
+from steam.inventory_table import InventoryTable
+from ..virtual_tree import VirtualTreeview
 
 
 class TradeTab(BaseTab):
@@ -20,8 +22,12 @@ class TradeTab(BaseTab):
         self.items_count_label = None
         self.analyzed_accounts_label = None
         self.items_tree = None
+        self.items_view = None
         
-        self.full_inventory_data = []
+        self.inventory_table = InventoryTable()
+        self.rendered_rows = 0
+        self.display_names = {}
+        self.analysis_running = False
         
         super().__init__(notebook, main_window, "Инвентарь")
 
@@ -155,8 +161,9 @@ class TradeTab(BaseTab):
         self.items_tree.column("price", width=100, minwidth=80)
         self.items_tree.column("total", width=120, minwidth=100)
 
-        items_scrollbar = ttk.Scrollbar(results_frame, orient="vertical", command=self.items_tree.yview)
-        self.items_tree.configure(yscrollcommand=items_scrollbar.set)
+        items_scrollbar = ttk.Scrollbar(results_frame, orient="vertical")
+        self.items_view = VirtualTreeview(self.items_tree, items_scrollbar,
+                                          self.inventory_view_values, self.inventory_view_tags)
 
         self.items_tree.pack(side="left", fill="both", expand=True)
         items_scrollbar.pack(side="right", fill="y")
@@ -297,39 +304,38 @@ class TradeTab(BaseTab):
                 from steam.steam_inventory_parser import SteamInventoryParser, format_price
                 
                 parser = SteamInventoryParser()
+                table = self.inventory_table
+                table.currency = currency
+                table.currency_symbol = parser.get_currency_symbol(currency)
                 
-                total_items = 0
-                total_value = 0.0
+                self.analysis_running = True
+                self.main_window.root.after(0, self.flush_inventory_rows)
                 
-                for i, account_login in enumerate(selected_accounts):
-                    status_text = f"Анализ {i+1}/{len(selected_accounts)}: {account_login}"
-                    self.main_window.root.after(0, lambda t=status_text: self.update_status(t))
+                def on_account(i, account_login, inventory_result):
+                    if not inventory_result['success'] or inventory_result.get('error'):
+                        status_text = f"⚠️ {account_login}: {inventory_result.get('error', 'Неизвестная ошибка')}"
+                    else:
+                        status_text = f"Анализ {i+1}/{len(selected_accounts)}: {account_login}"
+                    items_count = table.total_amount()
+                    total_value = table.total_value()
+                    
+                    def update_progress():
+                        self.update_status(status_text)
+                        self.items_count_label.config(text=str(items_count))
+                        self.total_value_label.config(text=f"{table.currency_symbol}{total_value:.2f}")
+                        self.analyzed_accounts_label.config(text=f"{i+1}/{len(selected_accounts)}")
                     
-                    try:
-                        inventory_result = parser.analyze_account_inventory(account_login, game_id, currency)
-                        
-                        if not inventory_result['success']:
-                            error_text = f"⚠️ {account_login}: {inventory_result.get('error', 'Неизвестная ошибка')}"
-                            self.main_window.root.after(0, lambda t=error_text: self.update_status(t))
-                            continue
-                        
-                        account_items = inventory_result['items']
-                        account_value = inventory_result['total_value']
-                        
-                        for item in account_items:
-                            total_items += item['amount']
-                            item_value = item['total_price']
-                            total_value += item_value
-                            
-                            def add_item(acc=account_login, it=item, val=item_value):
-                                self.main_window.root.after(0, lambda: self.add_inventory_item(acc, it, val))
-                            add_item()
-                            
-                    except Exception as account_error:
-                        error_text = f"Ошибка анализа {account_login}: {account_error}"
-                        self.main_window.root.after(0, lambda t=error_text: self.update_status(t))
+                    self.main_window.root.after(0, update_progress)
+                
+                parser.analyze_accounts(selected_accounts, game_id, currency, table=table, on_account=on_account)
+                
+                self.analysis_running = False
+                total_items = table.total_amount()
+                total_value = table.total_value()
                 
                 def update_totals():
+                    self.flush_inventory_rows()
+                    self.refresh_inventory_prices()
                     symbol = self.get_currency_symbol()
                     self.total_value_label.config(text=f"{symbol}{total_value:.2f}")
                     self.items_count_label.config(text=str(total_items))
@@ -344,6 +350,7 @@ class TradeTab(BaseTab):
                     "Убедитесь что файл steam_inventory_parser.py находится в корне проекта."))
             
         except Exception as e:
+            self.analysis_running = False
             error_text = f"💥 Критическая ошибка анализа: {str(e)}"
             self.main_window.root.after(0, lambda t=error_text: self.update_status(t))
 
@@ -352,8 +359,7 @@ class TradeTab(BaseTab):
             import csv
             import time
             
-            items = self.items_tree.get_children()
-            if not items:
+            if not len(self.inventory_table):
                 messagebox.showwarning("Внимание", "Нет данных для экспорта")
                 return
             
@@ -376,11 +382,7 @@ class TradeTab(BaseTab):
                 writer.writerow([f"Дата: {time.strftime('%Y-%m-%d %H:%M:%S')}"])
                 writer.writerow([])
                 
-                writer.writerow(["Аккаунт", "Предмет", "Количество", "Статус", "Цена за шт.", "Общая стоимость"])
-                
-                for item_id in items:
-                    values = self.items_tree.item(item_id)['values']
-                    writer.writerow(values)
+                self.inventory_table.write_csv(csvfile, settings_manager.get_account_display_name)
                 
                 writer.writerow([])
                 writer.writerow(["ИТОГО:", "", "", "", "", self.total_value_label.cget('text')])
@@ -411,40 +413,53 @@ class TradeTab(BaseTab):
         }
         return symbols.get(self.currency_var.get(), "$")
 
-    def add_inventory_item(self, account_login, item, item_value):
+    def inventory_row_values(self, index, symbol, display_names):
+        table = self.inventory_table
+        account = table.strings[table.account[index]]
+        display_name = display_names.get(account)
+        if display_name is None:
+            display_name = display_names[account] = settings_manager.get_account_display_name(account)
+        
+        return (
+            display_name,
+            table.strings[table.name[index]],
+            table.amount[index],
+            table.status(index),
+            f"{symbol}{table.price[index]:.2f}",
+            f"{symbol}{table.item_value(index):.2f}"
+        )
+
+    def inventory_view_values(self, index):
+        return self.inventory_row_values(index, self.get_currency_symbol(), self.display_names)
+
+    def inventory_view_tags(self, index):
+        table = self.inventory_table
+        return (table.strings[table.market_name[index]] or table.strings[table.name[index]],)
+
+    def flush_inventory_rows(self):
         try:
-            from core.settings_manager import settings_manager
-            display_name = settings_manager.get_account_display_name(account_login)
-            
-            status = "Продаваемый" if item.get('marketable', False) else "Не продается"
-            if not item.get('tradable', True):
-                status = "Не обмениваемый"
-            
-            full_item_data = item.copy()
-            full_item_data['account'] = account_login
-            full_item_data['display_name'] = display_name 
-            full_item_data['item_value'] = item_value
-            full_item_data['status'] = status
-            self.full_inventory_data.append(full_item_data)
-            
-            symbol = self.get_currency_symbol()
-            self.items_tree.insert('', 'end', values=(
-                display_name,
-                item['name'],
-                item['amount'],
-                status,
-                f"{symbol}{item['price']:.2f}",
-                f"{symbol}{item_value:.2f}"
-            ), tags=(item.get('market_name', item['name']),))
+            stop = len(self.inventory_table)
+            if stop > self.rendered_rows:
+                self.items_view.extend(range(self.rendered_rows, stop))
+                self.rendered_rows = stop
             
         except Exception as e:
             print(f"Ошибка добавления предмета: {e}")
+        
+        if self.analysis_running:
+            self.main_window.root.after(100, self.flush_inventory_rows)
+
+    def refresh_inventory_prices(self):
+        try:
+            self.items_view.refresh()
+        except Exception as e:
+            print(f"Ошибка обновления цен: {e}")
 
     def clear_inventory_results(self):
-        for item in self.items_tree.get_children():
-            self.items_tree.delete(item)
-        
-        self.full_inventory_data = []
+        self.inventory_table.clear()
+        self.items_view.set_rows([])
+        self.rendered_rows = 0
+        self.display_names = {}
         
         symbol = self.get_currency_symbol()
         self.total_value_label.config(text=f"{symbol}0.00")
@@ -453,17 +468,17 @@ class TradeTab(BaseTab):
 
     def open_trade_send_dialog(self):
         try:
-            items = self.items_tree.get_children()
-            if not items:
+            if not len(self.items_view):
                 messagebox.showwarning("Внимание", "Нет данных инвентаря для отправки трейда")
                 return
             
-            if not self.full_inventory_data:
+            if not len(self.inventory_table):
                 messagebox.showwarning("Внимание", "Нет полных данных инвентаря. Проведите анализ сначала.")
                 return
             
             from ..dialogs.trade_send_dialog import TradeSendDialog
-            dialog = TradeSendDialog(self.main_window.root, self.update_status, self.full_inventory_data)
+            inventory_data = self.inventory_table.to_dicts(settings_manager.get_account_display_name)
+            dialog = TradeSendDialog(self.main_window.root, self.update_status, inventory_data)
             
         except ImportError:
             messagebox.showinfo("Информация", "Диалог отправки трейдов будет добавлен в следующей версии")
@@ -0,0 +1,199 @@
+from tkinter import ttk
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Set
+
+
+class VirtualTreeview:
+
+    HEADER_HEIGHT = 25
+    DEFAULT_ROW_HEIGHT = 20
+
+    def __init__(self, tree: ttk.Treeview, scrollbar: Optional[ttk.Scrollbar],
+                 row_values: Callable[[Hashable], Sequence[Any]],
+                 row_tags: Optional[Callable[[Hashable], Sequence[str]]] = None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_values = row_values
+        self.row_tags = row_tags
+
+        self.keys: List[Hashable] = []
+        self.offset = 0
+        self.focus_keys: Set[Hashable] = set()
+        self._positions: Optional[Dict[Hashable, int]] = None
+        self._slots: List[str] = []
+        self._slot_keys: List[Optional[Hashable]] = []
+        self._message: Optional[Sequence[Any]] = None
+
+        if scrollbar is not None:
+            scrollbar.configure(command=self.yview)
+        tree.configure(yscrollcommand=lambda *args: None)
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            tree.bind(sequence, self._on_mousewheel)
+        tree.bind("<Configure>", lambda event: self.render())
+        tree.bind("<Up>", lambda event: self._on_arrow(-1))
+        tree.bind("<Down>", lambda event: self._on_arrow(1))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def visible_count(self) -> int:
+        height = self.tree.winfo_height()
+        if height <= 1:
+            return int(self.tree.cget("height"))
+
+        row_height = ttk.Style().lookup("Treeview", "rowheight") or self.DEFAULT_ROW_HEIGHT
+        return max(int((height - self.HEADER_HEIGHT) // int(row_height)), 1)
+
+    def set_rows(self, keys: Iterable[Hashable], keep_offset: bool = False):
+        if keep_offset:
+            self._sync_focus()
+        else:
+            self._forget_selection()
+            self.offset = 0
+        self.keys = list(keys)
+        self._positions = None
+        self._message = None
+        self.render()
+
+    def extend(self, keys: Iterable[Hashable]):
+        self._message = None
+        self.keys.extend(keys)
+        self._positions = None
+        self.render()
+
+    def remove(self, key: Hashable):
+        position = self.position(key)
+        if position is None:
+            return
+        self._sync_focus()
+        del self.keys[position]
+        self._positions = None
+        self.focus_keys.discard(key)
+        self.render()
+
+    def set_message(self, values: Sequence[Any]):
+        self._forget_selection()
+        self.keys = []
+        self._positions = None
+        self.offset = 0
+        self._message = values
+        self.render()
+
+    def position(self, key: Hashable) -> Optional[int]:
+        if self._positions is None:
+            self._positions = {row_key: index for index, row_key in enumerate(self.keys)}
+        return self._positions.get(key)
+
+    def key_for_item(self, item_id: str) -> Optional[Hashable]:
+        try:
+            return self._slot_keys[self._slots.index(item_id)]
+        except ValueError:
+            return None
+
+    def selected_keys(self) -> List[Hashable]:
+        self._sync_focus()
+        return sorted((key for key in self.focus_keys if self.position(key) is not None), key=self.position)
+
+    def see(self, key: Hashable):
+        position = self.position(key)
+        if position is None:
+            return
+        count = self.visible_count()
+        if position < self.offset:
+            self.offset = position
+        elif position >= self.offset + count:
+            self.offset = position - count + 1
+        self.render()
+
+    def refresh(self):
+        self.render()
+
+    def yview(self, *args):
+        count = self.visible_count()
+        total = len(self.keys)
+
+        if args and args[0] == "moveto":
+            self.offset = int(float(args[1]) * total)
+        elif args and args[0] == "scroll":
+            step = int(args[1])
+            self.offset += step * count if args[2] == "pages" else step
+        self.render()
+
+    def _on_mousewheel(self, event):
+        if getattr(event, "num", None) == 4:
+            step = -3
+        elif getattr(event, "num", None) == 5:
+            step = 3
+        else:
+            step = -3 if event.delta > 0 else 3
+        self.yview("scroll", step, "units")
+        return "break"
+
+    def _on_arrow(self, step: int):
+        selected = self.tree.selection()
+        if not selected or selected[0] not in self._slots:
+            return None
+
+        slot = self._slots.index(selected[0])
+        if 0 <= slot + step < len(self._slots):
+            return None
+
+        position = self.position(self._slot_keys[slot])
+        if position is None or not 0 <= position + step < len(self.keys):
+            return "break"
+
+        key = self.keys[position + step]
+        self._forget_selection()
+        self.focus_keys.add(key)
+        self.see(key)
+        return "break"
+
+    def _forget_selection(self):
+        self.focus_keys.clear()
+        self._slot_keys = [None] * len(self._slots)
+
+    def _sync_focus(self):
+        selected = set(self.tree.selection())
+        for item_id, key in zip(self._slots, self._slot_keys):
+            if key is None:
+                continue
+            if item_id in selected:
+                self.focus_keys.add(key)
+            else:
+                self.focus_keys.discard(key)
+
+    def render(self):
+        self._sync_focus()
+
+        count = self.visible_count()
+        total = len(self.keys)
+        self.offset = max(0, min(self.offset, total - count))
+
+        if self._message is not None:
+            rows = [(None, self._message, ())]
+        else:
+            rows = [
+                (key, self.row_values(key), self.row_tags(key) if self.row_tags else ())
+                for key in self.keys[self.offset:self.offset + count]
+            ]
+
+        while len(self._slots) < len(rows):
+            self._slots.append(self.tree.insert("", "end"))
+        while len(self._slots) > len(rows):
+            self.tree.delete(self._slots.pop())
+
+        self._slot_keys = []
+        selection = []
+        for item_id, (key, values, tags) in zip(self._slots, rows):
+            self.tree.item(item_id, values=values, tags=tags)
+            self._slot_keys.append(key)
+            if key is not None and key in self.focus_keys:
+                selection.append(item_id)
+
+        self.tree.selection_set(selection)
+
+        if self.scrollbar is not None:
+            if total:
+                self.scrollbar.set(self.offset / total, min(self.offset + count, total) / total)
+            else:
+                self.scrollbar.set(0, 1)
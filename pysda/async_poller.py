@@ -0,0 +1,219 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode, urlsplit
+
+import aiohttp
+
+from core.rate_limiter import MAX_RETRIES, MAX_RETRY_WAIT, get_rate_limiter, parse_retry_after
+
+try:
+    from utils.logger import logger
+except ImportError:
+    class SimpleLogger:
+        @staticmethod
+        def info(msg): print(f"[INFO] {msg}")
+        @staticmethod
+        def error(msg): print(f"[ERROR] {msg}")
+        @staticmethod
+        def warning(msg): print(f"[WARNING] {msg}")
+        @staticmethod
+        def debug(msg): print(f"[DEBUG] {msg}")
+
+    logger = SimpleLogger()
+
+
+CONF_URL = 'https://steamcommunity.com/mobileconf'
+TRADE_OFFERS_URL = 'https://api.steampowered.com/IEconService/GetTradeOffers/v1'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+class PollingError(Exception):
+    pass
+
+
+class PollingAccount:
+
+    def __init__(self, username: str, steam_id: str, identity_secret: str, cookie_jar, api_key: Optional[str] = None):
+        self.username = username
+        self.steam_id = str(steam_id)
+        self.identity_secret = identity_secret
+        self.cookie_jar = cookie_jar
+        self.api_key = api_key
+
+    def cookie_header(self, url: str) -> str:
+        host = urlsplit(url).hostname or ''
+        cookies = {}
+        for cookie in list(self.cookie_jar):
+            domain = cookie.domain.lstrip('.')
+            if host == domain or host.endswith('.' + domain):
+                cookies[cookie.name] = cookie.value
+        return '; '.join(f'{name}={value}' for name, value in cookies.items())
+
+    def confirmation_params(self, tag: str) -> Dict[str, Any]:
+        from pysda.steampy.confirmation import ConfirmationExecutor
+
+        executor = ConfirmationExecutor(self.identity_secret, self.steam_id, None)
+        params = executor._create_confirmation_params(tag)
+        return {key: value.decode() if isinstance(value, bytes) else str(value) for key, value in params.items()}
+
+
+class AsyncPollingEngine:
+
+    MAX_CONCURRENCY = 64
+    REQUEST_TIMEOUT = 30
+
+    def __init__(self, max_concurrency: int = MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or not self._thread.is_alive():
+                self._loop = asyncio.new_event_loop()
+                self._session = None
+                self._semaphore = None
+                self._thread = threading.Thread(target=self._loop.run_forever, name="AsyncPollingEngine", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def run(self, coro, timeout: Optional[float] = None):
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    def close(self):
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), loop).result(10)
+        loop.call_soon_threadsafe(loop.stop)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency, ttl_dns_cache=300),
+                cookie_jar=aiohttp.DummyCookieJar(),
+                timeout=aiohttp.ClientTimeout(total=self.REQUEST_TIMEOUT),
+                headers={'User-Agent': USER_AGENT}
+            )
+        return self._session
+
+    async def _request(self, account: PollingAccount, method: str, url: str,
+                       headers: Optional[Dict[str, str]] = None, **kwargs) -> Any:
+        session = await self._get_session()
+        request_headers = dict(headers or {})
+        cookie_header = account.cookie_header(url)
+        if cookie_header:
+            request_headers['Cookie'] = cookie_header
+
+        params = kwargs.get('params')
+        bucket = get_rate_limiter().bucket_for_url(f"{url}?{urlencode(params)}" if params else url, request_headers)
+
+        for attempt in range(MAX_RETRIES + 1):
+            if bucket is not None:
+                await bucket.acquire_async()
+
+            async with self._semaphore:
+                async with session.request(method, url, headers=request_headers, **kwargs) as response:
+                    text = await response.text()
+
+            if bucket is None:
+                break
+            if response.status != 429:
+                bucket.on_success()
+                break
+
+            delay = bucket.on_throttled(parse_retry_after(response.headers.get('Retry-After')))
+            if attempt == MAX_RETRIES or delay > MAX_RETRY_WAIT:
+                break
+
+        if 'Steam Guard Mobile Authenticator is providing incorrect Steam Guard codes.' in text:
+            raise PollingError(f"{account.username}: Invalid Steam Guard file")
+        if response.status != 200:
+            raise PollingError(f"{account.username}: HTTP {response.status} для {url}")
+
+        try:
+            return json.loads(text)
+        except ValueError:
+            raise PollingError(f"{account.username}: некорректный JSON от {url}")
+
+    async def fetch_confirmations(self, account: PollingAccount) -> List[Dict[str, Any]]:
+        data = await self._request(
+            account, 'GET', f'{CONF_URL}/getlist',
+            params=account.confirmation_params('conf'),
+            headers={'X-Requested-With': 'com.valvesoftware.android.steam.community'}
+        )
+        if not data.get('success'):
+            raise PollingError(f"{account.username}: не удалось получить подтверждения")
+        return data.get('conf', [])
+
+    async def send_confirmations(self, account: PollingAccount, confirmations: List[Any], op: str = 'allow') -> Dict[str, Any]:
+        if not confirmations:
+            return {'success': True}
+
+        data = list(account.confirmation_params(op).items())
+        data.append(('op', op))
+        data.extend(('cid[]', str(confirmation.data_confid)) for confirmation in confirmations)
+        data.extend(('ck[]', str(confirmation.nonce)) for confirmation in confirmations)
+
+        return await self._request(
+            account, 'POST', f'{CONF_URL}/multiajaxop',
+            data=data,
+            headers={'X-Requested-With': 'XMLHttpRequest'}
+        )
+
+    async def fetch_trade_offers(self, account: PollingAccount) -> Dict[str, Any]:
+        if not account.api_key:
+            raise PollingError(f"{account.username}: нет API ключа для получения трейдов")
+
+        return await self._request(account, 'GET', TRADE_OFFERS_URL, params={
+            'key': account.api_key,
+            'get_sent_offers': 1,
+            'get_received_offers': 1,
+            'get_descriptions': 0,
+            'language': 'english',
+            'active_only': 1,
+            'historical_only': 0,
+        })
+
+    async def _gather(self, calls: Dict[str, Any]) -> Dict[str, Any]:
+        results = await asyncio.gather(*calls.values(), return_exceptions=True)
+        return dict(zip(calls.keys(), results))
+
+    def fetch_confirmations_many(self, accounts: List[PollingAccount], timeout: Optional[float] = None) -> Dict[str, Any]:
+        return self.run(self._gather({account.username: self.fetch_confirmations(account) for account in accounts}), timeout)
+
+    def send_confirmations_many(self, batches: Dict[str, tuple], timeout: Optional[float] = None) -> Dict[str, Any]:
+        return self.run(self._gather({
+            username: self.send_confirmations(account, confirmations)
+            for username, (account, confirmations) in batches.items()
+        }), timeout)
+
+    def fetch_trade_offers_many(self, accounts: List[PollingAccount], timeout: Optional[float] = None) -> Dict[str, Any]:
+        return self.run(self._gather({account.username: self.fetch_trade_offers(account) for account in accounts}), timeout)
+
+
+_engine: Optional[AsyncPollingEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_polling_engine() -> AsyncPollingEngine:
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = AsyncPollingEngine()
+        return _engine
@@ -5,11 +5,12 @@ import traceback
 import os
 import json
 import sys
+import threading
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from core.settings_manager import get_application_path
 from datetime import datetime
-from typing import List, Dict, Optional, Any, Union
+from typing import List, Dict, Optional, Any, Union, Set, Tuple, Callable
 from urllib.parse import unquote
 
 try:
@@ -37,6 +38,73 @@ except ImportError:
     def print_and_log(msg): print(msg)
 
 
+WALLET_CURRENCY_SYMBOLS = {
+    '$': 'USD', '$USD': 'USD', '£': 'GBP', '€': 'EUR', 'CHF': 'CHF', 'pуб': 'RUB', 'руб': 'RUB', 'zł': 'PLN',
+    'R$': 'BRL', '¥': 'CNY', 'kr': 'NOK', 'Rp': 'IDR', 'RM': 'MYR', 'P': 'PHP', '₱': 'PHP', 'S$': 'SGD',
+    '฿': 'THB', '₫': 'VND', '₩': 'KRW', 'TL': 'TRY', '₺': 'TRY', '₴': 'UAH', 'Mex$': 'MXN', 'CDN$': 'CAD',
+    'A$': 'AUD', 'NZ$': 'NZD', '₹': 'INR', 'CLP$': 'CLP', 'S/': 'PEN', 'COL$': 'COP', 'R': 'ZAR',
+    'HK$': 'HKD', 'NT$': 'TWD', 'SR': 'SAR', 'AED': 'AED', 'ARS$': 'ARS', '₪': 'ILS', '₸': 'KZT',
+    'KD': 'KWD', 'QR': 'QAR', '₡': 'CRC', '$U': 'UYU',
+}
+
+
+def parse_wallet_amount(formatted: str) -> float:
+    digits = re.sub(r'[^\d,.]', '', formatted).strip(',.')
+    if ',' in digits and '.' in digits:
+        thousands = ',' if digits.rfind('.') > digits.rfind(',') else '.'
+        digits = digits.replace(thousands, '').replace(',', '.')
+    elif ',' in digits:
+        head, _, tail = digits.rpartition(',')
+        digits = f"{head.replace(',', '')}.{tail}" if len(tail) == 2 else digits.replace(',', '')
+    return float(digits) if digits else 0.0
+
+
+def wallet_currency(formatted: str) -> str:
+    # Символ валюты сравниваем целиком, иначе HK$, NT$ и S$ совпадут с обычным $
+    symbol = re.sub(r'[\d\s.,\-]', '', formatted)
+    return WALLET_CURRENCY_SYMBOLS.get(symbol, '')
+
+
+class ConfirmationFetchError(Exception):
+    pass
+
+
+class ConfirmationTracker:
+    
+    def __init__(self):
+        self._pending: Dict[str, str] = {}
+        self._processed: Set[str] = set()
+        self._lock = threading.Lock()
+    
+    def update(self, raw_confirmations: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        current = {str(conf_data['id']): conf_data for conf_data in raw_confirmations}
+        
+        with self._lock:
+            added = [
+                conf_data for conf_id, conf_data in current.items()
+                if conf_id not in self._processed and self._pending.get(conf_id) != str(conf_data['nonce'])
+            ]
+            removed = [conf_id for conf_id in self._pending if conf_id not in current]
+            
+            self._pending = {conf_id: str(conf_data['nonce']) for conf_id, conf_data in current.items()}
+            self._processed.intersection_update(current)
+        
+        return added, removed
+    
+    def mark_processed(self, confirmation_id: Union[str, int]):
+        with self._lock:
+            self._processed.add(str(confirmation_id))
+    
+    def release(self, confirmation_id: Union[str, int]):
+        with self._lock:
+            self._pending.pop(str(confirmation_id), None)
+            self._processed.discard(str(confirmation_id))
+    
+    def is_processed(self, confirmation_id: Union[str, int]) -> bool:
+        with self._lock:
+            return str(confirmation_id) in self._processed
+
+
 class TradeConfirmationManager:
     
     def __init__(self, username: str, mafile_path: str, api_key: Optional[str] = None):
@@ -52,6 +120,11 @@ class TradeConfirmationManager:
             raise
         
         self._steam_client = None
+        self._trackers: Dict[str, ConfirmationTracker] = {}
+        self._trackers_lock = threading.Lock()
+        self._known_confirmations: Dict[str, Any] = {}
+        self._confirmations_by_creator: Dict[int, Any] = {}
+        self._confirmation_executor = None
         self._initialize_steam_client()
         
         logger.info(f"🔄 Trade Confirmation Manager инициализирован для {username}")
@@ -95,6 +168,10 @@ class TradeConfirmationManager:
             logger.error(f"❌ Ошибка инициализации Steam клиента: {e}")
             raise
     
+    @property
+    def is_logged_in(self) -> bool:
+        return self._steam_client is not None and self._steam_client.was_login_executed
+    
     def _get_steam_client(self):
         if not self._steam_client:
             self._initialize_steam_client()
@@ -294,35 +371,164 @@ class TradeConfirmationManager:
             logger.error(f"❌ Ошибка валидации API ключа: {e}")
             return False
     
-    def get_guard_confirmations(self) -> List[Dict[str, Any]]:
-        try:
-            steam_client = self._get_steam_client()
-            
-            logger.info("🔐 Получаем все подтверждения Guard...")
-            
-            if not hasattr(steam_client, 'steam_guard') or not steam_client.steam_guard:
-                logger.warning("⚠️ Steam Guard не настроен, невозможно получить подтверждения")
-                return []
-            
-            import sys
-            import os
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            from pysda.steampy.confirmation import ConfirmationExecutor, Confirmation
-            
-            confirmation_executor = ConfirmationExecutor(
+    def _create_confirmation_executor(self, steam_client=None):
+        from pysda.steampy.confirmation import ConfirmationExecutor
+        
+        steam_client = steam_client or self._get_steam_client()
+        executor = self._confirmation_executor
+        if executor is None or executor._session is not steam_client._session:
+            executor = self._confirmation_executor = ConfirmationExecutor(
                 identity_secret=steam_client.steam_guard['identity_secret'],
                 my_steam_id=steam_client.steam_id,
                 session=steam_client._session
             )
+        return executor
+    
+    def _fetch_raw_confirmations(self) -> Tuple[List[Dict[str, Any]], Any]:
+        steam_client = self._get_steam_client()
+        
+        if not hasattr(steam_client, 'steam_guard') or not steam_client.steam_guard:
+            raise ConfirmationFetchError("Steam Guard не настроен, невозможно получить подтверждения")
+        
+        confirmation_executor = self._create_confirmation_executor(steam_client)
+        
+        confirmations_page = confirmation_executor._fetch_confirmations_page()
+        confirmations_json = confirmations_page.json()
+        
+        if not confirmations_json.get('success'):
+            raise ConfirmationFetchError("Не удалось получить подтверждения")
+        
+        conf_list = confirmations_json.get('conf', [])
+        self._remember_confirmations(conf_list)
+        
+        return conf_list, confirmation_executor
+    
+    def _remember_confirmations(self, raw_confirmations: List[Dict[str, Any]]):
+        from pysda.steampy.confirmation import Confirmation
+        
+        known = {}
+        for conf_data in raw_confirmations:
+            try:
+                known[str(conf_data['id'])] = Confirmation(
+                    data_confid=conf_data['id'],
+                    nonce=conf_data['nonce'],
+                    creator_id=int(conf_data['creator_id'])
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+        
+        self._known_confirmations = known
+        self._confirmations_by_creator = {conf.creator_id: conf for conf in known.values()}
+    
+    def get_wallet_balance(self) -> Dict[str, Any]:
+        steam_client = self._get_steam_client()
+        formatted = steam_client.get_wallet_balance(convert_to_decimal=False).strip()
+        
+        return {
+            'balance': parse_wallet_amount(formatted),
+            'currency': wallet_currency(formatted),
+            'formatted': formatted
+        }
+    
+    def get_polling_account(self):
+        from pysda.async_poller import PollingAccount
+        
+        steam_client = self._get_steam_client()
+        return PollingAccount(
+            username=self.username,
+            steam_id=steam_client.steam_id,
+            identity_secret=steam_client.steam_guard['identity_secret'],
+            cookie_jar=steam_client._session.cookies,
+            api_key=self._api_key or getattr(steam_client, '_api_key', None)
+        )
+    
+    def get_known_confirmation(self, confirmation_id: Union[str, int]):
+        return self._known_confirmations.get(str(confirmation_id))
+    
+    def forget_confirmation(self, confirmation_obj):
+        self._known_confirmations.pop(str(confirmation_obj.data_confid), None)
+        if self._confirmations_by_creator.get(confirmation_obj.creator_id) is confirmation_obj:
+            del self._confirmations_by_creator[confirmation_obj.creator_id]
+    
+    def find_confirmation_by_creator(self, creator_id: Union[str, int], refresh: bool = True):
+        creator_id = int(creator_id)
+        conf = self._confirmations_by_creator.get(creator_id)
+        if conf is None and refresh:
+            try:
+                self._fetch_raw_confirmations()
+            except ConfirmationFetchError as e:
+                logger.error(f"❌ {e}")
+                return None
+            conf = self._confirmations_by_creator.get(creator_id)
+        return conf
+    
+    def confirm_trade_offer(self, trade_offer_id: Union[str, int], attempts: int = 3, delay: float = 1.0) -> bool:
+        from pysda.steampy.exceptions import ConfirmationExpected
+        
+        for attempt in range(attempts):
+            conf = self.find_confirmation_by_creator(trade_offer_id)
             
-            confirmations_page = confirmation_executor._fetch_confirmations_page()
-            confirmations_json = confirmations_page.json()
+            if conf is None and self._known_confirmations:
+                try:
+                    conf = self._create_confirmation_executor()._select_trade_offer_confirmation(
+                        list(self._known_confirmations.values()), str(trade_offer_id)
+                    )
+                except ConfirmationExpected:
+                    conf = None
             
-            if not confirmations_json.get('success'):
-                logger.error("❌ Не удалось получить подтверждения")
-                return []
+            if conf is not None:
+                logger.info(f"🔗 Найдено подтверждение {conf.data_confid} для трейда {trade_offer_id}")
+                return self.confirm_guard_confirmation(conf)
+            
+            if attempt + 1 < attempts:
+                time.sleep(delay * (attempt + 1))
+        
+        logger.warning(f"⚠️ Не найдено подтверждение для трейда {trade_offer_id}")
+        return False
+    
+    def _build_confirmation(self, conf_data: Dict[str, Any], confirmation_executor) -> Dict[str, Any]:
+        from pysda.steampy.confirmation import Confirmation
+        
+        confirmation_type = self._determine_confirmation_type_from_json(conf_data)
+        
+        conf = self.get_known_confirmation(conf_data['id'])
+        if conf is None or str(conf.nonce) != str(conf_data['nonce']):
+            conf = Confirmation(
+                data_confid=conf_data['id'],
+                nonce=conf_data['nonce'],
+                creator_id=int(conf_data['creator_id'])
+            )
+        
+        return {
+            'id': conf_data['id'],
+            'nonce': conf_data['nonce'],
+            'creator_id': int(conf_data['creator_id']),
+            'type': confirmation_type,
+            'description': conf_data.get('headline', f"Подтверждение #{conf_data['id']}"),
+            'confirmation': conf,
+            'executor': confirmation_executor
+        }
+    
+    def _build_confirmations(self, raw_confirmations: List[Dict[str, Any]], confirmation_executor) -> List[Dict[str, Any]]:
+        detailed_confirmations = []
+        for i, conf_data in enumerate(raw_confirmations, 1):
+            try:
+                detailed_conf = self._build_confirmation(conf_data, confirmation_executor)
+                detailed_confirmations.append(detailed_conf)
+                
+                logger.info(f"[{i}/{len(raw_confirmations)}] {detailed_conf['type']}: {detailed_conf['description']}")
+                
+            except Exception as e:
+                logger.error(f"❌ Ошибка обработки подтверждения {i}: {e}")
+                continue
+        
+        return detailed_confirmations
+    
+    def get_guard_confirmations(self) -> List[Dict[str, Any]]:
+        try:
+            logger.info("🔐 Получаем все подтверждения Guard...")
             
-            all_confirmations = confirmations_json.get('conf', [])
+            all_confirmations, confirmation_executor = self._fetch_raw_confirmations()
             
             if not all_confirmations:
                 logger.info("ℹ️ Подтверждений Guard не найдено")
@@ -330,42 +536,52 @@ class TradeConfirmationManager:
             
             logger.info(f"✅ Найдено {len(all_confirmations)} подтверждений Guard")
             
-            detailed_confirmations = []
-            for i, conf_data in enumerate(all_confirmations, 1):
-                try:
-                    confirmation_type = self._determine_confirmation_type_from_json(conf_data)
-                    
-                    conf = Confirmation(
-                        data_confid=conf_data['id'],
-                        nonce=conf_data['nonce'],
-                        creator_id=int(conf_data['creator_id'])
-                    )
-                    
-                    detailed_conf = {
-                        'id': conf_data['id'],
-                        'nonce': conf_data['nonce'],
-                        'creator_id': int(conf_data['creator_id']),
-                        'type': confirmation_type,
-                        'description': conf_data.get('headline', f'Подтверждение
-                        'confirmation': conf,
-                        'executor': confirmation_executor
-                    }
-                    
-                    detailed_confirmations.append(detailed_conf)
-                    
-                    logger.info(f"[{i}/{len(all_confirmations)}] {confirmation_type}: {detailed_conf['description']}")
-                    
-                except Exception as e:
-                    logger.error(f"❌ Ошибка обработки подтверждения {i}: {e}")
-                    continue
-            
-            return detailed_confirmations
+            return self._build_confirmations(all_confirmations, confirmation_executor)
             
         except Exception as e:
             logger.error(f"❌ Ошибка получения подтверждений Guard: {e}")
             logger.debug(traceback.format_exc())
             return []
     
+    def _get_tracker(self, consumer: str) -> ConfirmationTracker:
+        with self._trackers_lock:
+            tracker = self._trackers.get(consumer)
+            if tracker is None:
+                tracker = ConfirmationTracker()
+                self._trackers[consumer] = tracker
+            return tracker
+    
+    def poll_confirmation_changes(self, consumer: str = 'default') -> Dict[str, Any]:
+        all_confirmations, confirmation_executor = self._fetch_raw_confirmations()
+        
+        return self.apply_confirmation_list(all_confirmations, consumer, confirmation_executor)
+    
+    def apply_confirmation_list(self, all_confirmations: List[Dict[str, Any]], consumer: str = 'default',
+                                confirmation_executor=None) -> Dict[str, Any]:
+        if confirmation_executor is None:
+            self._remember_confirmations(all_confirmations)
+            if all_confirmations:
+                confirmation_executor = self._create_confirmation_executor()
+        
+        added_raw, removed = self._get_tracker(consumer).update(all_confirmations)
+        
+        if added_raw:
+            logger.info(f"🆕 [{self.username}] Новых подтверждений Guard: {len(added_raw)}")
+        if removed:
+            logger.info(f"🗑️ [{self.username}] Исчезло подтверждений Guard: {len(removed)}")
+        
+        return {
+            'added': self._build_confirmations(added_raw, confirmation_executor),
+            'removed': removed,
+            'pending_count': len(all_confirmations)
+        }
+    
+    def mark_confirmation_processed(self, confirmation_id: Union[str, int], consumer: str = 'default'):
+        self._get_tracker(consumer).mark_processed(confirmation_id)
+    
+    def release_confirmation(self, confirmation_id: Union[str, int], consumer: str = 'default'):
+        self._get_tracker(consumer).release(confirmation_id)
+    
     def _determine_confirmation_type_from_json(self, conf_data: Dict[str, Any]) -> str:
         try:
             conf_type = conf_data.get('type', 'unknown')
@@ -399,34 +615,90 @@ class TradeConfirmationManager:
             
             logger.info(f"🔑 Подтверждаем подтверждение Guard: {confirmation_obj.data_confid}")
             
-            import sys
-            import os
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            steampy_path = os.path.join(current_dir, 'steampy')
-            from pysda.steampy.confirmation import ConfirmationExecutor
-            
-            confirmation_executor = ConfirmationExecutor(
-                identity_secret=steam_client.steam_guard['identity_secret'],
-                my_steam_id=steam_client.steam_id,
-                session=steam_client._session
-            )
+            confirmation_executor = self._create_confirmation_executor(steam_client)
             
             response = confirmation_executor._send_confirmation(confirmation_obj)
             
             if response and response.get('success'):
+                self.forget_confirmation(confirmation_obj)
                 logger.info(f"✅ Подтверждение {confirmation_obj.data_confid} успешно обработано")
                 return True
             else:
                 error_message = response.get('error', 'Unknown error') if response else 'No response'
                 logger.error(f"❌ Ошибка подтверждения {confirmation_obj.data_confid}: {error_message}")
                 return False
-                
+        
         except Exception as e:
             logger.error(f"❌ Ошибка подтверждения Guard: {e}")
             logger.debug(traceback.format_exc())
             return False
     
-    def process_free_trades(self, auto_accept: bool = True, auto_confirm: bool = True) -> Dict[str, int]:
+    def confirm_guard_confirmations(self, confirmation_objs: List[Any]) -> bool:
+        if not confirmation_objs:
+            return True
+        
+        if len(confirmation_objs) == 1:
+            return self.confirm_guard_confirmation(confirmation_objs[0])
+        
+        try:
+            steam_client = self._get_steam_client()
+            
+            logger.info(f"🔑 Пакетно подтверждаем {len(confirmation_objs)} подтверждений Guard")
+            
+            confirmation_executor = self._create_confirmation_executor(steam_client)
+            
+            response = confirmation_executor._send_multi_confirmation(confirmation_objs)
+            
+            if response and response.get('success'):
+                for confirmation_obj in confirmation_objs:
+                    self.forget_confirmation(confirmation_obj)
+                logger.info(f"✅ Пакетно подтверждено {len(confirmation_objs)} подтверждений")
+                return True
+            else:
+                error_message = response.get('error', 'Unknown error') if response else 'No response'
+                logger.error(f"❌ Ошибка пакетного подтверждения: {error_message}")
+                return False
+        
+        except Exception as e:
+            logger.error(f"❌ Ошибка пакетного подтверждения Guard: {e}")
+            logger.debug(traceback.format_exc())
+            return False
+    
+    def confirm_guard_confirmations_by_id(self, confirmation_ids: List[Union[str, int]]) -> Dict[str, List[str]]:
+        wanted = [str(conf_id) for conf_id in confirmation_ids]
+        
+        if any(conf_id not in self._known_confirmations for conf_id in wanted):
+            try:
+                self._fetch_raw_confirmations()
+            except ConfirmationFetchError as e:
+                logger.error(f"❌ {e}")
+        
+        found = [conf_id for conf_id in wanted if conf_id in self._known_confirmations]
+        missing = [conf_id for conf_id in wanted if conf_id not in self._known_confirmations]
+        
+        if not found:
+            return {'confirmed': [], 'failed': [], 'missing': missing}
+        
+        confirmation_objs = [self._known_confirmations[conf_id] for conf_id in found]
+        
+        if self.confirm_guard_confirmations(confirmation_objs):
+            return {'confirmed': found, 'failed': [], 'missing': missing}
+        
+        if len(confirmation_objs) == 1:
+            return {'confirmed': [], 'failed': found, 'missing': missing}
+        
+        logger.warning("⚠️ Пакетное подтверждение не удалось, подтверждаем по одному")
+        confirmed, failed = [], []
+        for conf_id, confirmation_obj in zip(found, confirmation_objs):
+            if self.confirm_guard_confirmation(confirmation_obj):
+                confirmed.append(conf_id)
+            else:
+                failed.append(conf_id)
+        
+        return {'confirmed': confirmed, 'failed': failed, 'missing': missing}
+    
+    def process_free_trades(self, auto_accept: bool = True, auto_confirm: bool = True,
+                            active_offers: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
         
             
         stats = {
@@ -441,8 +713,9 @@ class TradeConfirmationManager:
             
             steam_client = self._get_steam_client()
             
-            logger.info("🔍 Получаем активные трейд офферы...")
-            active_offers = steam_client.get_trade_offers(merge=False)
+            if active_offers is None:
+                logger.info("🔍 Получаем активные трейд офферы...")
+                active_offers = steam_client.get_trade_offers(merge=False, get_descriptions=False).get('response', {})
             
             if not active_offers:
                 logger.info("ℹ️ Активные трейд офферы не получены")
@@ -513,12 +786,13 @@ class TradeConfirmationManager:
             stats['errors'] += 1
             return stats
 
-    def process_confirmation_needed_trades(self, auto_confirm: bool = True) -> Dict[str, int]:
+    def process_confirmation_needed_trades(self, auto_confirm: bool = True) -> Dict[str, Any]:
         
             
         stats = {
             'found_confirmation_needed': 0,
             'confirmed_trades': 0,
+            'confirmed_offer_ids': [],
             'errors': 0
         }
         
@@ -528,7 +802,7 @@ class TradeConfirmationManager:
             steam_client = self._get_steam_client()
             
             logger.info("🔍 Получаем все трейд офферы...")
-            all_offers = steam_client.get_trade_offers(merge=False)
+            all_offers = steam_client.get_trade_offers(merge=False, get_descriptions=False).get('response', {})
             
             if not all_offers:
                 logger.info("ℹ️ Трейд офферы не получены")
@@ -564,6 +838,7 @@ class TradeConfirmationManager:
                         
                         if result and not result.get('strError'):
                             stats['confirmed_trades'] += 1
+                            stats['confirmed_offer_ids'].append(str(trade_id))
                             logger.info(f"✅ Подтвержден трейд: {trade_id}")
                         else:
                             error_msg = result.get('strError', 'Неизвестная ошибка') if result else 'Пустой ответ'
@@ -596,19 +871,31 @@ class IntegratedTradeManager:
     
     def __init__(self):
         self.managers = {}
+        self._manager_locks: Dict[str, threading.Lock] = {}
+        self._managers_lock = threading.Lock()
     
     def _get_manager(self, username: str) -> TradeConfirmationManager:
-        if username not in self.managers:
-            mafile_path = os.path.join(get_application_path(), "data", "mafiles", f"{username}.maFile")
-            if not os.path.exists(mafile_path):
-                raise Exception(f"Файл {mafile_path} не найден")
-            
-            self.managers[username] = TradeConfirmationManager(
-                username=username,
-                mafile_path=mafile_path
-            )
+        manager = self.managers.get(username)
+        if manager is not None:
+            return manager
+        
+        # Вход в аккаунт идет в конструкторе менеджера, поэтому блокируем только этот username
+        with self._managers_lock:
+            lock = self._manager_locks.setdefault(username, threading.Lock())
         
-        return self.managers[username]
+        with lock:
+            if username not in self.managers:
+                mafile_entry = settings_manager.find_mafile(username)
+                if not mafile_entry:
+                    raise Exception(f"Файл {username}.maFile не найден")
+                mafile_path = mafile_entry.path
+                
+                self.managers[username] = TradeConfirmationManager(
+                    username=username,
+                    mafile_path=mafile_path
+                )
+            
+            return self.managers[username]
     
     def get_confirmations(self, username: str) -> Dict[str, Any]:
         try:
@@ -626,6 +913,29 @@ class IntegratedTradeManager:
                 "error": f"Ошибка получения подтверждений: {str(e)}"
             }
     
+    def get_confirmation_changes(self, username: str, consumer: str = 'default') -> Dict[str, Any]:
+        try:
+            manager = self._get_manager(username)
+            changes = manager.poll_confirmation_changes(consumer)
+            
+            return {
+                "success": True,
+                "added": changes['added'],
+                "removed": changes['removed'],
+                "pending_count": changes['pending_count']
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Ошибка получения изменений подтверждений: {str(e)}"
+            }
+    
+    def mark_confirmation_processed(self, username: str, confirmation_id: Union[str, int], consumer: str = 'default'):
+        self._get_manager(username).mark_confirmation_processed(confirmation_id, consumer)
+    
+    def release_confirmation(self, username: str, confirmation_id: Union[str, int], consumer: str = 'default'):
+        self._get_manager(username).release_confirmation(confirmation_id, consumer)
+    
     def confirm_all(self, username: str) -> Dict[str, Any]:
         try:
             manager = self._get_manager(username)
@@ -638,14 +948,8 @@ class IntegratedTradeManager:
                     "message": f"Нет подтверждений для {username}"
                 }
             
-            confirmed_count = 0
-            for conf in confirmations:
-                try:
-                    if manager.confirm_guard_confirmation(conf['confirmation']):
-                        confirmed_count += 1
-                except Exception as e:
-                    logger.error(f"Ошибка подтверждения {conf['id']}: {e}")
-                    continue
+            result = manager.confirm_guard_confirmations_by_id([conf['id'] for conf in confirmations])
+            confirmed_count = len(result['confirmed'])
             
             return {
                 "success": True,
@@ -659,10 +963,188 @@ class IntegratedTradeManager:
                 "error": f"Ошибка подтверждения: {str(e)}"
             }
     
-    def auto_accept_gifts(self, username: str) -> Dict[str, Any]:
+    def confirm_trade_offer(self, username: str, trade_offer_id: Union[str, int]) -> Dict[str, Any]:
+        try:
+            manager = self._get_manager(username)
+            success = manager.confirm_trade_offer(trade_offer_id)
+            
+            return {
+                "success": success,
+                "message": f"Трейд {trade_offer_id} подтвержден" if success else f"Не удалось подтвердить трейд {trade_offer_id}"
+            }
+        
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Ошибка подтверждения: {str(e)}"
+            }
+    
+    def confirm_confirmations(self, username: str, confirmation_ids: List[Union[str, int]]) -> Dict[str, Any]:
+        try:
+            manager = self._get_manager(username)
+            result = manager.confirm_guard_confirmations_by_id(confirmation_ids)
+            
+            response = {
+                "success": not result['failed'] and not result['missing'],
+                "confirmed": result['confirmed'],
+                "failed": result['failed'],
+                "missing": result['missing'],
+                "confirmed_count": len(result['confirmed']),
+                "message": f"Подтверждено {len(result['confirmed'])} из {len(confirmation_ids)} для {username}"
+            }
+            
+            if not response["success"]:
+                problems = []
+                if result['failed']:
+                    problems.append(f"не подтверждены: {', '.join(map(str, result['failed']))}")
+                if result['missing']:
+                    problems.append(f"не найдены: {', '.join(map(str, result['missing']))}")
+                response["error"] = f"Ошибка подтверждения ({'; '.join(problems)})"
+            
+            return response
+        
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Ошибка подтверждения: {str(e)}"
+            }
+    
+    def _collect_polling_accounts(self, usernames: List[str]) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        accounts = {}
+        errors = {}
+        for username in usernames:
+            try:
+                accounts[username] = self._get_manager(username).get_polling_account()
+            except Exception as e:
+                errors[username] = {"success": False, "error": f"Ошибка подготовки аккаунта: {str(e)}"}
+        return accounts, errors
+    
+    def get_confirmation_changes_many(self, usernames: List[str], consumer: str = 'default') -> Dict[str, Dict[str, Any]]:
+        from pysda.async_poller import get_polling_engine
+        
+        accounts, results = self._collect_polling_accounts(usernames)
+        fetched = get_polling_engine().fetch_confirmations_many(list(accounts.values()))
+        
+        for username, conf_list in fetched.items():
+            if isinstance(conf_list, Exception):
+                results[username] = {
+                    "success": False,
+                    "error": f"Ошибка получения изменений подтверждений: {str(conf_list)}"
+                }
+                continue
+            
+            try:
+                changes = self._get_manager(username).apply_confirmation_list(conf_list, consumer)
+                results[username] = {
+                    "success": True,
+                    "added": changes['added'],
+                    "removed": changes['removed'],
+                    "pending_count": changes['pending_count']
+                }
+            except Exception as e:
+                results[username] = {
+                    "success": False,
+                    "error": f"Ошибка получения изменений подтверждений: {str(e)}"
+                }
+        
+        return results
+    
+    def confirm_all_many(self, usernames: List[str],
+                         on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Dict[str, Any]]:
+        from pysda.async_poller import get_polling_engine
+        
+        engine = get_polling_engine()
+        accounts, results = self._collect_polling_accounts(usernames)
+        
+        def publish(username: str, result: Dict[str, Any]):
+            results[username] = result
+            if on_result:
+                on_result(username, result)
+        
+        for username, error in list(results.items()):
+            publish(username, error)
+        
+        fetched = engine.fetch_confirmations_many(list(accounts.values()))
+        
+        batches = {}
+        for username, conf_list in fetched.items():
+            if isinstance(conf_list, Exception):
+                publish(username, {"success": False, "error": f"Ошибка подтверждения: {str(conf_list)}"})
+                continue
+            
+            manager = self._get_manager(username)
+            manager._remember_confirmations(conf_list)
+            confirmations = [manager.get_known_confirmation(conf_data['id']) for conf_data in conf_list]
+            confirmations = [conf for conf in confirmations if conf is not None]
+            
+            if not confirmations:
+                publish(username, {
+                    "success": True,
+                    "confirmed_count": 0,
+                    "message": f"Нет подтверждений для {username}"
+                })
+                continue
+            
+            batches[username] = (accounts[username], confirmations)
+        
+        sent = engine.send_confirmations_many(batches)
+        
+        for username, response in sent.items():
+            confirmations = batches[username][1]
+            if isinstance(response, Exception) or not response.get('success'):
+                logger.warning(f"⚠️ [{username}] Асинхронное пакетное подтверждение не удалось, повторяем синхронно")
+                publish(username, self.confirm_all(username))
+                continue
+            
+            manager = self._get_manager(username)
+            for confirmation in confirmations:
+                manager.forget_confirmation(confirmation)
+            
+            publish(username, {
+                "success": True,
+                "confirmed_count": len(confirmations),
+                "message": f"Подтверждено {len(confirmations)} из {len(confirmations)} для {username}"
+            })
+        
+        return results
+    
+    def get_wallet_balance(self, username: str) -> Dict[str, Any]:
+        try:
+            manager = self._get_manager(username)
+            return {"success": True, **manager.get_wallet_balance()}
+        
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Ошибка получения баланса: {str(e)}"
+            }
+    
+    def is_logged_in(self, username: str) -> bool:
+        manager = self.managers.get(username)
+        return manager is not None and manager.is_logged_in
+    
+    def get_trade_offers_many(self, usernames: List[str], timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        from pysda.async_poller import get_polling_engine
+        from pysda.steampy.client import SteamClient
+        
+        accounts, results = self._collect_polling_accounts(usernames)
+        fetched = get_polling_engine().fetch_trade_offers_many(list(accounts.values()), timeout)
+        
+        for username, response in fetched.items():
+            if isinstance(response, Exception):
+                results[username] = {"success": False, "error": f"Ошибка получения трейдов: {str(response)}"}
+            elif 'response' not in response:
+                results[username] = {"success": False, "error": "Ошибка получения трейдов: пустой ответ"}
+            else:
+                offers = SteamClient._filter_non_active_offers(response)['response']
+                results[username] = {"success": True, "offers": offers}
+        
+        return results
+    
+    def auto_accept_gifts(self, username: str, active_offers: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         try:
             manager = self._get_manager(username)
-            stats = manager.process_free_trades(auto_accept=True, auto_confirm=True)
+            stats = manager.process_free_trades(auto_accept=True, auto_confirm=True, active_offers=active_offers)
             
             return {
                 "success": True,
@@ -684,6 +1166,8 @@ class IntegratedTradeManager:
             return {
                 "success": True,
                 "stats": stats,
+                "confirmed_count": stats['confirmed_trades'],
+                "confirmed_offer_ids": stats['confirmed_offer_ids'],
                 "message": f"Обработано {stats['found_confirmation_needed']} трейдов для {username}"
             }
             
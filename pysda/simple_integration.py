@@ -1,7 +1,7 @@
 import asyncio
 import os
 import json
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 from core.settings_manager import settings_manager
 
 
@@ -76,18 +76,7 @@ class SimpleTradeManager:
             if not result["success"]:
                 return result
             
-            formatted_confirmations = []
-            for conf in result["confirmations"]:
-                formatted_confirmations.append({
-                    'confirmation_id': conf['id'],
-                    'id': conf['id'],
-                    'type': conf['type'],
-                    'description': conf['description'],
-                    'creator_id': conf['creator_id'],
-                    'nonce': conf['nonce'],
-                    'confirmation_obj': conf['confirmation'],
-                    'executor': conf.get('executor')
-                })
+            formatted_confirmations = [self._format_confirmation(conf) for conf in result["confirmations"]]
             
             return {
                 "success": True,
@@ -101,6 +90,83 @@ class SimpleTradeManager:
                 "error": f"Ошибка получения подтверждений через pySDA: {str(e)}"
             }
     
+    def get_confirmation_changes(self, account_name: str, consumer: str = 'default') -> Dict[str, Any]:
+        
+            
+        try:
+            manager = self._get_integrated_manager()
+            result = manager.get_confirmation_changes(account_name, consumer)
+            
+            if not result["success"]:
+                return result
+            
+            return {
+                "success": True,
+                "added": [self._format_confirmation(conf) for conf in result["added"]],
+                "removed": result["removed"],
+                "pending_count": result["pending_count"]
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Ошибка получения изменений подтверждений через pySDA: {str(e)}"
+            }
+    
+    def get_confirmation_changes_many(self, account_names: List[str], consumer: str = 'default') -> Dict[str, Dict[str, Any]]:
+        
+            
+        try:
+            results = self._get_integrated_manager().get_confirmation_changes_many(account_names, consumer)
+        except Exception as e:
+            error = {"success": False, "error": f"Ошибка получения изменений подтверждений через pySDA: {str(e)}"}
+            return {account_name: error for account_name in account_names}
+        
+        for account_name, result in results.items():
+            if result["success"]:
+                result["added"] = [self._format_confirmation(conf) for conf in result["added"]]
+        
+        return results
+    
+    def is_account_logged_in(self, account_name: str) -> bool:
+        return self._get_integrated_manager().is_logged_in(account_name)
+    
+    def get_trade_offers_many(self, account_names: List[str], timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        
+            
+        try:
+            return self._get_integrated_manager().get_trade_offers_many(account_names, timeout)
+        except Exception as e:
+            error = {"success": False, "error": f"Ошибка получения трейдов через pySDA: {str(e)}"}
+            return {account_name: error for account_name in account_names}
+    
+    def get_wallet_balance(self, account_name: str) -> Dict[str, Any]:
+        
+            
+        try:
+            return self._get_integrated_manager().get_wallet_balance(account_name)
+        except Exception as e:
+            return {"success": False, "error": f"Ошибка получения баланса через pySDA: {str(e)}"}
+    
+    def mark_confirmation_processed(self, account_name: str, confirmation_id: str, consumer: str = 'default'):
+        self._get_integrated_manager().mark_confirmation_processed(account_name, confirmation_id, consumer)
+    
+    def release_confirmation(self, account_name: str, confirmation_id: str, consumer: str = 'default'):
+        self._get_integrated_manager().release_confirmation(account_name, confirmation_id, consumer)
+    
+    @staticmethod
+    def _format_confirmation(conf: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'confirmation_id': conf['id'],
+            'id': conf['id'],
+            'type': conf['type'],
+            'description': conf['description'],
+            'creator_id': conf['creator_id'],
+            'nonce': conf['nonce'],
+            'confirmation_obj': conf['confirmation'],
+            'executor': conf.get('executor')
+        }
+    
     def confirm_trade(self, account_name: str, confirmation_obj) -> Dict[str, Any]:
         
             
@@ -122,36 +188,44 @@ class SimpleTradeManager:
                 "error": f"Ошибка подтверждения через pySDA: {str(e)}"
             }
 
+    def confirm_trade_offer(self, account_name: str, trade_offer_id: str) -> Dict[str, Any]:
+        
+            
+        try:
+            return self._get_integrated_manager().confirm_trade_offer(account_name, trade_offer_id)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Ошибка подтверждения трейда через pySDA: {str(e)}"
+            }
+
     def accept_confirmation(self, account_name: str, confirmation_id: str) -> Dict[str, Any]:
         
             
+        result = self.accept_confirmations(account_name, [confirmation_id])
+        
+        if result["success"] or "error" in result:
+            return result
+        
+        return {
+            "success": False,
+            "error": f"Подтверждение с ID {confirmation_id} не найдено" if result["missing"] else "Не удалось подтвердить"
+        }
+
+    def accept_confirmations(self, account_name: str, confirmation_ids: List[str]) -> Dict[str, Any]:
+        
+            
         try:
             self._ensure_trade_protection_for_account(account_name)
             
             manager = self._get_integrated_manager()
             
-            confirmations_result = manager.get_confirmations(account_name)
-            if not confirmations_result["success"]:
-                return confirmations_result
-            
-            confirmation_obj = None
-            for conf in confirmations_result["confirmations"]:
-                if str(conf['id']) == str(confirmation_id):
-                    confirmation_obj = conf['confirmation']
-                    break
-            
-            if confirmation_obj is None:
-                return {
-                    "success": False,
-                    "error": f"Подтверждение с ID {confirmation_id} не найдено"
-                }
-            
-            return self.confirm_trade(account_name, confirmation_obj)
+            return manager.confirm_confirmations(account_name, confirmation_ids)
             
         except Exception as e:
             return {
                 "success": False,
-                "error": f"Ошибка принятия подтверждения: {str(e)}"
+                "error": f"Ошибка принятия подтверждений: {str(e)}"
             }
 
     def confirm_all_trades(self, account_name: str) -> Dict[str, Any]:
@@ -169,12 +243,12 @@ class SimpleTradeManager:
                 "error": f"Ошибка подтверждения трейдов через pySDA: {str(e)}"
             }
     
-    def auto_accept_gifts(self, account_name: str) -> Dict[str, Any]:
+    def auto_accept_gifts(self, account_name: str, active_offers: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         
             
         try:
             manager = self._get_integrated_manager()
-            result = manager.auto_accept_gifts(account_name)
+            result = manager.auto_accept_gifts(account_name, active_offers)
             
             return result
             
@@ -199,13 +273,18 @@ class SimpleTradeManager:
                 "error": f"Ошибка автоподтверждения через pySDA: {str(e)}"
             }
     
-    def bulk_confirm_trades(self, account_names: List[str]) -> Dict[str, Dict[str, Any]]:
+    def bulk_confirm_trades(self, account_names: List[str],
+                            on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Dict[str, Any]]:
         
             
-        results = {}
-        for account_name in account_names:
-            results[account_name] = self.confirm_all_trades(account_name)
-        return results
+        try:
+            return self._get_integrated_manager().confirm_all_many(account_names, on_result)
+        except Exception as e:
+            error = {"success": False, "error": f"Ошибка подтверждения трейдов через pySDA: {str(e)}"}
+            if on_result:
+                for account_name in account_names:
+                    on_result(account_name, error)
+            return {account_name: error for account_name in account_names}
     
     def _ensure_trade_protection_for_account(self, account_name: str):
         try:
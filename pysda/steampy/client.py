@@ -3,17 +3,18 @@ from __future__ import annotations
 import os
 import json
 import re
-import bs4
 import urllib.parse as urlparse
 import decimal
 import requests
 from typing import Union
-import pickle
 from contextlib import contextmanager
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from core.settings_manager import get_application_path
+from core.http_transport import create_session
+from core.html_parsing import make_soup, search
+from core.inventory_engine import InventoryError, description_key, iter_inventory_pages
 
 from . import guard
 from .confirmation import ConfirmationExecutor
@@ -22,13 +23,16 @@ from .login import InvalidCredentials, LoginExecutor
 from .market import SteamMarket
 from .models import Asset, GameOptions, SteamUrl, TradeOfferState
 from .models import STEAM_URL, EResult
+from .refresh_scheduler import get_refresh_scheduler
+from .session_store import cookies_from_list, get_session_store
 from pysda.utils.delayed_http_adapter import DelayedHTTPAdapter
+from pysda.utils import session_probe
 
 
 from .utils import (
     account_id_to_steam_id,
-    get_description_key,
     get_key_value_from_url,
+    intern_descriptions,
     login_required,
     merge_items_with_descriptions_from_inventory,
     merge_items_with_descriptions_from_offer,
@@ -86,11 +90,15 @@ class SteamClient:
         self.refresh_token = None
         self.storage = storage
 
-        if session_path and os.path.exists(session_path):
-            with open(session_path, 'rb') as f:
-                self._session, self.refresh_token = pickle.load(f)
-        else:
-            self._session = requests.Session()
+        self._session = create_session()
+        if session_path:
+            stored = get_session_store(os.path.dirname(session_path)).load(
+                os.path.splitext(os.path.basename(session_path))[0]
+            )
+            if stored:
+                cookies_from_list(self._session.cookies, stored['cookies'])
+                self.refresh_token = stored['refresh_token']
+                self.steam_id = self.steam_id or stored['steam_id']
 
         if proxies:
             self.set_proxies(proxies)
@@ -175,7 +183,7 @@ class SteamClient:
             compare_sessions_and_log_diff(old_session, new_session)
 
             self.save_session(os.path.dirname(self.session_path), self.username)
-            logger.info(f"💾 Сессия сохранена в pkl и в хранилище для {self.username}")
+            logger.info(f"💾 Сессия сохранена в хранилище для {self.username}")
             
             logger.info(f"📋 Новые cookies: {self._session.__dict__}")
             
@@ -210,6 +218,8 @@ class SteamClient:
             print(f"✅ Сессия активна для {self.username}")
             self.was_login_executed = True
             self.market._set_login_executed(self.steam_guard, self._get_session_id())
+        
+        get_refresh_scheduler().register(self)
 
     def update_session(self):
         with self.temporary_delay(1):
@@ -227,19 +237,17 @@ class SteamClient:
             self.was_login_executed = True
             self.market._set_login_executed(self.steam_guard, self._get_session_id())
             self.save_session(os.path.dirname(self.session_path), self.username)
-            logger.info(f"💾 Сессия сохранена в pkl и в хранилище для {self.username}")
+            logger.info(f"💾 Сессия сохранена в хранилище для {self.username}")
 
 
     @staticmethod
     def check_session_static(username, _session) -> bool:
-        main_page_response = _session.get(SteamUrl.COMMUNITY_URL)
-        return username.lower() in main_page_response.text.lower()
+        return session_probe.is_session_alive(_session, username)
 
     @login_required
     def save_session(self, path, username):
-        with open(os.path.join(path, f'{username}.pkl'), 'wb') as f:
-            pickle.dump((self._session, self.refresh_token), f)
-        print(f"💾 Сессия и refresh токен сохранены в pkl для {username}")
+        get_session_store(path).save(username, self._session, self.refresh_token, self.steam_id)
+        print(f"💾 Сессия и refresh токен сохранены для {username}")
         
         if hasattr(self, 'storage') and self.storage:
             try:
@@ -257,6 +265,8 @@ class SteamClient:
     def logout(self) -> None:
         url = f'{SteamUrl.STORE_URL}/login/logout/'
         data = {'sessionid': self._get_session_id()}
+        session_probe.forget_session(self._session)
+        get_refresh_scheduler().unregister(self)
         self._session.post(url, data=data)
 
         if self.is_session_alive():
@@ -273,12 +283,7 @@ class SteamClient:
 
     @login_required
     def is_session_alive(self) -> bool:
-        steam_login = self.username
-        headers = {
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.9',
-        }
-        main_page_response = self._session.get(SteamUrl.COMMUNITY_URL, headers=headers)
-        return steam_login.lower() in main_page_response.text.lower()
+        return session_probe.is_session_alive(self._session, self.username, verify=True, ttl=0)
 
     def api_call(
         self, method: str, interface: str, api_method: str, version: str, params: dict | None = None,
@@ -314,17 +319,22 @@ class SteamClient:
     def get_partner_inventory(
         self, partner_steam_id: str, game: GameOptions, merge: bool = True, count: int = 5000,
     ) -> dict:
-        url = f'{SteamUrl.COMMUNITY_URL}/inventory/{partner_steam_id}/{game.app_id}/{game.context_id}'
-        params = {'l': 'english', 'count': count}
-
-        full_response = self._session.get(url, params=params)
-        response_dict = full_response.json()
-        if full_response.status_code == 429:
-            raise TooManyRequests('Too many requests, try again later.')
+        assets = []
+        descriptions = {}
+        response_dict = {'success': 1, 'assets': assets, 'descriptions': [], 'total_inventory_count': 0}
 
-        if response_dict is None or response_dict.get('success') != 1:
+        try:
+            for page in iter_inventory_pages(self._session, partner_steam_id, game.app_id, game.context_id, count=count):
+                assets.extend(page.get('assets') or [])
+                for description in page.get('descriptions') or []:
+                    descriptions.setdefault(description_key(description), description)
+                response_dict['total_inventory_count'] = page.get('total_inventory_count', len(assets))
+        except InventoryError as e:
+            if e.status_code == 429:
+                raise TooManyRequests('Too many requests, try again later.')
             raise ApiException('Success value should be 1.')
 
+        response_dict['descriptions'] = list(descriptions.values())
         return merge_items_with_descriptions_from_inventory(response_dict, game) if merge else response_dict
 
     def _get_session_id(self) -> str:
@@ -334,12 +344,12 @@ class SteamClient:
         params = {'key': self._api_key}
         return self.api_call('GET', 'IEconService', 'GetTradeOffersSummary', 'v1', params).json()
 
-    def get_trade_offers(self, merge: bool = True) -> dict:
+    def get_trade_offers(self, merge: bool = True, get_descriptions: bool = True) -> dict:
         params = {
             'key': self._api_key,
             'get_sent_offers': 1,
             'get_received_offers': 1,
-            'get_descriptions': 1,
+            'get_descriptions': int(get_descriptions),
             'language': 'english',
             'active_only': 1,
             'historical_only': 0,
@@ -369,7 +379,7 @@ class SteamClient:
         response = self.api_call('GET', 'IEconService', 'GetTradeOffer', 'v1', params).json()
 
         if merge and 'descriptions' in response['response']:
-            descriptions = {get_description_key(offer): offer for offer in response['response']['descriptions']}
+            descriptions = intern_descriptions(response['response']['descriptions'])
             offer = response['response']['offer']
             response['response']['offer'] = merge_items_with_descriptions_from_offer(offer, descriptions)
 
@@ -646,8 +656,9 @@ class SteamClient:
     def get_wallet_balance(self, convert_to_decimal: bool = True) -> Union[str, decimal.Decimal]:
         url = SteamUrl.STORE_URL + '/account/history/'
         response = self._session.get(url)
-        response_soup = bs4.BeautifulSoup(response.text, "html.parser")
-        balance = response_soup.find(id='header_wallet_balance').string
+        balance = search(r'id="header_wallet_balance"[^>]*>([^<]+)<', response.text)
+        if balance is None:
+            balance = make_soup(response.text).find(id='header_wallet_balance').string
         if convert_to_decimal:
             return parse_price(balance)
         else:
@@ -12,7 +12,7 @@ except ImportError:
         class IntEnum:
             pass
 
-from bs4 import BeautifulSoup
+from core.html_parsing import make_soup, search
 
 from . import guard
 from .exceptions import ConfirmationExpected
@@ -54,6 +54,7 @@ class ConfirmationExecutor:
         self._my_steam_id = my_steam_id
         self._identity_secret = identity_secret
         self._session = session
+        self._details_ids: dict[str, str] = {}
 
     def send_trade_allow_request(self, trade_offer_id: str) -> dict:
         confirmations = self._get_confirmations()
@@ -90,6 +91,29 @@ class ConfirmationExecutor:
         
         return response
 
+    def _send_multi_confirmation(self, confirmations: list[Confirmation], tag: Tag = Tag.ALLOW) -> dict:
+        if not confirmations:
+            return {'success': True}
+        
+        params = self._create_confirmation_params(tag.value)
+        data = list(params.items())
+        data.append(('op', tag.value))
+        data.extend(('cid[]', confirmation.data_confid) for confirmation in confirmations)
+        data.extend(('ck[]', confirmation.nonce) for confirmation in confirmations)
+        headers = {'X-Requested-With': 'XMLHttpRequest'}
+        
+        logger.info(f"🔧 Пакетное подтверждение: {len(confirmations)} шт. через {self.CONF_URL}/multiajaxop (op: {tag.value})")
+        
+        response = self._session.post(f'{self.CONF_URL}/multiajaxop', data=data, headers=headers).json()
+        logger.info(f"🔑 Отправлен пакетный запрос на подтверждение, response:\n {response}")
+        
+        if not response.get('success', False):
+            logger.error(f"⚠️ Пакетное подтверждение неуспешно. Ключи в ответе: {list(response.keys())}")
+            for key, value in response.items():
+                logger.error(f"  {key}: {value}")
+        
+        return response
+
     def _get_confirmations(self) -> list[Confirmation]:
         confirmations = []
         confirmations_page = self._fetch_confirmations_page()
@@ -104,12 +128,16 @@ class ConfirmationExecutor:
         else:
             raise ConfirmationExpected
         
+    @staticmethod
+    def index_by_creator(confirmations: list[Confirmation]) -> dict[int, Confirmation]:
+        return {confirmation.creator_id: confirmation for confirmation in confirmations}
+
     def get_confirmation(self, key: str | int, *, update_listings=True) -> Confirmation:
 
         key = int(key)
 
         confs: list[Confirmation] = self._get_confirmations()
-        conf = next(filter(lambda c: c.creator_id == key, confs), None)
+        conf = self.index_by_creator(confs).get(key)
         if conf is None:
             raise KeyError(f"Unable to find confirmation for {key} ident/trade/listing id")
 
@@ -151,32 +179,43 @@ class ConfirmationExecutor:
         }
 
     def _select_trade_offer_confirmation(self, confirmations: list[Confirmation], trade_offer_id: str) -> Confirmation:
-        for confirmation in confirmations:
-            confirmation_details_page = self._fetch_confirmation_details_page(confirmation)
-            confirmation_id = self._get_confirmation_trade_offer_id(confirmation_details_page)
-            if confirmation_id == trade_offer_id:
-                return confirmation
-        raise ConfirmationExpected
+        confirmation = self.index_by_creator(confirmations).get(int(trade_offer_id))
+        if confirmation is not None:
+            return confirmation
+        return self._select_by_details(confirmations, str(trade_offer_id), self._get_confirmation_trade_offer_id)
 
     def _select_sell_listing_confirmation(self, confirmations: list[Confirmation], asset_id: str) -> Confirmation:
+        return self._select_by_details(confirmations, str(asset_id), self._get_confirmation_sell_listing_id)
+
+    def _select_by_details(self, confirmations: list[Confirmation], target_id: str, parse_id) -> Confirmation:
         for confirmation in confirmations:
-            confirmation_details_page = self._fetch_confirmation_details_page(confirmation)
-            confirmation_id = self._get_confirmation_sell_listing_id(confirmation_details_page)
-            if confirmation_id == asset_id:
+            cache_key = f'{parse_id.__name__}:{confirmation.data_confid}'
+            confirmation_id = self._details_ids.get(cache_key)
+            if confirmation_id is None:
+                try:
+                    confirmation_details_page = self._fetch_confirmation_details_page(confirmation)
+                    confirmation_id = str(parse_id(confirmation_details_page))
+                except (KeyError, IndexError, ValueError, AttributeError):
+                    confirmation_id = ''
+                self._details_ids[cache_key] = confirmation_id
+            if confirmation_id == target_id:
                 return confirmation
         raise ConfirmationExpected
 
     @staticmethod
     def _get_confirmation_sell_listing_id(confirmation_details_page: str) -> str:
-        soup = BeautifulSoup(confirmation_details_page, 'html.parser')
-        scr_raw = soup.select('script')[2].string.strip()
+        scr_raw = confirmation_details_page
+        if "'confiteminfo', " not in scr_raw:
+            scr_raw = make_soup(confirmation_details_page).select('script')[2].string.strip()
         scr_raw = scr_raw[scr_raw.index("'confiteminfo', ") + 16:]
         scr_raw = scr_raw[: scr_raw.index(', UserYou')].replace('\n', '')
         return json.loads(scr_raw)['id']
 
     @staticmethod
     def _get_confirmation_trade_offer_id(confirmation_details_page: str) -> str:
-        soup = BeautifulSoup(confirmation_details_page, 'html.parser')
-        full_offer_id = soup.select('.tradeoffer')[0]['id']
+        offer_id = search(r'id="tradeofferid_(\d+)"', confirmation_details_page)
+        if offer_id:
+            return offer_id
+        full_offer_id = make_soup(confirmation_details_page).select('.tradeoffer')[0]['id']
         return full_offer_id.split('_')[1]
 
@@ -1,5 +1,6 @@
 from .models import EResult
 class SteamError(Exception):
+    pass
 
 class EResultError(SteamError):
 
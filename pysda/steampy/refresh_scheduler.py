@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import random
+import threading
+import time
+import weakref
+from typing import Callable, Dict, Optional
+
+from pysda.utils import session_probe
+class SimpleLogger:
+    @staticmethod
+    def info(msg): print(f"[INFO] {msg}")
+    @staticmethod
+    def error(msg): print(f"[ERROR] {msg}")
+    @staticmethod
+    def warning(msg): print(f"[WARNING] {msg}")
+    @staticmethod
+    def debug(msg): print(f"[DEBUG] {msg}")
+
+logger = SimpleLogger()
+
+
+class _Registration:
+    def __init__(self, client, on_refreshed: Optional[Callable] = None) -> None:
+        self.client_ref = weakref.ref(client)
+        self.on_refreshed = on_refreshed
+        self.generation = 0
+        self.failures = 0
+
+
+class SessionRefreshScheduler:
+    REFRESH_LEAD = 600
+    REFRESH_SPREAD = 300
+    MIN_SPACING = 2.0
+    UNKNOWN_EXPIRY_RECHECK = 1800
+    RETRY_DELAYS = (60, 300, 900)
+
+    def __init__(self) -> None:
+        self._heap: list = []
+        self._registrations: Dict[int, _Registration] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._last_refresh = 0.0
+
+    def register(self, client, on_refreshed: Optional[Callable] = None) -> None:
+        with self._cond:
+            registration = self._registrations.get(id(client))
+            if registration is None or registration.client_ref() is not client:
+                registration = _Registration(client, on_refreshed)
+                self._registrations[id(client)] = registration
+            elif on_refreshed is not None:
+                registration.on_refreshed = on_refreshed
+
+            self._schedule_locked(client, registration, self._next_due(client))
+            self._ensure_thread_locked()
+
+    def unregister(self, client) -> None:
+        with self._cond:
+            registration = self._registrations.pop(id(client), None)
+            if registration:
+                registration.generation += 1
+            self._cond.notify()
+
+    def _next_due(self, client) -> float:
+        expiry = session_probe.get_login_expiry(client._session)
+        now = time.time()
+        if expiry is None:
+            return time.monotonic() + self.UNKNOWN_EXPIRY_RECHECK
+
+        lead = self.REFRESH_LEAD + random.uniform(0, self.REFRESH_SPREAD)
+        return time.monotonic() + max(expiry - lead - now, 0)
+
+    def _schedule_locked(self, client, registration: _Registration, due: float) -> None:
+        registration.generation += 1
+        heapq.heappush(self._heap, (due, next(self._seq), id(client), registration.generation))
+        self._cond.notify()
+
+    def _ensure_thread_locked(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="SessionRefreshScheduler", daemon=True)
+            self._thread.start()
+
+    def _pop_due(self):
+        with self._cond:
+            while True:
+                while self._heap:
+                    due, _, key, generation = self._heap[0]
+                    registration = self._registrations.get(key)
+                    if registration is None or registration.generation != generation:
+                        heapq.heappop(self._heap)
+                        continue
+                    if registration.client_ref() is None:
+                        heapq.heappop(self._heap)
+                        del self._registrations[key]
+                        continue
+                    break
+
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+
+                due = max(self._heap[0][0], self._last_refresh + self.MIN_SPACING)
+                delay = due - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+
+                _, _, key, _ = heapq.heappop(self._heap)
+                self._last_refresh = time.monotonic()
+                return self._registrations[key]
+
+    def _run(self) -> None:
+        while True:
+            registration = self._pop_due()
+            client = registration.client_ref()
+            if client is None:
+                continue
+
+            try:
+                refreshed = self._refresh(client)
+            except Exception as e:
+                logger.error(f"❌ Ошибка планового обновления сессии для {client.username}: {e}")
+                refreshed = False
+
+            with self._cond:
+                if self._registrations.get(id(client)) is not registration:
+                    continue
+
+                if refreshed:
+                    registration.failures = 0
+                    due = self._next_due(client)
+                else:
+                    delay = self.RETRY_DELAYS[min(registration.failures, len(self.RETRY_DELAYS) - 1)]
+                    registration.failures += 1
+                    due = time.monotonic() + delay
+                    logger.warning(f"⚠️ Повторная попытка обновления сессии {client.username} через {delay} сек")
+
+                self._schedule_locked(client, registration, due)
+
+            if refreshed and registration.on_refreshed:
+                try:
+                    registration.on_refreshed(client)
+                except Exception as e:
+                    logger.error(f"❌ Ошибка обработчика обновления сессии для {client.username}: {e}")
+
+    def _refresh(self, client) -> bool:
+        logger.info(f"⏰ Плановое обновление сессии для {client.username}")
+
+        if client.refresh_token and client._try_refresh_session():
+            return True
+
+        logger.info(f"🔐 Refresh токен не сработал, выполняем полный вход для {client.username}")
+        client.update_session()
+        return session_probe.is_session_alive(client._session, client.username)
+
+
+_scheduler: Optional[SessionRefreshScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_refresh_scheduler() -> SessionRefreshScheduler:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = SessionRefreshScheduler()
+        return _scheduler
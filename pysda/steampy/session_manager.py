@@ -23,6 +23,8 @@ except ImportError:
 from .client import SteamClient
 from .guard import generate_one_time_code, load_steam_guard
 from .models import SteamUrl
+from pysda.utils import session_probe
+from .refresh_scheduler import get_refresh_scheduler
 
 
 class SecureSessionManager:
@@ -32,7 +34,6 @@ class SecureSessionManager:
         self.check_interval = check_interval
         self.running = False
         self.client: Optional[SteamClient] = None
-        self.monitor_thread: Optional[threading.Thread] = None
         self.last_check = datetime.now()
         
         self._setup_logging()
@@ -155,16 +156,7 @@ class SecureSessionManager:
             return False
         
         try:
-            response = self.client._session.get(
-                SteamUrl.COMMUNITY_URL,
-                timeout=10,
-                headers={'User-Agent': 'Steam Client'}
-            )
-            
-            is_valid = (
-                response.status_code == 200 and 
-                self.username.lower() in response.text.lower()
-            )
+            is_valid = session_probe.is_session_alive(self.client._session, self.username)
             
             if is_valid:
                 self.logger.debug("Сессия актуальна")
@@ -234,26 +226,10 @@ class SecureSessionManager:
         self.logger.info("Принудительное обновление сессии...")
         return self.login(force_refresh=True)
     
-    def _monitor_session(self) -> None:
-        while self.running:
-            try:
-                if not self.is_session_valid():
-                    self.logger.warning("Сессия неактуальна, обновляем...")
-                    if self.login():
-                        self.logger.info("Сессия обновлена")
-                    else:
-                        self.logger.error("Не удалось обновить сессию")
-                
-                self.last_check = datetime.now()
-                
-                for _ in range(self.check_interval):
-                    if not self.running:
-                        break
-                    time.sleep(1)
-                    
-            except Exception as e:
-                self.logger.error(f"Ошибка в мониторинге сессии: {e}")
-                time.sleep(60)
+    def _on_session_refreshed(self, client: SteamClient) -> None:
+        self._save_session_secure(client._session.cookies.get_dict())
+        self.last_check = datetime.now()
+        self.logger.info("Сессия обновлена")
     
     def start_monitoring(self) -> None:
         if self.running:
@@ -264,17 +240,16 @@ class SecureSessionManager:
             raise RuntimeError("Не удалось войти в Steam")
         
         self.running = True
-        self.monitor_thread = threading.Thread(target=self._monitor_session, daemon=True)
-        self.monitor_thread.start()
-        self.logger.info(f"Мониторинг сессии запущен (интервал: {self.check_interval}с)")
+        get_refresh_scheduler().register(self.client, on_refreshed=self._on_session_refreshed)
+        self.logger.info("Мониторинг сессии запущен (обновление по сроку действия токена)")
     
     def stop_monitoring(self) -> None:
         if not self.running:
             return
         
         self.running = False
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=5)
+        if self.client:
+            get_refresh_scheduler().unregister(self.client)
         
         self.logger.info("Мониторинг сессии остановлен")
     
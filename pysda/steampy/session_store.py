@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.cookies import create_cookie
+
+from pysda.utils import session_probe
+class SimpleLogger:
+    @staticmethod
+    def info(msg): print(f"[INFO] {msg}")
+    @staticmethod
+    def error(msg): print(f"[ERROR] {msg}")
+    @staticmethod
+    def warning(msg): print(f"[WARNING] {msg}")
+    @staticmethod
+    def debug(msg): print(f"[DEBUG] {msg}")
+
+logger = SimpleLogger()
+
+
+def cookies_to_list(jar) -> List[Dict[str, Any]]:
+    return [
+        {
+            'name': cookie.name,
+            'value': cookie.value,
+            'domain': cookie.domain,
+            'path': cookie.path,
+            'expires': cookie.expires,
+            'secure': cookie.secure,
+            'rest': dict(cookie._rest),
+        }
+        for cookie in jar
+    ]
+
+
+def cookies_from_list(jar, cookies: List[Dict[str, Any]]) -> None:
+    for cookie in cookies:
+        jar.set_cookie(create_cookie(
+            cookie['name'],
+            cookie['value'],
+            domain=cookie.get('domain', ''),
+            path=cookie.get('path', '/'),
+            expires=cookie.get('expires'),
+            secure=cookie.get('secure', False),
+            rest=cookie.get('rest') or {},
+        ))
+
+
+class SessionStore:
+    FILENAME = 'sessions.db'
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.path = os.path.join(directory, self.FILENAME)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS sessions ('
+                ' username TEXT PRIMARY KEY,'
+                ' steam_id TEXT,'
+                ' refresh_token TEXT,'
+                ' cookies TEXT NOT NULL,'
+                ' expires_at INTEGER,'
+                ' updated_at REAL NOT NULL)'
+            )
+            self._conn.commit()
+        return self._conn
+
+    def load(self, username: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection().execute(
+                'SELECT steam_id, refresh_token, cookies, expires_at FROM sessions WHERE username = ?',
+                (username,)
+            ).fetchone()
+
+        if row is None:
+            return self._migrate_pickle(username)
+
+        return {
+            'steam_id': row[0],
+            'refresh_token': row[1],
+            'cookies': json.loads(row[2]),
+            'expires_at': row[3],
+        }
+
+    def save(self, username: str, session: requests.Session, refresh_token: Optional[str],
+             steam_id: Optional[str] = None) -> None:
+        cookies = cookies_to_list(session.cookies)
+        expires_at = session_probe.get_login_expiry(session)
+
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO sessions (username, steam_id, refresh_token, cookies, expires_at, updated_at)'
+                    ' VALUES (?, ?, ?, ?, ?, ?)',
+                    (username, str(steam_id) if steam_id else None, refresh_token,
+                     json.dumps(cookies), expires_at, time.time())
+                )
+
+    def delete(self, username: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute('DELETE FROM sessions WHERE username = ?', (username,))
+
+    def _migrate_pickle(self, username: str) -> Optional[Dict[str, Any]]:
+        pkl_path = os.path.join(self.directory, f'{username}.pkl')
+        if not os.path.exists(pkl_path):
+            return None
+
+        try:
+            with open(pkl_path, 'rb') as f:
+                session, refresh_token = pickle.load(f)
+        except Exception as e:
+            logger.error(f"❌ Не удалось прочитать старую сессию {pkl_path}: {e}")
+            return None
+
+        self.save(username, session, refresh_token)
+        os.replace(pkl_path, pkl_path + '.migrated')
+        logger.info(f"📦 Сессия {username} перенесена из pkl в {self.FILENAME}")
+
+        return {
+            'steam_id': None,
+            'refresh_token': refresh_token,
+            'cookies': cookies_to_list(session.cookies),
+            'expires_at': session_probe.get_login_expiry(session),
+        }
+
+
+_stores: Dict[str, SessionStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_session_store(directory: str) -> SessionStore:
+    key = os.path.abspath(directory)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = SessionStore(key)
+            _stores[key] = store
+        return store
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import copy
 import math
 import re
 import struct
@@ -11,9 +10,12 @@ from urllib.parse import parse_qs, urlparse
 import decimal
 
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import Tag
 from requests.structures import CaseInsensitiveDict
 
+from core.description_store import get_description_store
+from core.html_parsing import make_soup
+
 from .exceptions import LoginRequired, ProxyConnectionError
 
 if TYPE_CHECKING:
@@ -97,12 +99,12 @@ def merge_items_with_descriptions_from_inventory(inventory_response: dict, game:
     inventory = inventory_response.get('assets', [])
     if not inventory:
         return {}
-    descriptions = {get_description_key(description): description for description in inventory_response['descriptions']}
+    descriptions = intern_descriptions(inventory_response['descriptions'], game.app_id)
     return merge_items(inventory, descriptions, context_id=game.context_id)
 
 
 def merge_items_with_descriptions_from_offers(offers_response: dict) -> dict:
-    descriptions = {get_description_key(offer): offer for offer in offers_response['response'].get('descriptions', [])}
+    descriptions = intern_descriptions(offers_response['response'].get('descriptions', []))
     received_offers = offers_response['response'].get('trade_offers_received', [])
     sent_offers = offers_response['response'].get('trade_offers_sent', [])
     offers_response['response']['trade_offers_received'] = [merge_items_with_descriptions_from_offer(offer, descriptions) for offer in received_offers]
@@ -118,6 +120,11 @@ def merge_items_with_descriptions_from_offer(offer: dict, descriptions: dict) ->
     return offer
 
 
+def intern_descriptions(descriptions: list[dict], app_id: str | None = None) -> dict:
+    store = get_description_store()
+    return {get_description_key(description): description for description in store.intern_many(app_id, descriptions).values()}
+
+
 def merge_items_with_descriptions_from_listing(listings: dict, ids_to_assets_address: dict, descriptions: dict) -> dict:
     for listing_id, listing in listings.get('sell_listings').items():
         asset_address = ids_to_assets_address[listing_id]
@@ -128,21 +135,28 @@ def merge_items_with_descriptions_from_listing(listings: dict, ids_to_assets_add
 
 def merge_items(items: list[dict], descriptions: dict, **kwargs) -> dict:
     merged_items = {}
+    store = get_description_store()
 
     for item in items:
         description_key = get_description_key(item)
-        description = copy.copy(descriptions[description_key])
+        description = descriptions.get(description_key)
+        if description is None:
+            description = store.get(item.get('appid'), item['classid'], item['instanceid'])
+            if description is None:
+                raise KeyError(description_key)
         item_id = item.get('id') or item['assetid']
-        description['contextid'] = item.get('contextid') or kwargs['context_id']
-        description['id'] = item_id
-        description['amount'] = item['amount']
-        merged_items[item_id] = description
+        merged_items[item_id] = {
+            **description,
+            'contextid': item.get('contextid') or kwargs['context_id'],
+            'id': item_id,
+            'amount': item['amount'],
+        }
 
     return merged_items
 
 
 def get_market_listings_from_html(html: str) -> dict:
-    document = BeautifulSoup(html, 'html.parser')
+    document = make_soup(html)
     nodes = document.select('div[id=myListings]')[0].findAll('div', {'class': 'market_home_listing_table'})
     sell_listings_dict = {}
     buy_orders_dict = {}
@@ -180,7 +194,7 @@ def get_sell_listings_from_node(node: Tag) -> dict:
 
 
 def get_market_sell_listings_from_api(html: str) -> dict:
-    document = BeautifulSoup(html, 'html.parser')
+    document = make_soup(html)
     sell_listings_dict = get_sell_listings_from_node(document)
     return {'sell_listings': sell_listings_dict}
 
@@ -1,5 +1,7 @@
-import time
 from requests.adapters import HTTPAdapter
+
+from core.http_transport import get_shared_adapter
+from core.rate_limiter import TokenBucket
 class SimpleLogger:
     @staticmethod
     def info(msg): print(f"[INFO] {msg}")
@@ -15,15 +17,17 @@ logger = SimpleLogger()
 class DelayedHTTPAdapter(HTTPAdapter):
     def __init__(self, *args, delay: float = 0, **kwargs):
         self.delay = delay
+        self.bucket = TokenBucket(rate=1 / delay, capacity=1) if delay > 0 else None
         super().__init__(*args, **kwargs)
 
     def send(self, request, **kwargs):
-        try:
-            if 'timeout' not in kwargs or kwargs['timeout'] is None:
-                kwargs['timeout'] = (10, 30)
-            response = super().send(request, **kwargs)
-            return response
-        finally:
-            if hasattr(self, 'delay') and self.delay > 0:
-                logger.debug(f"Пауза на {self.delay:.2f} сек после запроса к {request.url}")
-                time.sleep(self.delay) 
+        if 'timeout' not in kwargs or kwargs['timeout'] is None:
+            kwargs['timeout'] = (10, 30)
+        if self.bucket is not None:
+            waited = self.bucket.acquire()
+            if waited > 0:
+                logger.debug(f"Пауза {waited:.2f} сек перед запросом к {request.url}")
+        return get_shared_adapter().send(request, **kwargs)
+
+    def close(self):
+        pass
@@ -0,0 +1,122 @@
+import base64
+import json
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import unquote
+
+import requests
+class SimpleLogger:
+    @staticmethod
+    def info(msg): print(f"[INFO] {msg}")
+    @staticmethod
+    def error(msg): print(f"[ERROR] {msg}")
+    @staticmethod
+    def warning(msg): print(f"[WARNING] {msg}")
+    @staticmethod
+    def debug(msg): print(f"[DEBUG] {msg}")
+
+logger = SimpleLogger()
+
+LOGIN_COOKIE_NAME = 'steamLoginSecure'
+COMMUNITY_DOMAIN = 'steamcommunity.com'
+CLIENT_TOKEN_URL = 'https://steamcommunity.com/chat/clientjstoken'
+
+EXPIRY_MARGIN = 60
+VERDICT_TTL = 300
+
+_verdicts: Dict[Tuple[str, str], Tuple[bool, float]] = {}
+_verdicts_lock = threading.Lock()
+
+
+def get_login_cookie(session: requests.Session, domain: str = COMMUNITY_DOMAIN) -> Optional[str]:
+    fallback = None
+    for cookie in session.cookies:
+        if cookie.name != LOGIN_COOKIE_NAME or not cookie.value:
+            continue
+        if cookie.domain.lstrip('.') == domain:
+            return cookie.value
+        fallback = fallback or cookie.value
+    return fallback
+
+
+def decode_login_token(cookie_value: str) -> Optional[Dict[str, Any]]:
+    try:
+        token = unquote(cookie_value).split('||')[-1]
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload))
+    except (IndexError, ValueError):
+        return None
+
+
+def get_login_expiry(session: requests.Session) -> Optional[int]:
+    cookie_value = get_login_cookie(session)
+    if not cookie_value:
+        return None
+    payload = decode_login_token(cookie_value)
+    if not payload or 'exp' not in payload:
+        return None
+    return int(payload['exp'])
+
+
+def _probe_remote(session: requests.Session, username: Optional[str]) -> Optional[bool]:
+    try:
+        response = session.get(CLIENT_TOKEN_URL, timeout=10)
+        if response.status_code != 200:
+            return False
+        data = response.json()
+    except ValueError:
+        return False
+    except requests.RequestException as e:
+        logger.warning(f"⚠️ Не удалось проверить сессию через {CLIENT_TOKEN_URL}: {e}")
+        return None
+
+    if not data.get('logged_in'):
+        return False
+    if username and str(data.get('account_name', '')).lower() != username.lower():
+        return False
+    return True
+
+
+def is_session_alive(session: requests.Session, username: Optional[str] = None,
+                     verify: bool = False, ttl: float = VERDICT_TTL) -> bool:
+    cookie_value = get_login_cookie(session)
+    if not cookie_value:
+        return False
+
+    payload = decode_login_token(cookie_value)
+    if payload and 'exp' in payload:
+        if payload['exp'] - time.time() <= EXPIRY_MARGIN:
+            return False
+        if not verify:
+            return True
+
+    key = (cookie_value, (username or '').lower())
+    now = time.monotonic()
+
+    with _verdicts_lock:
+        cached = _verdicts.get(key)
+    if cached and cached[1] > now:
+        return cached[0]
+
+    verdict = _probe_remote(session, username)
+    if verdict is None:
+        return False
+
+    with _verdicts_lock:
+        for stale_key in [k for k, (_, expires_at) in _verdicts.items() if expires_at <= now]:
+            del _verdicts[stale_key]
+        if ttl > 0:
+            _verdicts[key] = (verdict, now + ttl)
+
+    return verdict
+
+
+def forget_session(session: requests.Session):
+    cookie_value = get_login_cookie(session)
+    if not cookie_value:
+        return
+    with _verdicts_lock:
+        for key in [k for k in _verdicts if k[0] == cookie_value]:
+            del _verdicts[key]
@@ -0,0 +1,236 @@
+import csv
+import threading
+from array import array
+from operator import mul
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+TRADABLE = 1
+MARKETABLE = 2
+
+
+class StringPool:
+    __slots__ = ('values', '_index')
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def add(self, value: Optional[str]) -> int:
+        value = value or ''
+        index = self._index.get(value)
+        if index is None:
+            index = len(self.values)
+            self.values.append(value)
+            self._index[value] = index
+        return index
+
+    def find(self, value: str) -> Optional[int]:
+        return self._index.get(value)
+
+    def __getitem__(self, index: int) -> str:
+        return self.values[index]
+
+
+class InventoryTable:
+
+    def __init__(self, currency: str = "USD", currency_symbol: str = "$"):
+        self.currency = currency
+        self.currency_symbol = currency_symbol
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.strings = StringPool()
+        self.account = array('I')
+        self.name = array('I')
+        self.market_name = array('I')
+        self.rarity = array('I')
+        self.type = array('I')
+        self.icon_url = array('I')
+        self.name_color = array('I')
+        self.app_id = array('I')
+        self.context_id = array('I')
+        self.asset_id = array('Q')
+        self.amount = array('l')
+        self.price = array('d')
+        self.flags = array('B')
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, account: str, name: str, market_name: str, amount: int, price: float,
+               tradable: bool, marketable: bool, rarity: str = '', type: str = '', icon_url: str = '',
+               name_color: str = '', asset_id=0, app_id: str = '', context_id: str = '2') -> int:
+        strings = self.strings
+
+        with self._lock:
+            self.account.append(strings.add(account))
+            self.name.append(strings.add(name))
+            self.market_name.append(strings.add(market_name))
+            self.rarity.append(strings.add(rarity))
+            self.type.append(strings.add(type))
+            self.icon_url.append(strings.add(icon_url))
+            self.name_color.append(strings.add(name_color))
+            self.app_id.append(strings.add(str(app_id)))
+            self.context_id.append(strings.add(str(context_id)))
+            self.asset_id.append(int(asset_id or 0))
+            self.amount.append(int(amount))
+            self.price.append(float(price))
+            self.flags.append((TRADABLE if tradable else 0) | (MARKETABLE if marketable else 0))
+            self._count += 1
+            return self._count - 1
+
+    def append_dict(self, account: str, item: Dict) -> int:
+        return self.append(
+            account, item.get('name', ''), item.get('market_name', ''), item.get('amount', 1), item.get('price', 0.0),
+            item.get('tradable', False), item.get('marketable', False), item.get('rarity', ''), item.get('type', ''),
+            item.get('icon_url', ''), item.get('name_color', ''), item.get('asset_id', 0),
+            item.get('app_id', ''), item.get('context_id', '2')
+        )
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    def status(self, index: int) -> str:
+        flags = self.flags[index]
+        if not flags & TRADABLE:
+            return "Не обмениваемый"
+        return "Продаваемый" if flags & MARKETABLE else "Не продается"
+
+    def item_value(self, index: int) -> float:
+        return self.price[index] * self.amount[index]
+
+    def row(self, index: int) -> Dict:
+        strings = self.strings
+        flags = self.flags[index]
+        return {
+            'account': strings[self.account[index]],
+            'name': strings[self.name[index]],
+            'market_name': strings[self.market_name[index]],
+            'amount': self.amount[index],
+            'price': self.price[index],
+            'total_price': self.item_value(index),
+            'item_value': self.item_value(index),
+            'tradable': bool(flags & TRADABLE),
+            'marketable': bool(flags & MARKETABLE),
+            'rarity': strings[self.rarity[index]],
+            'type': strings[self.type[index]],
+            'icon_url': strings[self.icon_url[index]],
+            'name_color': strings[self.name_color[index]],
+            'asset_id': str(self.asset_id[index]),
+            'app_id': strings[self.app_id[index]],
+            'context_id': strings[self.context_id[index]],
+            'status': self.status(index),
+        }
+
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict]:
+        stop = self._count if stop is None else min(stop, self._count)
+        for index in range(start, stop):
+            yield self.row(index)
+
+    def to_dicts(self, display_name: Optional[Callable[[str], str]] = None) -> List[Dict]:
+        rows = list(self.rows())
+        if display_name:
+            names = {}
+            for row in rows:
+                account = row['account']
+                if account not in names:
+                    names[account] = display_name(account)
+                row['display_name'] = names[account]
+        return rows
+
+    def total_value(self) -> float:
+        count = self._count
+        return sum(map(mul, self.price[:count], self.amount[:count]))
+
+    def total_amount(self) -> int:
+        return sum(self.amount[:self._count])
+
+    def account_count(self) -> int:
+        return len(set(self.account[:self._count]))
+
+    def set_price(self, market_name: str, price: float) -> int:
+        market_index = self.strings.find(market_name)
+        if market_index is None:
+            return 0
+
+        updated = 0
+        with self._lock:
+            for index in range(self._count):
+                if self.market_name[index] == market_index and self.flags[index] & MARKETABLE:
+                    self.price[index] = price
+                    updated += 1
+        return updated
+
+    def set_prices(self, prices: Dict[str, float]) -> int:
+        by_index = {}
+        for market_name, price in prices.items():
+            market_index = self.strings.find(market_name)
+            if market_index is not None:
+                by_index[market_index] = price
+        if not by_index:
+            return 0
+
+        updated = 0
+        with self._lock:
+            for index, market_index in enumerate(self.market_name[:self._count]):
+                price = by_index.get(market_index)
+                if price is not None and self.flags[index] & MARKETABLE:
+                    self.price[index] = price
+                    updated += 1
+        return updated
+
+    def group_by_market_name(self) -> Dict[str, Dict]:
+        groups: Dict[int, Dict] = {}
+        count = self._count
+
+        for market_index, account_index, amount, price in zip(self.market_name[:count], self.account[:count],
+                                                              self.amount[:count], self.price[:count]):
+            group = groups.get(market_index)
+            if group is None:
+                group = groups[market_index] = {'amount': 0, 'total_value': 0.0, 'price': price, 'accounts': set()}
+            group['amount'] += amount
+            group['total_value'] += price * amount
+            group['accounts'].add(account_index)
+
+        strings = self.strings
+        return {
+            strings[market_index]: {
+                'amount': group['amount'],
+                'total_value': group['total_value'],
+                'price': group['price'],
+                'accounts': sorted(strings[index] for index in group['accounts']),
+            }
+            for market_index, group in groups.items()
+        }
+
+    def write_csv(self, csvfile, display_name: Optional[Callable[[str], str]] = None):
+        writer = csv.writer(csvfile)
+        strings = self.strings
+        symbol = self.currency_symbol
+        names: Dict[int, str] = {}
+
+        writer.writerow(["Аккаунт", "Предмет", "Количество", "Статус", "Цена за шт.", "Общая стоимость"])
+
+        for index in range(self._count):
+            account_index = self.account[index]
+            account = names.get(account_index)
+            if account is None:
+                account = strings[account_index]
+                account = names[account_index] = display_name(account) if display_name else account
+
+            price = self.price[index]
+            amount = self.amount[index]
+            writer.writerow([
+                account,
+                strings[self.name[index]],
+                amount,
+                self.status(index),
+                f"{symbol}{price:.2f}",
+                f"{symbol}{price * amount:.2f}",
+            ])
+
+        return writer
@@ -41,26 +41,10 @@ class SteamAPIManager:
     
     def _get_mafile_data(self, login: str) -> Optional[Dict[str, Any]]:
         try:
-            import core.settings_manager
-            accounts_dir = core.settings_manager.get_accounts_dir()
-            
-            for filename in os.listdir(accounts_dir):
-                if filename.lower().endswith('.mafile'):
-                    mafile_path = os.path.join(accounts_dir, filename)
-                    with open(mafile_path, 'r', encoding='utf-8') as f:
-                        mafile_data = json.load(f)
-                    
-                    account_name = None
-                    if 'account_name' in mafile_data:
-                        account_name = mafile_data['account_name']
-                    elif 'AccountName' in mafile_data:
-                        account_name = mafile_data['AccountName']
-                    elif 'Steam' in mafile_data and 'Username' in mafile_data['Steam']:
-                        account_name = mafile_data['Steam']['Username']
-                    
-                    if account_name == login:
-                        return mafile_data
-            return None
+            from core.settings_manager import settings_manager
+            
+            entry = settings_manager.find_mafile(login)
+            return entry.data if entry and not entry.error else None
         except Exception as e:
             print(f"Ошибка при получении .mafile данных: {e}")
             return None
@@ -235,27 +219,15 @@ class SteamTradeManager:
         self.session_data = {}
         
     def _get_mafile_data(self, login: str) -> Optional[Dict[str, Any]]:
+        entry = self._get_mafile_entry(login)
+        return entry.data if entry else None
+    
+    def _get_mafile_entry(self, login: str):
         try:
-            import core.settings_manager
-            accounts_dir = core.settings_manager.get_accounts_dir()
-            
-            for filename in os.listdir(accounts_dir):
-                if filename.lower().endswith('.mafile'):
-                    mafile_path = os.path.join(accounts_dir, filename)
-                    with open(mafile_path, 'r', encoding='utf-8') as f:
-                        mafile_data = json.load(f)
-                    
-                    account_name = None
-                    if 'account_name' in mafile_data:
-                        account_name = mafile_data['account_name']
-                    elif 'AccountName' in mafile_data:
-                        account_name = mafile_data['AccountName']
-                    elif 'Steam' in mafile_data and 'Username' in mafile_data['Steam']:
-                        account_name = mafile_data['Steam']['Username']
-                    
-                    if account_name == login:
-                        return mafile_data
-            return None
+            from core.settings_manager import settings_manager
+            
+            entry = settings_manager.find_mafile(login)
+            return entry if entry and not entry.error else None
         except Exception as e:
             print(f"Ошибка при получении .mafile данных: {e}")
             return None
@@ -362,67 +334,19 @@ class SteamTradeManager:
             print(f"[DEBUG] Отправленный трейд offer_id: {offer_id}")
 
             if self.steam_client:
-                print(f"[DEBUG] Останавливаем мост после отправки трейда для {login}")
+                print(f"[DEBUG] Освобождаем мост после отправки трейда для {login}")
                 self.steam_client.stop_bridge()
                 self.steam_client = None
 
             if offer_id:
                 try:
-                    print(f"[DEBUG] Начинаем поиск подтверждения для трейда {offer_id} после остановки моста")
-                    
-                    mafile_data = self._get_mafile_data(login)
-                    if not mafile_data:
-                        print(f"[ERROR] Не найден .mafile для аккаунта {login}")
-                        return offer_id
-                    
-                    import core.settings_manager
-                    accounts_dir = core.settings_manager.get_accounts_dir()
-                    mafile_path = None
-                    
-                    for filename in os.listdir(accounts_dir):
-                        if filename.lower().endswith('.mafile'):
-                            test_path = os.path.join(accounts_dir, filename)
-                            with open(test_path, 'r', encoding='utf-8') as f:
-                                test_data = json.load(f)
-                            
-                            account_name = None
-                            if 'account_name' in test_data:
-                                account_name = test_data['account_name']
-                            elif 'AccountName' in test_data:
-                                account_name = test_data['AccountName']
-                            elif 'Steam' in test_data and 'Username' in test_data['Steam']:
-                                account_name = test_data['Steam']['Username']
-                            
-                            if account_name == login:
-                                mafile_path = test_path
-                                break
-                    
-                    if not mafile_path:
-                        print(f"[ERROR] Не найден путь к .mafile для аккаунта {login}")
-                        return offer_id
-                    
-                    from pysda.pysda_trade_manager import TradeConfirmationManager
-                    confirmation_manager = TradeConfirmationManager(login, mafile_path)
-                    
-                    import time
-                    time.sleep(3)
+                    print(f"[DEBUG] Подтверждаем трейд {offer_id} по creator_id")
                     
-                    confirmations = confirmation_manager.get_guard_confirmations()
-                    print(f"[DEBUG] Найдено {len(confirmations)} подтверждений Guard")
+                    from pysda import SimpleTradeManager
+                    result = SimpleTradeManager().confirm_trade_offer(login, offer_id)
+                    print(f"[DEBUG] Результат подтверждения трейда {offer_id}: {result}")
                     
-                    found = False
-                    for conf in confirmations:
-                        print(f"[DEBUG] Проверяем подтверждение: тип={conf['type']}, описание={conf['description']}, id={conf['id']}")
-                        
-                        if conf['type'] in ['Trade', 'Market Transaction']:
-                            print(f"[DEBUG] Найдено подтверждение трейда: {conf['description']}")
-                            print(f"[DEBUG] Подтверждаем подтверждение для трейда {offer_id}")
-                            success = confirmation_manager.confirm_guard_confirmation(conf['confirmation'])
-                            print(f"[DEBUG] Результат подтверждения трейда {offer_id}: {success}")
-                            found = True
-                            break
-                    
-                    if not found:
+                    if not result.get('success'):
                         print(f"[WARN] Не найдено Guard-подтверждение для трейда {offer_id}")
                         
                 except Exception as e:
@@ -449,6 +373,33 @@ class SteamTradeManager:
             print(f"Ошибка получения трейдов для {login}: {e}")
             return None
     
+    def get_trade_offers_many(self, logins: List[str], filter_type: str = "active") -> Dict[str, Optional[Dict]]:
+        
+            
+        results: Dict[str, Optional[Dict]] = {login: None for login in logins}
+        client = self._get_steam_client()
+        logins_by_session = {self.active_sessions[login]: login for login in logins if login in self.active_sessions}
+        
+        if not client or not logins_by_session:
+            return results
+        
+        try:
+            batch = client.get_trade_offers_many(list(logins_by_session), filter_type)
+        except Exception as e:
+            print(f"Ошибка пакетного получения трейдов: {e}")
+            return results
+        
+        for session_id, result in batch.items():
+            login = logins_by_session.get(session_id)
+            if not login:
+                continue
+            if result.get('success'):
+                results[login] = result
+            else:
+                print(f"Ошибка получения трейдов для {login}: {result.get('error')}")
+        
+        return results
+    
     def accept_trade_offer(self, login: str, offer_id: str) -> bool:
         client = self._get_steam_client()
         session_id = self.active_sessions.get(login)
@@ -5,11 +5,17 @@ import time
 import re
 import sys
 import os
-from typing import Dict, List, Tuple, Optional
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Optional
 from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from core.settings_manager import get_application_path
+from core.settings_manager import get_application_path, settings_manager
+from core.http_transport import create_session
+from core.inventory_engine import InventoryError, iter_inventory
+from core.price_cache import get_price_cache
+from steam.inventory_table import InventoryTable
 
 
 @dataclass
@@ -32,15 +38,75 @@ class InventoryItem:
     currency: str = "USD"
 
 
+class PriceResolver:
+    
+    MAX_WORKERS = 4
+    
+    def __init__(self, parser: 'SteamInventoryParser', app_id: str = "730", currency: str = "USD",
+                 max_workers: int = MAX_WORKERS):
+        self.parser = parser
+        self.app_id = app_id
+        self.currency = currency
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="PriceResolver")
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def submit(self, market_name: str) -> Future:
+        with self._lock:
+            future = self._futures.get(market_name)
+            if future is None:
+                future = self._executor.submit(self.parser.get_item_price, market_name, self.app_id, self.currency)
+                self._futures[market_name] = future
+        return future
+    
+    def resolve(self, market_names) -> Dict[str, float]:
+        for market_name in market_names:
+            if market_name:
+                self.submit(market_name)
+        return self.results()
+    
+    def results(self, market_names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        with self._lock:
+            if market_names is None:
+                futures = list(self._futures.items())
+            else:
+                futures = [(name, self._futures[name]) for name in market_names if name in self._futures]
+        
+        prices = {}
+        for market_name, future in futures:
+            try:
+                prices[market_name] = future.result()[0]
+            except Exception as e:
+                print(f"Ошибка получения цены для {market_name}: {e}")
+                prices[market_name] = 0.0
+        return prices
+    
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
 class SteamInventoryParser:
     
+    ACCOUNT_WORKERS = 4
+    
     def __init__(self):
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
         
         self.price_cache = {}
+        self.price_store = get_price_cache()
+        
+        price_dump_path = settings_manager.get_price_dump_path()
+        if price_dump_path:
+            self.price_store.prefill_from_file(price_dump_path)
         
         self.currencies = {
             'USD': 1,
@@ -62,66 +128,45 @@ class SteamInventoryParser:
             'AUD': 'AU',
         }
     
-    def get_inventory(self, steam_id: str, app_id: str = "730", context_id: str = "2") -> List[InventoryItem]:
+    def iter_inventory(self, steam_id: str, app_id: str = "730", context_id: str = "2") -> Iterator[InventoryItem]:
+        
         
+        for asset, desc in iter_inventory(self.session, steam_id, app_id, context_id):
+            item = InventoryItem(
+                name=desc.get('name', ''),
+                market_name=desc.get('market_name', ''),
+                app_id=app_id,
+                asset_id=asset['assetid'],
+                class_id=asset['classid'],
+                instance_id=asset['instanceid'],
+                amount=int(asset.get('amount', 1)),
+                tradable=bool(desc.get('tradable', 0)),
+                marketable=bool(desc.get('marketable', 0)),
+                icon_url=desc.get('icon_url', ''),
+                name_color=desc.get('name_color', ''),
+                type=desc.get('type', ''),
+            )
+            
+            tags = desc.get('tags', [])
+            for tag in tags:
+                if tag.get('category') == 'Rarity':
+                    item.rarity = tag.get('localized_tag_name', '')
+                    break
+            
+            yield item
+    
+    def get_inventory(self, steam_id: str, app_id: str = "730", context_id: str = "2") -> List[InventoryItem]:
         
-        url = f"https://steamcommunity.com/inventory/{steam_id}/{app_id}/{context_id}"
         
         try:
-            response = self.session.get(url, timeout=30)
-            
-            if response.status_code != 200:
-                print(f"Ошибка получения инвентаря: HTTP {response.status_code}")
-                return []
+            return list(self.iter_inventory(steam_id, app_id, context_id))
             
-            data = response.json()
-            
-            if not data.get('success'):
+        except InventoryError as e:
+            if e.status_code and e.status_code != 200:
+                print(f"Ошибка получения инвентаря: {e}")
+            else:
                 print(f"Инвентарь недоступен или пуст")
-                return []
-            
-            assets = data.get('assets', [])
-            descriptions = data.get('descriptions', [])
-            
-            desc_dict = {}
-            for desc in descriptions:
-                key = (desc['classid'], desc['instanceid'])
-                desc_dict[key] = desc
-            
-            items = []
-            for asset in assets:
-                class_id = asset['classid']
-                instance_id = asset['instanceid']
-                key = (class_id, instance_id)
-                
-                if key in desc_dict:
-                    desc = desc_dict[key]
-                    
-                    item = InventoryItem(
-                        name=desc.get('name', ''),
-                        market_name=desc.get('market_name', ''),
-                        app_id=app_id,
-                        asset_id=asset['assetid'],
-                        class_id=class_id,
-                        instance_id=instance_id,
-                        amount=int(asset.get('amount', 1)),
-                        tradable=bool(desc.get('tradable', 0)),
-                        marketable=bool(desc.get('marketable', 0)),
-                        icon_url=desc.get('icon_url', ''),
-                        name_color=desc.get('name_color', ''),
-                        type=desc.get('type', ''),
-                    )
-                    
-                    tags = desc.get('tags', [])
-                    for tag in tags:
-                        if tag.get('category') == 'Rarity':
-                            item.rarity = tag.get('localized_tag_name', '')
-                            break
-                    
-                    items.append(item)
-            
-            return items
-            
+            return []
         except requests.exceptions.RequestException as e:
             print(f"Ошибка сети при получении инвентаря: {e}")
             return []
@@ -143,6 +188,19 @@ class SteamInventoryParser:
             print(f"Неподдерживаемая валюта {currency}, используем USD")
             currency = "USD"
         
+        currency_symbol = self.get_currency_symbol(currency)
+        price = self.price_store.get(app_id, market_name, currency,
+                                     lambda: self._fetch_item_price(market_name, app_id, currency))
+        if price is None:
+            return 0.0, currency_symbol
+        
+        result = (price, currency_symbol)
+        self.price_cache[cache_key] = result
+        return result
+    
+    def _fetch_item_price(self, market_name: str, app_id: str, currency: str) -> Optional[float]:
+        
+        
         currency_code = self.currencies[currency]
         country_code = self.country_codes[currency]
         
@@ -158,18 +216,17 @@ class SteamInventoryParser:
             response = self.session.get(url, params=params, timeout=15)
             
             if response.status_code == 429:
-                print(f"Ограничение Steam API для {market_name}, ждем 5 секунд...")
-                time.sleep(5)
-                response = self.session.get(url, params=params, timeout=15)
+                print(f"Ограничение Steam API для {market_name}, лимит запросов исчерпан")
+                return None
             
             if response.status_code != 200:
                 print(f"Ошибка получения цены для {market_name}: HTTP {response.status_code}")
-                return 0.0, self.get_currency_symbol(currency)
+                return None
             
             data = response.json()
             
             if not data.get('success'):
-                return 0.0, self.get_currency_symbol(currency)
+                return 0.0
             
             lowest_price = data.get('lowest_price', '0')
             price = self.parse_price_string(lowest_price)
@@ -177,19 +234,14 @@ class SteamInventoryParser:
             if currency == 'RUB' and price > 0:
                 print(f"Цена для {market_name}: '{lowest_price}' -> {price} {currency}")
             
-            result = (price, self.get_currency_symbol(currency))
-            self.price_cache[cache_key] = result
-            
-            time.sleep(0.2)
-            
-            return result
+            return price
             
         except requests.exceptions.RequestException as e:
             print(f"Ошибка сети при получении цены для {market_name}: {e}")
-            return 0.0, self.get_currency_symbol(currency)
+            return None
         except Exception as e:
             print(f"Ошибка при получении цены для {market_name}: {e}")
-            return 0.0, self.get_currency_symbol(currency)
+            return None
     
     def parse_price_string(self, price_str: str) -> float:
         if not price_str:
@@ -279,7 +331,10 @@ class SteamInventoryParser:
             print(f"Ошибка чтения Steam ID из mafile {mafile_path}: {e}")
             return None
     
-    def analyze_account_inventory(self, login: str, app_id: str = "730", currency: str = "USD") -> Dict:
+    def analyze_account_inventory(self, login: str, app_id: str = "730", currency: str = "USD",
+                                  on_item: Optional[Callable[[Dict], None]] = None,
+                                  table: Optional[InventoryTable] = None,
+                                  resolver: Optional[PriceResolver] = None) -> Dict:
         
         
         from core.settings_manager import settings_manager
@@ -297,75 +352,105 @@ class SteamInventoryParser:
         }
         
         try:
-            accounts = settings_manager.get_accounts()
-            if login not in accounts:
+            mafile_entry = settings_manager.find_mafile(login)
+            if not mafile_entry:
                 result['error'] = "Аккаунт не найден в настройках"
                 return result
             
-            account_data = accounts[login]
-            mafile_name = account_data.get('mafile')
-            
-            if not mafile_name:
-                result['error'] = "У аккаунта нет .mafile"
-                return result
-            
-            mafile_path = os.path.join(get_application_path(), "data", "mafiles", mafile_name)
-            steam_id64 = self.get_account_steam_id64_from_mafile(mafile_path)
+            steam_id64 = mafile_entry.steam_id or self.get_account_steam_id64_from_mafile(mafile_entry.path)
             
             if not steam_id64:
                 result['error'] = "Не удалось получить Steam ID из .mafile"
                 return result
             
             print(f"Получение инвентаря для {login} (Steam ID: {steam_id64})")
-            inventory_items = self.get_inventory(steam_id64, app_id)
-            
-            if not inventory_items:
-                result['error'] = "Инвентарь пуст или недоступен"
-                return result
             
             items_with_prices = []
             total_value = 0.0
+            total_items = 0
+            pending_amounts: Dict[str, int] = {}
             
-            for item in inventory_items:
-                price = 0.0
-                currency_symbol = self.get_currency_symbol(currency)
-                
-                if item.marketable and item.market_name:
-                    try:
-                        price, currency_symbol = self.get_item_price(item.market_name, app_id, currency)
-                        item.price_local = price
+            try:
+                for item in self.iter_inventory(steam_id64, app_id):
+                    price = 0.0
+                    currency_symbol = self.get_currency_symbol(currency)
+                    
+                    if resolver is not None:
+                        if item.marketable and item.market_name:
+                            resolver.submit(item.market_name)
+                            pending_amounts[item.market_name] = pending_amounts.get(item.market_name, 0) + item.amount
+                        item.price_local = 0.0
                         item.currency = currency
-                        total_value += price * item.amount
-                    except Exception as e:
-                        print(f"Ошибка получения цены для {item.market_name}: {e}")
+                    elif item.marketable and item.market_name:
+                        try:
+                            price, currency_symbol = self.get_item_price(item.market_name, app_id, currency)
+                            item.price_local = price
+                            item.currency = currency
+                            total_value += price * item.amount
+                        except Exception as e:
+                            print(f"Ошибка получения цены для {item.market_name}: {e}")
+                            item.price_local = 0.0
+                            item.currency = currency
+                    else:
                         item.price_local = 0.0
                         item.currency = currency
-                else:
-                    item.price_local = 0.0
-                    item.currency = currency
-                
-                items_with_prices.append({
-                    'name': item.name,
-                    'market_name': item.market_name,
-                    'amount': item.amount,
-                    'price': item.price_local,
-                    'total_price': item.price_local * item.amount,
-                    'tradable': item.tradable,
-                    'marketable': item.marketable,
-                    'rarity': item.rarity,
-                    'type': item.type,
-                    'icon_url': item.icon_url,
-                    'name_color': item.name_color,
-                    'asset_id': item.asset_id,
-                    'app_id': item.app_id,
-                    'context_id': '2'
-                })
+                    
+                    total_items += 1
+                    
+                    if table is not None:
+                        table.append(
+                            login, item.name, item.market_name, item.amount, item.price_local,
+                            item.tradable, item.marketable, item.rarity, item.type, item.icon_url,
+                            item.name_color, item.asset_id, item.app_id, '2'
+                        )
+                        continue
+                    
+                    item_data = {
+                        'name': item.name,
+                        'market_name': item.market_name,
+                        'amount': item.amount,
+                        'price': item.price_local,
+                        'total_price': item.price_local * item.amount,
+                        'tradable': item.tradable,
+                        'marketable': item.marketable,
+                        'rarity': item.rarity,
+                        'type': item.type,
+                        'icon_url': item.icon_url,
+                        'name_color': item.name_color,
+                        'asset_id': item.asset_id,
+                        'app_id': item.app_id,
+                        'context_id': '2'
+                    }
+                    items_with_prices.append(item_data)
+                    
+                    if on_item:
+                        on_item(item_data)
+            except (InventoryError, requests.exceptions.RequestException, ValueError) as e:
+                if not total_items:
+                    result['error'] = "Инвентарь пуст или недоступен"
+                    return result
+                result['error'] = f"Инвентарь загружен не полностью: {e}"
+            
+            if not total_items:
+                result['error'] = "Инвентарь пуст или недоступен"
+                return result
+            
+            if pending_amounts:
+                # Цены аккаунта дожидаемся здесь же, чтобы итог был готов к моменту on_account
+                prices = resolver.results(pending_amounts)
+                total_value = sum(prices[name] * amount for name, amount in pending_amounts.items())
+                if table is not None:
+                    table.set_prices(prices)
+                for item_data in items_with_prices:
+                    if item_data['marketable'] and item_data['market_name'] in prices:
+                        item_data['price'] = prices[item_data['market_name']]
+                        item_data['total_price'] = item_data['price'] * item_data['amount']
             
             result.update({
                 'success': True,
                 'items': items_with_prices,
                 'total_value': total_value,
-                'total_items': len(inventory_items),
+                'total_items': total_items,
                 'steam_id64': steam_id64
             })
             
@@ -374,6 +459,38 @@ class SteamInventoryParser:
         except Exception as e:
             result['error'] = f"Ошибка анализа инвентаря: {str(e)}"
             return result
+    
+    def analyze_accounts(self, logins: List[str], app_id: str = "730", currency: str = "USD",
+                         table: Optional[InventoryTable] = None,
+                         on_account: Optional[Callable[[int, str, Dict], None]] = None,
+                         max_workers: int = ACCOUNT_WORKERS) -> Dict[str, Dict]:
+        
+        
+        table = table if table is not None else InventoryTable(currency, self.get_currency_symbol(currency))
+        results = {}
+        
+        with PriceResolver(self, app_id, currency) as resolver, \
+                ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="InventoryFetch") as executor:
+            futures = {
+                executor.submit(self.analyze_account_inventory, login, app_id, currency, table=table, resolver=resolver): login
+                for login in logins
+            }
+            
+            for done, future in enumerate(as_completed(futures)):
+                login = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'login': login, 'success': False, 'error': f"Ошибка анализа инвентаря: {e}"}
+                results[login] = result
+                if on_account:
+                    on_account(done, login, result)
+            
+            prices = resolver.results()
+        
+        table.set_prices(prices)
+        print(f"Цены получены для {len(prices)} уникальных предметов")
+        return results
 
 
 def format_price(price: float, currency_symbol: str) -> str:
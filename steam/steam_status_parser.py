@@ -2,29 +2,166 @@ import requests
 import threading
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from bs4 import BeautifulSoup
 import sys
 import os
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from core.settings_manager import get_application_path
+from core.http_transport import create_session
+from core.html_parsing import HtmlDocument, element_block, search, strip_tags
+
+
+COUNT_RE = re.compile(r'(\d{1,3}(?:,\d{3})*|\d+)')
+GAMES_LINK_RE = re.compile(r'<a[^>]*href="[^"]*/games/[^"]*"[^>]*>(.*?)</a>', re.DOTALL)
+STEAM_ID_PATTERNS = [
+    r'"steamid":"(\d{17})"',
+    r'g_steamID\s*=\s*["\'](\d{17})["\']',
+    r'steamid["\']?\s*:\s*["\'](\d{17})["\']',
+    r'UserSteamID["\']?\s*=\s*["\'](\d{17})["\']'
+]
+LEVEL_SELECTORS = [
+    'span.friendPlayerLevelNum',
+    'span.profile_level_num',
+    '.persona_level .friendPlayerLevelNum',
+    '.friendPlayerLevel .friendPlayerLevelNum',
+    '.profile_level .friendPlayerLevelNum'
+]
+LEVEL_PATTERNS = [
+    r'"level":(\d+)',
+    r'level["\']?\s*:\s*(\d+)',
+    r'friendPlayerLevel["\']?\s*:\s*(\d+)'
+]
+GAME_COUNT_SELECTORS = [
+    '.profile_count_link_total',
+    '.profile_summary .profile_count_link_total',
+    'span.profile_count_link_total'
+]
+CREATION_DATE_PATTERNS = [
+    r'Member since (\w+ \d{4})',
+    r'Участник с (\w+ \d{4})',
+    r'since (\d{1,2} \w+ \d{4})'
+]
+
+
+def parse_count(text):
+    count_match = COUNT_RE.search(text or '')
+    if count_match:
+        count_str = count_match.group(1).replace(',', '')
+        if count_str.isdigit():
+            return count_str
+    return None
+
+
+def parse_ban_status(html):
+    block = element_block(html, 'profile_ban_status')
+    if block:
+        ban_text = strip_tags(block).lower()
+        
+        if 'vac ban' in ban_text:
+            days = search(r'(\d+)\s*day', ban_text)
+            return f"VAC Ban ({days} дн.)" if days else "VAC Ban"
+        elif 'game ban' in ban_text:
+            count = search(r'(\d+)\s*game ban', ban_text)
+            return f"Game Ban ({count})" if count else "Game Ban"
+        elif 'community ban' in ban_text:
+            return "Community Ban"
+        elif 'trade ban' in ban_text:
+            return "Trade Ban"
+    
+    page_text = html.lower()
+    if 'vac ban' in page_text and 'no vac ban' not in page_text:
+        return "VAC Ban"
+    elif 'game ban' in page_text and 'no game ban' not in page_text:
+        return "Game Ban"
+    elif 'trade ban' in page_text:
+        return "Trade Ban"
+    
+    return "Чистый"
+
+
+def parse_level(html, document):
+    level = search(r'class="friendPlayerLevelNum"[^>]*>\s*(\d+)\s*<', html)
+    if level:
+        return level
+    
+    level_text = document.text(*LEVEL_SELECTORS)
+    if level_text and level_text.isdigit():
+        return level_text
+    
+    for script in document.scripts():
+        for pattern in LEVEL_PATTERNS:
+            level = search(pattern, script)
+            if level and level.isdigit():
+                return level
+    
+    return "0"
+
+
+def parse_games_count(html, document):
+    games_link = GAMES_LINK_RE.search(html)
+    if games_link:
+        count = parse_count(strip_tags(games_link.group(1)))
+        if count:
+            return count
+    
+    count = parse_count(search(r'class="profile_count_link_total"[^>]*>([^<]*)<', html))
+    if count:
+        return count
+    
+    return parse_count(document.text(*GAME_COUNT_SELECTORS))
+
+
+def parse_creation_date(html):
+    block = element_block(html, 'profile_summary', limit=20000)
+    if block:
+        date_text = strip_tags(block)
+        for pattern in CREATION_DATE_PATTERNS:
+            date = search(pattern, date_text)
+            if date:
+                return date
+    return "Неизвестна"
+
+
+def parse_profile_xml(xml):
+    return {
+        'steam_id': search(r'<steamID64>\s*(\d{17})\s*</steamID64>', xml),
+        'vac_banned': search(r'<vacBanned>\s*(\d+)\s*</vacBanned>', xml) not in (None, '0'),
+        'trade_ban_state': search(r'<tradeBanState>\s*([^<]*?)\s*</tradeBanState>', xml),
+        'member_since': search(r'<memberSince>\s*([^<]*?)\s*</memberSince>', xml),
+        'privacy_state': search(r'<privacyState>\s*([^<]*?)\s*</privacyState>', xml),
+    }
+
+
+def parse_profile_page(html):
+    document = HtmlDocument(html)
+    return {
+        'vac_status': parse_ban_status(html),
+        'level': parse_level(html, document),
+        'games_count': parse_games_count(html, document),
+        'creation_date': parse_creation_date(html),
+    }
 
 
 class SteamStatusParser:
     
     def __init__(self):
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
         self.cache = {}
         self.cache_timeout = 300
+        self.wallet_cache = {}
+        self.wallet_cache_timeout = 1800
         
         self.steamcommunity_base = "https://steamcommunity.com"
+        self.executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="SteamStatus")
         
     def clear_cache(self):
         self.cache.clear()
+        self.wallet_cache.clear()
         print("🗑️ Кеш парсера статуса очищен")
     
     def _is_cache_valid(self, cache_entry):
@@ -35,27 +172,17 @@ class SteamStatusParser:
     def get_steam_id_from_mafile(self, login):
         try:
             from core.settings_manager import settings_manager
-            accounts = settings_manager.get_accounts()
+            mafile_entry = settings_manager.find_mafile(login)
             
-            if login not in accounts:
+            if not mafile_entry:
                 print(f"❌ Аккаунт {login} не найден в настройках")
                 return None
             
-            mafile_name = accounts[login].get('mafile')
-            if not mafile_name:
-                print(f"❌ MaFile для аккаунта {login} не найден")
+            if mafile_entry.error:
+                print(f"❌ Файл {mafile_entry.filename} не удалось прочитать")
                 return None
             
-            import os
-            import json
-            mafile_path = os.path.join(get_application_path(), "data", "mafiles", mafile_name)
-            
-            if not os.path.exists(mafile_path):
-                print(f"❌ Файл {mafile_name} не найден")
-                return None
-            
-            with open(mafile_path, 'r', encoding='utf-8') as f:
-                mafile_data = json.load(f)
+            mafile_data = mafile_entry.data
             
             steam_id = mafile_data.get('Session', {}).get('SteamID')
             if not steam_id:
@@ -93,36 +220,20 @@ class SteamStatusParser:
                     print(f"✅ SteamID найден через прямой URL: {steam_id}")
                     return steam_id
                 
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                script_tags = soup.find_all('script')
-                for script in script_tags:
-                    if script.string:
-                        patterns = [
-                            r'"steamid":"(\d{17})"',
-                            r'g_steamID\s*=\s*["\'](\d{17})["\']',
-                            r'steamid["\']?\s*:\s*["\'](\d{17})["\']',
-                            r'UserSteamID["\']?\s*=\s*["\'](\d{17})["\']'
-                        ]
-                        
-                        for pattern in patterns:
-                            steam_id_match = re.search(pattern, script.string)
-                            if steam_id_match:
-                                steam_id = steam_id_match.group(1)
-                                print(f"✅ SteamID найден в скрипте: {steam_id}")
-                                return steam_id
+                for pattern in STEAM_ID_PATTERNS:
+                    steam_id = search(pattern, response.text)
+                    if steam_id:
+                        print(f"✅ SteamID найден в скрипте: {steam_id}")
+                        return steam_id
             
             xml_url = f"{self.steamcommunity_base}/id/{login}?xml=1"
             response = self.session.get(xml_url, timeout=10)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'xml')
-                steamid_tag = soup.find('steamID64')
-                if steamid_tag and steamid_tag.text:
-                    steam_id = steamid_tag.text.strip()
-                    if steam_id.isdigit() and len(steam_id) == 17:
-                        print(f"✅ SteamID найден через XML: {steam_id}")
-                        return steam_id
+                steam_id = search(r'<steamID64>\s*(\d{17})\s*</steamID64>', response.text)
+                if steam_id:
+                    print(f"✅ SteamID найден через XML: {steam_id}")
+                    return steam_id
             
             if login.isdigit() and len(login) == 17:
                 profile_url = f"{self.steamcommunity_base}/profiles/{login}"
@@ -138,54 +249,19 @@ class SteamStatusParser:
             print(f"❌ Ошибка получения SteamID для {login}: {e}")
             return None
     
+    def get_profile_fields(self, steam_id, timeout=15):
+        profile_url = f"{self.steamcommunity_base}/profiles/{steam_id}"
+        
+        response = self.session.get(profile_url, timeout=timeout)
+        if response.status_code != 200:
+            return None
+        
+        return parse_profile_page(response.text)
+    
     def get_vac_status(self, steam_id):
         try:
-            profile_url = f"{self.steamcommunity_base}/profiles/{steam_id}"
-            
-            response = self.session.get(profile_url, timeout=15)
-            if response.status_code != 200:
-                return "Ошибка доступа"
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            ban_selectors = [
-                'div.profile_ban_status',
-                'div.profile_ban',
-                'div.profile_content_inner .profile_ban_status',
-                '.profile_ban_status'
-            ]
-            
-            for selector in ban_selectors:
-                ban_info = soup.select_one(selector)
-                if ban_info:
-                    ban_text = ban_info.get_text(strip=True).lower()
-                    
-                    if 'vac ban' in ban_text:
-                        days_match = re.search(r'(\d+)\s*day', ban_text)
-                        if days_match:
-                            days = days_match.group(1)
-                            return f"VAC Ban ({days} дн.)"
-                        return "VAC Ban"
-                    elif 'game ban' in ban_text:
-                        count_match = re.search(r'(\d+)\s*game ban', ban_text)
-                        if count_match:
-                            count = count_match.group(1)
-                            return f"Game Ban ({count})"
-                        return "Game Ban"
-                    elif 'community ban' in ban_text:
-                        return "Community Ban"
-                    elif 'trade ban' in ban_text:
-                        return "Trade Ban"
-            
-            page_text = response.text.lower()
-            if 'vac ban' in page_text and 'no vac ban' not in page_text:
-                return "VAC Ban"
-            elif 'game ban' in page_text and 'no game ban' not in page_text:
-                return "Game Ban"
-            elif 'trade ban' in page_text:
-                return "Trade Ban"
-            
-            return "Чистый"
+            fields = self.get_profile_fields(steam_id)
+            return fields['vac_status'] if fields else "Ошибка доступа"
             
         except Exception as e:
             print(f"❌ Ошибка получения VAC статуса: {e}")
@@ -193,124 +269,45 @@ class SteamStatusParser:
     
     def get_account_level(self, steam_id):
         try:
-            profile_url = f"{self.steamcommunity_base}/profiles/{steam_id}"
-            
-            response = self.session.get(profile_url, timeout=15)
-            if response.status_code != 200:
-                return "Неизвестно"
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            level_selectors = [
-                'span.friendPlayerLevelNum',
-                'span.profile_level_num',
-                '.persona_level .friendPlayerLevelNum',
-                '.friendPlayerLevel .friendPlayerLevelNum',
-                '.profile_level .friendPlayerLevelNum'
-            ]
-            
-            for selector in level_selectors:
-                level_element = soup.select_one(selector)
-                if level_element:
-                    level_text = level_element.get_text(strip=True)
-                    if level_text.isdigit():
-                        return level_text
-            
-            script_tags = soup.find_all('script')
-            for script in script_tags:
-                if script.string:
-                    level_patterns = [
-                        r'"level":(\d+)',
-                        r'level["\']?\s*:\s*(\d+)',
-                        r'friendPlayerLevel["\']?\s*:\s*(\d+)'
-                    ]
-                    
-                    for pattern in level_patterns:
-                        level_match = re.search(pattern, script.string)
-                        if level_match:
-                            level = level_match.group(1)
-                            if level.isdigit():
-                                return level
-            
-            return "0"
+            fields = self.get_profile_fields(steam_id)
+            return fields['level'] if fields else "Неизвестно"
             
         except Exception as e:
             print(f"❌ Ошибка получения уровня аккаунта: {e}")
             return "Ошибка"
     
-    def get_account_games_count(self, steam_id):
+    def get_account_games_count(self, steam_id, fields=None):
         try:
-            profile_url = f"{self.steamcommunity_base}/profiles/{steam_id}"
-            response = self.session.get(profile_url, timeout=10)
+            if fields is None:
+                fields = self.get_profile_fields(steam_id, timeout=10)
             
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                games_link = soup.find('a', href=re.compile(r'/games/'))
-                if games_link:
-                    games_text = games_link.get_text(strip=True)
-                    count_match = re.search(r'(\d{1,3}(?:,\d{3})*|\d+)', games_text)
-                    if count_match:
-                        count_str = count_match.group(1).replace(',', '')
-                        if count_str.isdigit():
-                            print(f"✅ Игр найдено в профиле: {count_str}")
-                            return count_str
-                
-                game_count_selectors = [
-                    '.profile_count_link_total',
-                    '.profile_summary .profile_count_link_total',
-                    'span.profile_count_link_total'
-                ]
-                
-                for selector in game_count_selectors:
-                    count_elem = soup.select_one(selector)
-                    if count_elem:
-                        count_text = count_elem.get_text(strip=True)
-                        count_match = re.search(r'(\d{1,3}(?:,\d{3})*|\d+)', count_text)
-                        if count_match:
-                            count_str = count_match.group(1).replace(',', '')
-                            if count_str.isdigit():
-                                print(f"✅ Игр найдено через селектор: {count_str}")
-                                return count_str
+            if fields and fields['games_count']:
+                print(f"✅ Игр найдено в профиле: {fields['games_count']}")
+                return fields['games_count']
             
             games_url = f"{self.steamcommunity_base}/profiles/{steam_id}/games/?tab=all"
             response = self.session.get(games_url, timeout=10)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+                html = response.text
+                count = parse_count(search(r'class="profile_count_link_total"[^>]*>([^<]*)<', html))
+                if count:
+                    print(f"✅ Игр найдено на странице игр: {count}")
+                    return count
                 
-                count_selectors = [
-                    'span.profile_count_link_total',
-                    '.profile_count_link_total',
-                    '.games_list_tab .profile_count_link_total'
+                document = HtmlDocument(html)
+                patterns = [
+                    r'rgGames.*?length["\']?\s*:\s*(\d+)',
+                    r'game_count["\']?\s*:\s*(\d+)',
+                    r'total_count["\']?\s*:\s*(\d+)'
                 ]
                 
-                for selector in count_selectors:
-                    count_elem = soup.select_one(selector)
-                    if count_elem:
-                        count_text = count_elem.get_text(strip=True)
-                        count_match = re.search(r'(\d{1,3}(?:,\d{3})*|\d+)', count_text)
-                        if count_match:
-                            count_str = count_match.group(1).replace(',', '')
-                            if count_str.isdigit():
-                                print(f"✅ Игр найдено на странице игр: {count_str}")
-                                return count_str
-                
-                script_tags = soup.find_all('script')
-                for script in script_tags:
-                    if script.string:
-                        patterns = [
-                            r'rgGames.*?length["\']?\s*:\s*(\d+)',
-                            r'game_count["\']?\s*:\s*(\d+)',
-                            r'total_count["\']?\s*:\s*(\d+)'
-                        ]
-                        
-                        for pattern in patterns:
-                            games_count_match = re.search(pattern, script.string)
-                            if games_count_match:
-                                count = games_count_match.group(1)
-                                print(f"✅ Игр найдено в JS: {count}")
-                                return count
+                for script in document.scripts():
+                    for pattern in patterns:
+                        count = search(pattern, script)
+                        if count:
+                            print(f"✅ Игр найдено в JS: {count}")
+                            return count
             
             print(f"⚠️ Количество игр для {steam_id} недоступно (приватный профиль)")
             return "Приватные"
@@ -321,110 +318,115 @@ class SteamStatusParser:
     
     def get_profile_creation_date(self, steam_id):
         try:
-            profile_url = f"{self.steamcommunity_base}/profiles/{steam_id}"
-            
-            response = self.session.get(profile_url, timeout=10)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                creation_date_elem = soup.find('div', class_='profile_summary')
-                if creation_date_elem:
-                    date_text = creation_date_elem.get_text()
-                    date_patterns = [
-                        r'Member since (\w+ \d{4})',
-                        r'Участник с (\w+ \d{4})',
-                        r'since (\d{1,2} \w+ \d{4})'
-                    ]
-                    
-                    for pattern in date_patterns:
-                        date_match = re.search(pattern, date_text)
-                        if date_match:
-                            return date_match.group(1)
-            
-            return "Неизвестна"
+            fields = self.get_profile_fields(steam_id, timeout=10)
+            return fields['creation_date'] if fields else "Неизвестна"
             
         except Exception as e:
             print(f"❌ Ошибка получения даты создания: {e}")
             return "Ошибка"
     
     def get_wallet_balance(self, login):
+        cached = self.wallet_cache.get(login)
+        if cached and (datetime.now() - cached['timestamp']).total_seconds() < self.wallet_cache_timeout:
+            return cached['data']
+        
         try:
-            from steam_api.steam_client import SteamClient
-            from core.settings_manager import settings_manager
-            
-            password = settings_manager.get_account_password(login)
-            if not password:
-                print(f"❌ Пароль для аккаунта {login} не найден")
-                return "Нет пароля"
-            
-            accounts = settings_manager.get_accounts()
-            if login not in accounts:
-                print(f"❌ Аккаунт {login} не найден")
-                return "Аккаунт не найден"
+            from pysda import SimpleTradeManager
             
-            mafile_name = accounts[login].get('mafile')
-            if not mafile_name:
-                print(f"❌ MaFile для {login} не найден")
-                return "Нет MaFile"
+            print(f"💰 Получение баланса для {login}...")
+            balance_result = SimpleTradeManager().get_wallet_balance(login)
             
-            import json
-            import os
-            mafile_path = os.path.join(get_application_path(), "data", "mafiles", mafile_name)
+            if not balance_result.get('success'):
+                print(f"❌ Ошибка получения баланса: {balance_result.get('error')}")
+                return cached['data'] if cached else "Ошибка получения"
             
-            if not os.path.exists(mafile_path):
-                print(f"❌ MaFile не существует: {mafile_path}")
-                return "MaFile не найден"
-            
-            with open(mafile_path, 'r', encoding='utf-8') as f:
-                mafile_data = json.load(f)
-            
-            shared_secret = mafile_data.get('shared_secret')
-            if not shared_secret:
-                print(f"❌ shared_secret не найден в MaFile для {login}")
-                return "Нет shared_secret"
-            
-            client = SteamClient(auto_start=True)
+            wallet_balance = {
+                'balance': balance_result['balance'],
+                'currency': balance_result['currency'],
+                'formatted': balance_result['formatted']
+            }
+            self.wallet_cache[login] = {
+                'data': wallet_balance,
+                'timestamp': datetime.now()
+            }
             
-            try:
-                print(f"🔑 Авторизация в Steam для {login}...")
-                session_id, session_data = client.login(
-                    username=login,
-                    password=password,
-                    shared_secret=shared_secret
-                )
-                
-                if not session_id:
-                    print(f"❌ Ошибка авторизации: не удалось получить session_id")
-                    return "Ошибка авторизации"
-                
-                print(f"💰 Получение баланса для {login}...")
-                balance_result = client.get_wallet_balance(session_id)
-                
-                if balance_result.get('success'):
-                    balance = balance_result.get('balance', 0)
-                    currency = balance_result.get('currency', 'USD')
-                    formatted_balance = balance_result.get('formatted', f'{balance} {currency}')
-                    
-                    print(f"✅ Баланс {login}: {formatted_balance}")
-                    return {
-                        'balance': balance,
-                        'currency': currency,
-                        'formatted': formatted_balance
-                    }
-                else:
-                    print(f"❌ Ошибка получения баланса: {balance_result.get('error')}")
-                    return "Ошибка получения"
-                    
-            finally:
-                try:
-                    if 'session_id' in locals():
-                        client.logout(session_id)
-                except:
-                    pass
+            print(f"✅ Баланс {login}: {wallet_balance['formatted']}")
+            return wallet_balance
                 
         except Exception as e:
             print(f"❌ Ошибка получения баланса для {login}: {e}")
-            return "Ошибка"
+            return cached['data'] if cached else "Ошибка"
+    
+    def _fetch_text(self, url, timeout=15):
+        response = self.session.get(url, timeout=timeout, allow_redirects=True)
+        if response.status_code != 200:
+            return None, response.url
+        return response.text, response.url
+    
+    def collect_profile_status(self, login):
+        steam_id = self.get_steam_id_from_mafile(login)
+        if not steam_id and login.isdigit() and len(login) == 17:
+            steam_id = login
+        
+        if steam_id:
+            profile_url = f"{self.steamcommunity_base}/profiles/{steam_id}"
+        else:
+            print(f"🔍 Поиск SteamID через Steam Community для логина: {login}")
+            profile_url = f"{self.steamcommunity_base}/id/{login}"
+        
+        page_future = self.executor.submit(self._fetch_text, profile_url)
+        xml_future = self.executor.submit(self._fetch_text, f"{profile_url}?xml=1", 10)
+        
+        try:
+            html, final_url = page_future.result()
+        except Exception as e:
+            print(f"❌ Ошибка загрузки профиля {profile_url}: {e}")
+            html, final_url = None, profile_url
+        try:
+            xml, _ = xml_future.result()
+        except Exception as e:
+            print(f"❌ Ошибка загрузки XML профиля {profile_url}: {e}")
+            xml = None
+        
+        xml_fields = parse_profile_xml(xml) if xml else {}
+        
+        if not steam_id:
+            steam_id = search(r'/profiles/(\d{17})', final_url or '') or xml_fields.get('steam_id')
+            if not steam_id and html:
+                for pattern in STEAM_ID_PATTERNS:
+                    steam_id = search(pattern, html)
+                    if steam_id:
+                        break
+        
+        if not steam_id:
+            return None
+        
+        fields = parse_profile_page(html) if html else {}
+        
+        vac_status = fields.get('vac_status')
+        if vac_status is None:
+            if not xml_fields:
+                vac_status = "Ошибка доступа"
+            elif xml_fields.get('vac_banned'):
+                vac_status = "VAC Ban"
+            elif xml_fields.get('trade_ban_state') not in (None, '', 'None'):
+                vac_status = "Trade Ban"
+            else:
+                vac_status = "Чистый"
+        
+        creation_date = fields.get('creation_date', "Неизвестна")
+        if creation_date == "Неизвестна" and xml_fields.get('member_since'):
+            creation_date = xml_fields['member_since']
+        
+        games_count = fields.get('games_count') or ("Приватные" if html else "Неизвестно")
+        
+        return {
+            'steam_id': steam_id,
+            'vac_status': vac_status,
+            'level': fields.get('level', "Неизвестно"),
+            'games_count': games_count,
+            'creation_date': creation_date,
+        }
     
     def get_full_account_status(self, login):
         cache_key = f"status_{login}"
@@ -435,8 +437,9 @@ class SteamStatusParser:
         try:
             print(f"🔍 Получение статуса для {login}...")
             
-            steam_id = self.get_steam_id_from_login(login)
-            if not steam_id:
+            wallet_future = self.executor.submit(self.get_wallet_balance, login)
+            profile = self.collect_profile_status(login)
+            if not profile:
                 print(f"❌ Не удалось получить SteamID для {login}")
                 return {
                     'vac_status': 'Профиль не найден',
@@ -447,13 +450,14 @@ class SteamStatusParser:
                     'status': 'error'
                 }
             
+            steam_id = profile['steam_id']
+            vac_status = profile['vac_status']
+            level = profile['level']
+            games_count = profile['games_count']
+            creation_date = profile['creation_date']
             print(f"✅ SteamID для {login}: {steam_id}")
             
-            vac_status = self.get_vac_status(steam_id)
-            level = self.get_account_level(steam_id)
-            games_count = self.get_account_games_count(steam_id)
-            creation_date = self.get_profile_creation_date(steam_id)
-            wallet_balance = self.get_wallet_balance(login)
+            wallet_balance = wallet_future.result()
             
             status_data = {
                 'vac_status': vac_status,
@@ -4,11 +4,14 @@ import json
 from typing import Dict, List, Optional
 from urllib.parse import parse_qs, urlparse
 
+from core.http_transport import create_session
+from core.inventory_engine import InventoryError, iter_inventory
+
 
 class SteamTradeManager:
     
     def __init__(self):
-        self.session = requests.Session()
+        self.session = create_session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
@@ -84,54 +87,28 @@ class SteamTradeManager:
         
             
         try:
-            url = f"https://steamcommunity.com/inventory/{steam_id}/{app_id}/{context_id}"
-            
-            response = self.session.get(url, timeout=30)
-            
-            if response.status_code != 200:
-                print(f"Ошибка получения инвентаря: HTTP {response.status_code}")
-                return []
-            
-            data = response.json()
-            
-            if not data.get('success'):
-                print("Инвентарь недоступен")
-                return []
-            
-            assets = data.get('assets', [])
-            descriptions = data.get('descriptions', [])
-            
-            desc_dict = {}
-            for desc in descriptions:
-                key = (desc['classid'], desc['instanceid'])
-                desc_dict[key] = desc
-            
             inventory_items = []
-            for asset in assets:
-                class_id = asset['classid']
-                instance_id = asset['instanceid']
-                key = (class_id, instance_id)
-                
-                if key in desc_dict:
-                    desc = desc_dict[key]
-                    
-                    if desc.get('tradable', 0) == 1:
-                        item = {
-                            'assetid': asset['assetid'],
-                            'classid': class_id,
-                            'instanceid': instance_id,
-                            'amount': asset.get('amount', '1'),
-                            'appid': app_id,
-                            'contextid': context_id,
-                            'name': desc.get('name', ''),
-                            'market_name': desc.get('market_name', ''),
-                            'tradable': desc.get('tradable', 0),
-                            'marketable': desc.get('marketable', 0)
-                        }
-                        inventory_items.append(item)
+            for asset, desc in iter_inventory(self.session, steam_id, app_id, context_id):
+                if desc.get('tradable', 0) == 1:
+                    item = {
+                        'assetid': asset['assetid'],
+                        'classid': asset['classid'],
+                        'instanceid': asset['instanceid'],
+                        'amount': asset.get('amount', '1'),
+                        'appid': app_id,
+                        'contextid': context_id,
+                        'name': desc.get('name', ''),
+                        'market_name': desc.get('market_name', ''),
+                        'tradable': desc.get('tradable', 0),
+                        'marketable': desc.get('marketable', 0)
+                    }
+                    inventory_items.append(item)
             
             return inventory_items
             
+        except InventoryError as e:
+            print(f"Ошибка получения инвентаря: {e}")
+            return []
         except Exception as e:
             print(f"Ошибка получения ассетов инвентаря: {e}")
             return []
@@ -0,0 +1,33 @@
+const DEFAULT_CONCURRENCY = 8;
+const MAX_CONCURRENCY = 32;
+
+// Обрабатывает сессии параллельно (не больше concurrency одновременно) и пишет
+// результат каждой сессии отдельной строкой NDJSON сразу по готовности
+async function streamBatch(res, sessionIds, concurrency, worker) {
+    const queue = Array.from(new Set(Array.isArray(sessionIds) ? sessionIds : []));
+    const limit = Math.max(1, Math.min(Number(concurrency) || DEFAULT_CONCURRENCY, MAX_CONCURRENCY, queue.length || 1));
+    let next = 0;
+
+    res.status(200);
+    res.setHeader('Content-Type', 'application/x-ndjson');
+
+    const runner = async () => {
+        while (next < queue.length) {
+            const sessionId = queue[next++];
+            let result;
+
+            try {
+                result = { sessionId, success: true, ...(await worker(sessionId)) };
+            } catch (error) {
+                result = { sessionId, success: false, error: error.message };
+            }
+
+            res.write(JSON.stringify(result) + '\n');
+        }
+    };
+
+    await Promise.all(Array.from({ length: limit }, runner));
+    res.end();
+}
+
+module.exports = { streamBatch, DEFAULT_CONCURRENCY };
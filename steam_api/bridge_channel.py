@@ -0,0 +1,205 @@
+import itertools
+import json
+import os
+import socket
+import tempfile
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+
+DEFAULT_CALL_TIMEOUT = 60.0
+DEFAULT_BATCH_CONCURRENCY = 8
+CONNECT_TIMEOUT = 2.0
+
+Address = Union[str, Tuple[str, int]]
+
+
+def ipc_address(port: int) -> Address:
+    if os.name == 'nt' or not hasattr(socket, 'AF_UNIX'):
+        return ("127.0.0.1", port + 1)
+    return os.path.join(tempfile.gettempdir(), f"asam-bridge-{port}.sock")
+
+
+def batch_timeout(count: int, concurrency: int = DEFAULT_BATCH_CONCURRENCY) -> float:
+    return DEFAULT_CALL_TIMEOUT * max(1, -(-count // max(concurrency, 1)))
+
+
+def ipc_env(address: Address) -> Dict[str, str]:
+    if isinstance(address, str):
+        return {'IPC_PATH': address}
+    return {'IPC_PORT': str(address[1])}
+
+
+class BridgeChannelError(Exception):
+    pass
+
+
+class BridgeUnavailableError(BridgeChannelError):
+    pass
+
+
+class BridgeChannel:
+
+    def __init__(self, address: Address, connect_timeout: float = CONNECT_TIMEOUT):
+        self.address = address
+        self.connect_timeout = connect_timeout
+
+        self._sock: Optional[socket.socket] = None
+        self._pending: Dict[int, Future] = {}
+        self._partials: Dict[int, Callable[[Any], None]] = {}
+        self._listeners: Dict[str, List[Callable[[str, Any], None]]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._sock is not None
+
+    def _open(self) -> socket.socket:
+        try:
+            if isinstance(self.address, str):
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.settimeout(self.connect_timeout)
+                sock.connect(self.address)
+            else:
+                sock = socket.create_connection(self.address, timeout=self.connect_timeout)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError as e:
+            raise BridgeUnavailableError(f"IPC канал bridge недоступен ({self.address}): {e}")
+
+        sock.settimeout(None)
+        self._sock = sock
+        threading.Thread(target=self._read_loop, args=(sock,), name="BridgeChannelReader", daemon=True).start()
+        return sock
+
+    def connect(self):
+        with self._lock:
+            if self._sock is None:
+                self._open()
+
+    def close(self):
+        with self._lock:
+            sock = self._sock
+        if sock is not None:
+            self._disconnect(sock, BridgeChannelError("IPC канал закрыт"))
+
+    def call(self, method: str, path: str, body: Optional[Dict[str, Any]] = None,
+             params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None,
+             on_partial: Optional[Callable[[Any], None]] = None) -> Tuple[int, Any]:
+        message_id = next(self._ids)
+        future: Future = Future()
+
+        with self._lock:
+            sock = self._sock or self._open()
+            self._pending[message_id] = future
+            if on_partial is not None:
+                self._partials[message_id] = on_partial
+
+        message = {'id': message_id, 'method': method.upper(), 'path': path}
+        if body is not None:
+            message['body'] = body
+        if params:
+            message['params'] = {key: value for key, value in params.items() if value is not None}
+        payload = (json.dumps(message, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+        try:
+            with self._write_lock:
+                sock.sendall(payload)
+        except OSError as e:
+            # Запрос мог уйти частично, поэтому не даем клиенту повторить его по HTTP
+            self._disconnect(sock, BridgeChannelError(f"IPC канал закрыт: {e}"))
+            raise BridgeChannelError(f"Не удалось отправить запрос в bridge: {e}")
+
+        try:
+            response = future.result(timeout or DEFAULT_CALL_TIMEOUT)
+        except FutureTimeoutError:
+            with self._lock:
+                self._pending.pop(message_id, None)
+                self._partials.pop(message_id, None)
+            raise BridgeChannelError(f"Bridge не ответил на {method.upper()} {path}")
+
+        return response.get('status', 500), response.get('result')
+
+    def subscribe(self, event: str, callback: Callable[[str, Any], None]):
+        with self._lock:
+            self._listeners.setdefault(event, []).append(callback)
+        self.connect()
+
+    def unsubscribe(self, event: str, callback: Callable[[str, Any], None]):
+        with self._lock:
+            listeners = self._listeners.get(event, [])
+            if callback in listeners:
+                listeners.remove(callback)
+
+    def has_listeners(self) -> bool:
+        return any(self._listeners.values())
+
+    def _read_loop(self, sock: socket.socket):
+        try:
+            for line in sock.makefile('rb'):
+                if not line.strip():
+                    continue
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+
+                if 'event' in message and 'id' not in message:
+                    self._emit(message['event'], message.get('data'))
+                    continue
+
+                if 'partial' in message:
+                    self._deliver_partial(message.get('id'), message['partial'])
+                    continue
+
+                with self._lock:
+                    future = self._pending.pop(message.get('id'), None)
+                    self._partials.pop(message.get('id'), None)
+                if future is not None:
+                    future.set_result(message)
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._disconnect(sock, BridgeChannelError("Bridge закрыл IPC канал"))
+
+    def _disconnect(self, sock: socket.socket, error: Exception):
+        with self._lock:
+            if self._sock is not sock:
+                return
+            self._sock = None
+            pending = list(self._pending.values())
+            self._pending.clear()
+            self._partials.clear()
+
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sock.close()
+
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    def _deliver_partial(self, message_id: int, data: Any):
+        with self._lock:
+            callback = self._partials.get(message_id)
+        if callback is None:
+            return
+
+        try:
+            callback(data)
+        except Exception as e:
+            print(f"Ошибка обработки частичного ответа bridge: {e}")
+
+    def _emit(self, event: str, data: Any):
+        with self._lock:
+            listeners = list(self._listeners.get(event, ())) + list(self._listeners.get('*', ()))
+
+        for callback in listeners:
+            try:
+                callback(event, data)
+            except Exception as e:
+                print(f"Ошибка обработчика события bridge {event}: {e}")
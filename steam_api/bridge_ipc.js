@@ -0,0 +1,184 @@
+const net = require('net');
+const fs = require('fs');
+const http = require('http');
+
+// Прогоняет сообщение через маршруты express без HTTP-сервера и сокета.
+// Ответы application/x-ndjson отдаются построчно через onPartial
+function dispatch(app, message, onPartial) {
+    return new Promise((resolve) => {
+        const query = new URLSearchParams(message.params || {}).toString();
+
+        const req = new http.IncomingMessage(null);
+        req.method = (message.method || 'GET').toUpperCase();
+        req.url = query ? `${message.path}?${query}` : message.path;
+        req.headers = { 'content-type': 'application/json' };
+        req.body = message.body || {};
+        req._body = true;
+        req.push(null);
+
+        const res = new http.ServerResponse(req);
+        const chunks = [];
+        let pending = '';
+        let streamed = 0;
+        let done = false;
+
+        const isStream = () => Boolean(onPartial) && String(res.getHeader('Content-Type') || '').includes('ndjson');
+
+        const finish = (status, body) => {
+            if (!done) {
+                done = true;
+                resolve({ status, body });
+            }
+        };
+
+        res.write = (chunk, encoding) => {
+            if (!chunk || typeof chunk === 'function') {
+                return true;
+            }
+            const buffer = Buffer.isBuffer(chunk) ? chunk : Buffer.from(chunk, typeof encoding === 'string' ? encoding : 'utf8');
+
+            if (!isStream()) {
+                chunks.push(buffer);
+                return true;
+            }
+
+            pending += buffer.toString('utf8');
+            let newline;
+            while ((newline = pending.indexOf('\n')) !== -1) {
+                const line = pending.slice(0, newline).trim();
+                pending = pending.slice(newline + 1);
+                if (line) {
+                    streamed += 1;
+                    onPartial(line);
+                }
+            }
+            return true;
+        };
+        res.end = (chunk, encoding) => {
+            res.write(chunk, encoding);
+
+            if (isStream()) {
+                if (pending.trim()) {
+                    streamed += 1;
+                    onPartial(pending.trim());
+                }
+                finish(res.statusCode, JSON.stringify({ success: true, streamed: streamed }));
+            } else {
+                finish(res.statusCode, Buffer.concat(chunks).toString('utf8'));
+            }
+            return res;
+        };
+
+        app.handle(req, res, (err) => {
+            finish(err ? 500 : 404, JSON.stringify({ error: err ? err.message : `Not found: ${req.method} ${message.path}` }));
+        });
+    });
+}
+
+function encodeResponse(id, status, body) {
+    const trimmed = (body || '').trim();
+    const isJson = trimmed.startsWith('{') || trimmed.startsWith('[');
+    const result = isJson ? trimmed : JSON.stringify({ error: trimmed || null });
+    return `{"id":${JSON.stringify(id)},"status":${status},"result":${result}}\n`;
+}
+
+function createIpcServer(app) {
+    const clients = new Set();
+
+    const server = net.createServer((socket) => {
+        clients.add(socket);
+        socket.setEncoding('utf8');
+        socket.setNoDelay(true);
+
+        let buffer = '';
+
+        socket.on('data', (chunk) => {
+            buffer += chunk;
+
+            let newline;
+            while ((newline = buffer.indexOf('\n')) !== -1) {
+                const line = buffer.slice(0, newline);
+                buffer = buffer.slice(newline + 1);
+                if (line.trim()) {
+                    handleLine(socket, line);
+                }
+            }
+        });
+        socket.on('close', () => clients.delete(socket));
+        socket.on('error', () => clients.delete(socket));
+    });
+
+    function handleLine(socket, line) {
+        let message;
+        try {
+            message = JSON.parse(line);
+        } catch (error) {
+            socket.write(encodeResponse(null, 400, JSON.stringify({ error: 'Invalid JSON' })));
+            return;
+        }
+
+        const onPartial = (line) => {
+            if (!socket.destroyed) {
+                socket.write(`{"id":${JSON.stringify(message.id)},"partial":${line}}\n`);
+            }
+        };
+
+        dispatch(app, message, onPartial)
+            .then(({ status, body }) => {
+                if (!socket.destroyed) {
+                    socket.write(encodeResponse(message.id, status, body));
+                }
+            })
+            .catch((error) => {
+                if (!socket.destroyed) {
+                    socket.write(encodeResponse(message.id, 500, JSON.stringify({ error: error.message })));
+                }
+            });
+    }
+
+    function broadcast(event, data) {
+        const line = JSON.stringify({ event, data }) + '\n';
+        for (const socket of clients) {
+            if (!socket.destroyed) {
+                socket.write(line);
+            }
+        }
+    }
+
+    function listen(callback) {
+        const { IPC_PATH, IPC_PORT } = process.env;
+        let started = false;
+
+        const start = () => {
+            if (!started) {
+                started = true;
+                callback();
+            }
+        };
+
+        // Без IPC канала клиенты работают через HTTP, поэтому ошибка сокета не должна ронять bridge
+        server.on('error', (error) => {
+            console.error(`IPC канал недоступен: ${error.message}`);
+            start();
+        });
+
+        if (IPC_PATH) {
+            try {
+                if (process.platform !== 'win32' && fs.existsSync(IPC_PATH)) {
+                    fs.unlinkSync(IPC_PATH);
+                }
+            } catch (error) {
+                console.error(`Не удалось удалить старый IPC сокет: ${error.message}`);
+            }
+            server.listen(IPC_PATH, start);
+        } else if (IPC_PORT) {
+            server.listen(Number(IPC_PORT), '127.0.0.1', start);
+        } else {
+            start();
+        }
+    }
+
+    return { server, broadcast, listen };
+}
+
+module.exports = { createIpcServer, dispatch };
@@ -0,0 +1,427 @@
+import atexit
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Type
+
+import requests
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from core import http_transport
+from .bridge_channel import (
+    DEFAULT_BATCH_CONCURRENCY, BridgeChannel, BridgeChannelError, BridgeUnavailableError,
+    batch_timeout, ipc_address, ipc_env,
+)
+
+
+READY_MARKER = "BRIDGE_READY"
+INITIAL_POLL_DELAY = 0.05
+MAX_POLL_DELAY = 1.0
+
+DEFAULT_HOST = "localhost"
+LOCAL_HOSTS = ("localhost", "127.0.0.1")
+DEFAULT_PORT = 3737
+IDLE_TIMEOUT = 300.0
+WATCH_INTERVAL = 1.0
+MAX_RESTART_DELAY = 30.0
+
+BridgeCommand = Tuple[List[str], str, Dict[str, str]]
+
+_cache_lock = threading.Lock()
+_node_path: Optional[str] = None
+_package_checks: Dict[str, Tuple[Tuple[int, ...], bool]] = {}
+
+
+def cached_node_path(finder: Callable[[], Optional[str]]) -> Optional[str]:
+    global _node_path
+    with _cache_lock:
+        if _node_path and os.path.isfile(_node_path):
+            return _node_path
+        _node_path = finder()
+        return _node_path
+
+
+def _packages_fingerprint(steam_api_dir: Path) -> Tuple[int, ...]:
+    fingerprint = []
+    for path in (steam_api_dir / "node_modules", steam_api_dir / "package.json", steam_api_dir / "package-lock.json"):
+        try:
+            fingerprint.append(path.stat().st_mtime_ns)
+        except OSError:
+            fingerprint.append(0)
+    return tuple(fingerprint)
+
+
+def cached_package_check(steam_api_dir: Path, check: Callable[[], bool]) -> bool:
+    key = str(steam_api_dir)
+    fingerprint = _packages_fingerprint(steam_api_dir)
+    with _cache_lock:
+        cached = _package_checks.get(key)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+
+    result = check()
+    with _cache_lock:
+        _package_checks[key] = (_packages_fingerprint(steam_api_dir), result)
+    return result
+
+
+def invalidate_package_check(steam_api_dir: Path):
+    with _cache_lock:
+        _package_checks.pop(str(steam_api_dir), None)
+
+
+class BridgeOutput:
+
+    def __init__(self, process: subprocess.Popen, ready_marker: str = READY_MARKER, tail: int = 50):
+        self.ready = threading.Event()
+        self.ready_marker = ready_marker
+        self.stderr: Deque[str] = deque(maxlen=tail)
+        self.stdout: Deque[str] = deque(maxlen=tail)
+        self._threads = []
+
+        for stream, lines, detect in ((process.stdout, self.stdout, True), (process.stderr, self.stderr, False)):
+            if stream is not None:
+                thread = threading.Thread(target=self._drain, args=(stream, lines, detect),
+                                          name=f"BridgeOutput-{process.pid}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _drain(self, stream, lines: Deque[str], detect: bool):
+        try:
+            for raw in iter(stream.readline, b''):
+                line = raw.decode('utf-8', errors='replace').rstrip()
+                lines.append(line)
+                if detect and not self.ready.is_set() and self.ready_marker in line:
+                    self.ready.set()
+        except (OSError, ValueError):
+            pass
+        finally:
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+    def join(self, timeout: float = 1.0):
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def error_text(self) -> str:
+        return "\n".join(self.stderr) or "\n".join(self.stdout) or "Неизвестная ошибка"
+
+
+def popen_bridge(args, cwd: Optional[str] = None, env: Optional[dict] = None) -> subprocess.Popen:
+    startupinfo = None
+    if os.name == 'nt':
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        startupinfo.wShowWindow = subprocess.SW_HIDE
+
+    return subprocess.Popen(
+        args,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        startupinfo=startupinfo,
+        creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == 'nt' else 0,
+        env=env,
+        cwd=cwd
+    )
+
+
+def wait_for_bridge(process: subprocess.Popen, output: BridgeOutput, health_check: Callable[[], bool],
+                    timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    delay = INITIAL_POLL_DELAY
+
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+
+        if output.ready.wait(min(delay, remaining)):
+            return True
+        if process.poll() is not None:
+            return False
+        if health_check():
+            return True
+
+        delay = min(delay * 2, MAX_POLL_DELAY)
+
+
+def terminate_bridge(process: subprocess.Popen, timeout: float = 5.0):
+    if process.poll() is not None:
+        return
+
+    try:
+        if os.name == 'nt':
+            os.kill(process.pid, signal.CTRL_BREAK_EVENT)
+        else:
+            process.terminate()
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait(timeout=timeout)
+
+
+class BridgeError(Exception):
+    pass
+
+
+class BridgeSupervisor:
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 idle_timeout: float = IDLE_TIMEOUT, watch_interval: float = WATCH_INTERVAL):
+        self.host = host
+        self.port = port
+        self.base_url = f"http://{host}:{port}/api"
+        self.idle_timeout = idle_timeout
+        self.watch_interval = watch_interval
+
+        self.process: Optional[subprocess.Popen] = None
+        self.output: Optional[BridgeOutput] = None
+        self.refs = 0
+        self.restarts = 0
+        self.ipc_address = ipc_address(port) if host in LOCAL_HOSTS else None
+        self._channel: Optional[BridgeChannel] = None
+
+        self._launcher: Optional[Callable[[], BridgeCommand]] = None
+        self._wait_time = 5.0
+        self._idle_since: Optional[float] = None
+        self._retry_at = 0.0
+        self._watchdog: Optional[threading.Thread] = None
+        self._lock = threading.RLock()
+
+    def is_alive(self) -> bool:
+        try:
+            response = http_transport.get(f"{self.base_url}/health", timeout=2)
+            return response.status_code == 200
+        except Exception:
+            return False
+
+    def is_running(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def channel(self) -> Optional[BridgeChannel]:
+        if self.ipc_address is None:
+            return None
+        with self._lock:
+            if self._channel is None:
+                self._channel = BridgeChannel(self.ipc_address)
+            return self._channel
+
+    def call(self, method: str, path: str, body: Optional[dict] = None, params: Optional[dict] = None,
+             timeout: Optional[float] = None, on_partial: Optional[Callable[[object], None]] = None) -> Tuple[int, object]:
+        channel = self.channel()
+        if channel is None:
+            raise BridgeUnavailableError(f"IPC канал недоступен для {self.host}")
+        return channel.call(method, path, body, params, timeout, on_partial)
+
+    def batch(self, path: str, session_ids: List[str],
+              on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+              concurrency: int = DEFAULT_BATCH_CONCURRENCY, error_type: Type[Exception] = BridgeError,
+              **fields) -> Dict[str, Dict[str, Any]]:
+        results: Dict[str, Dict[str, Any]] = {}
+
+        def deliver(result):
+            if not isinstance(result, dict) or 'sessionId' not in result:
+                return
+            results[result['sessionId']] = result
+            if on_result:
+                on_result(result['sessionId'], result)
+
+        data = {"sessionIds": list(session_ids), "concurrency": concurrency, **fields}
+
+        try:
+            status, final = self.call(
+                "POST", path, body=data,
+                timeout=batch_timeout(len(data["sessionIds"]), concurrency), on_partial=deliver
+            )
+        except BridgeUnavailableError:
+            self._http_batch(path, data, deliver, error_type)
+            return results
+        except BridgeChannelError as e:
+            raise error_type(f"Request failed: {str(e)}")
+
+        if status >= 400:
+            error_msg = final.get('error', 'Unknown error') if isinstance(final, dict) else final
+            raise error_type(f"API Error: {error_msg}")
+
+        return results
+
+    def _http_batch(self, path: str, data: Dict[str, Any], deliver: Callable[[Any], None],
+                    error_type: Type[Exception]):
+        url = f"http://{self.host}:{self.port}{path}"
+
+        try:
+            with http_transport.request("POST", url, json=data, stream=True) as response:
+                if response.status_code >= 400:
+                    raise error_type(f"API Error: {response.json().get('error', 'Unknown error')}")
+
+                for line in response.iter_lines():
+                    if line:
+                        deliver(json.loads(line))
+
+        except requests.exceptions.RequestException as e:
+            raise error_type(f"Request failed: {str(e)}")
+        except ValueError as e:
+            raise error_type(f"Invalid JSON response: {str(e)}")
+
+    def subscribe(self, event: str, callback: Callable[[str, object], None]):
+        channel = self.channel()
+        if channel is None:
+            raise BridgeUnavailableError(f"IPC канал недоступен для {self.host}")
+        channel.subscribe(event, callback)
+
+    def ensure_running(self, launcher: Callable[[], BridgeCommand], wait_time: float = 5.0) -> bool:
+        with self._lock:
+            self._launcher = launcher
+            self._wait_time = wait_time
+
+            if self.is_running():
+                return True
+            if self.process is None and self.is_alive():
+                print(f"Bridge уже запущен и отвечает на {self.base_url}")
+                return True
+
+            self._start()
+            return True
+
+    def acquire(self, launcher: Callable[[], BridgeCommand], wait_time: float = 5.0) -> bool:
+        with self._lock:
+            self.ensure_running(launcher, wait_time)
+            self.refs += 1
+            self._idle_since = None
+            return True
+
+    def release(self):
+        with self._lock:
+            if self.refs > 0:
+                self.refs -= 1
+            if self.refs == 0:
+                self._idle_since = time.monotonic()
+
+    def stop(self) -> bool:
+        with self._lock:
+            process = self.process
+            self.process = None
+            self.output = None
+            self._idle_since = None
+            channel = self._channel
+
+        if channel is not None:
+            channel.close()
+
+        if process is None or process.poll() is not None:
+            return True
+
+        try:
+            terminate_bridge(process)
+            print("✓ Steam Bridge сервер остановлен")
+            return True
+        except Exception as e:
+            print(f"Ошибка остановки bridge: {str(e)}")
+            return False
+
+    def _start(self):
+        args, cwd, env = self._launcher()
+        env = dict(env)
+        env['PORT'] = str(self.port)
+        if self.ipc_address is not None:
+            env.update(ipc_env(self.ipc_address))
+
+        started = time.monotonic()
+        process = popen_bridge(args, cwd=cwd, env=env)
+        output = BridgeOutput(process)
+
+        print(f"Запуск Steam Bridge сервера (PID: {process.pid})...")
+
+        if not wait_for_bridge(process, output, self.is_alive, self._wait_time):
+            if process.poll() is None:
+                terminate_bridge(process)
+                raise BridgeError("Steam Bridge сервер не отвечает после запуска")
+            output.join()
+            raise BridgeError(f"Bridge процесс завершился: {output.error_text()}")
+
+        self.process = process
+        self.output = output
+        self.restarts = 0
+        print(f"✓ Steam Bridge сервер запущен на {self.base_url} за {time.monotonic() - started:.2f}с")
+
+        if self._channel is not None and self._channel.has_listeners():
+            try:
+                self._channel.connect()
+            except BridgeUnavailableError as e:
+                print(f"⚠️ {e}")
+
+        if self._watchdog is None or not self._watchdog.is_alive():
+            self._watchdog = threading.Thread(target=self._watch, name=f"BridgeWatchdog-{self.port}", daemon=True)
+            self._watchdog.start()
+
+    def _watch(self):
+        while True:
+            time.sleep(self.watch_interval)
+
+            with self._lock:
+                if self.process is None:
+                    self._watchdog = None
+                    return
+
+                if self.refs == 0 and self._idle_since is not None \
+                        and time.monotonic() - self._idle_since >= self.idle_timeout:
+                    print("💤 Steam Bridge простаивает, останавливаем...")
+                    self.stop()
+                    self._watchdog = None
+                    return
+
+                if self.process.poll() is None or time.monotonic() < self._retry_at:
+                    continue
+
+                if self.refs == 0:
+                    self.process = None
+                    self.output = None
+                    self._watchdog = None
+                    return
+
+                self._restart()
+
+    def _restart(self):
+        code = self.process.poll()
+        self.output.join()
+        print(f"⚠️ Steam Bridge завершился с кодом {code}: {self.output.error_text()}")
+        print("🔄 Перезапуск Steam Bridge...")
+
+        try:
+            self._start()
+        except Exception as e:
+            self.restarts += 1
+            delay = min(2 ** self.restarts, MAX_RESTART_DELAY)
+            self._retry_at = time.monotonic() + delay
+            print(f"❌ Не удалось перезапустить Steam Bridge: {e}. Повтор через {delay:.0f}с")
+
+
+_supervisors: Dict[Tuple[str, int], BridgeSupervisor] = {}
+_supervisors_lock = threading.Lock()
+
+
+def get_bridge_supervisor(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> BridgeSupervisor:
+    with _supervisors_lock:
+        supervisor = _supervisors.get((host, port))
+        if supervisor is None:
+            supervisor = _supervisors[(host, port)] = BridgeSupervisor(host, port)
+        return supervisor
+
+
+def shutdown_bridges():
+    with _supervisors_lock:
+        supervisors = list(_supervisors.values())
+    for supervisor in supervisors:
+        supervisor.stop()
+
+
+atexit.register(shutdown_bridges)
@@ -4,15 +4,14 @@ const express = require('express');
 const bodyParser = require('body-parser');
 const fs = require('fs');
 const path = require('path');
-
-const app = express();
-app.use(bodyParser.json());
+const { streamBatch } = require('./bridge_batch');
 
 const PORT = process.env.PORT || 3738;
 
 const sessions = new Map();
+const router = express.Router();
 
-app.post('/api/login-mafile', async (req, res) => {
+router.post('/login-mafile', async (req, res) => {
     try {
         const { maFileData, sessionId } = req.body;
         
@@ -63,7 +62,7 @@ app.post('/api/login-mafile', async (req, res) => {
     }
 });
 
-app.post('/api/login-with-secrets', async (req, res) => {
+router.post('/login-with-secrets', async (req, res) => {
     try {
         const { username, password, sharedSecret, identitySecret, deviceId, sessionId } = req.body;
         
@@ -110,7 +109,7 @@ app.post('/api/login-with-secrets', async (req, res) => {
     }
 });
 
-app.get('/api/confirmations', async (req, res) => {
+router.get('/confirmations', async (req, res) => {
     try {
         const { sessionId } = req.query;
         
@@ -133,19 +132,7 @@ app.get('/api/confirmations', async (req, res) => {
                 return res.status(400).json({ error: err.message });
             }
 
-            const formattedConfirmations = confirmations.map(conf => ({
-                id: conf.id,
-                type: conf.type,
-                typeText: getConfirmationType(conf.type),
-                creator: conf.creator,
-                key: conf.key,
-                title: conf.title || '',
-                receiving: conf.receiving || '',
-                time: conf.time,
-                icon: conf.icon || '',
-                offerID: conf.offerID || null,
-                data: conf
-            }));
+            const formattedConfirmations = confirmations.map(formatConfirmation);
 
             res.json({
                 success: true,
@@ -160,7 +147,7 @@ app.get('/api/confirmations', async (req, res) => {
     }
 });
 
-app.post('/api/confirmations/:confirmationId/accept', async (req, res) => {
+router.post('/confirmations/:confirmationId/accept', async (req, res) => {
     try {
         const { sessionId } = req.body;
         const { confirmationId } = req.params;
@@ -217,7 +204,7 @@ app.post('/api/confirmations/:confirmationId/accept', async (req, res) => {
     }
 });
 
-app.post('/api/confirmations/:confirmationId/cancel', async (req, res) => {
+router.post('/confirmations/:confirmationId/cancel', async (req, res) => {
     try {
         const { sessionId } = req.body;
         const { confirmationId } = req.params;
@@ -274,7 +261,7 @@ app.post('/api/confirmations/:confirmationId/cancel', async (req, res) => {
     }
 });
 
-app.post('/api/confirmations/accept-all', async (req, res) => {
+router.post('/confirmations/accept-all', async (req, res) => {
     try {
         const { sessionId } = req.body;
         
@@ -326,7 +313,7 @@ app.post('/api/confirmations/accept-all', async (req, res) => {
     }
 });
 
-app.post('/api/confirmations/cancel-all', async (req, res) => {
+router.post('/confirmations/cancel-all', async (req, res) => {
     try {
         const { sessionId } = req.body;
         
@@ -394,7 +381,7 @@ app.post('/api/confirmations/cancel-all', async (req, res) => {
     }
 });
 
-app.get('/api/confirmations/:confirmationId/details', async (req, res) => {
+router.get('/confirmations/:confirmationId/details', async (req, res) => {
     try {
         const { sessionId } = req.query;
         const { confirmationId } = req.params;
@@ -425,7 +412,102 @@ app.get('/api/confirmations/:confirmationId/details', async (req, res) => {
     }
 });
 
-app.post('/api/logout', (req, res) => {
+function formatConfirmation(conf) {
+    return {
+        id: conf.id,
+        type: conf.type,
+        typeText: getConfirmationType(conf.type),
+        creator: conf.creator,
+        key: conf.key,
+        title: conf.title || '',
+        receiving: conf.receiving || '',
+        time: conf.time,
+        icon: conf.icon || '',
+        offerID: conf.offerID || null,
+        data: conf
+    };
+}
+
+function sessionFor(sessionId) {
+    const session = sessions.get(sessionId);
+    if (!session) {
+        throw new Error('Invalid session');
+    }
+    return session;
+}
+
+function fetchConfirmations(session) {
+    return new Promise((resolve, reject) => {
+        const time = Math.floor(Date.now() / 1000);
+        const key = SteamTotp.getConfirmationKey(session.identitySecret, time, 'conf');
+
+        session.community.getConfirmations(time, key, (err, confirmations) => {
+            if (err) {
+                return reject(err);
+            }
+            resolve(confirmations);
+        });
+    });
+}
+
+async function acceptAllConfirmations(session) {
+    const confirmations = await fetchConfirmations(session);
+
+    if (confirmations.length === 0) {
+        return { accepted: 0, confirmations: [] };
+    }
+
+    return new Promise((resolve, reject) => {
+        const time = Math.floor(Date.now() / 1000);
+        const key = SteamTotp.getConfirmationKey(session.identitySecret, time, 'allow');
+        const ids = confirmations.map(c => c.id);
+        const keys = confirmations.map(c => c.key);
+
+        session.community.respondToConfirmation(ids, keys, time, key, true, (err) => {
+            if (err) {
+                return reject(err);
+            }
+            resolve({ accepted: ids.length, confirmations: ids });
+        });
+    });
+}
+
+router.post('/batch/confirmations', async (req, res) => {
+    try {
+        const { sessionIds, concurrency } = req.body;
+
+        await streamBatch(res, sessionIds, concurrency, async (sessionId) => {
+            const confirmations = (await fetchConfirmations(sessionFor(sessionId))).map(formatConfirmation);
+            return { confirmations: confirmations, count: confirmations.length };
+        });
+
+    } catch (error) {
+        console.error('Batch confirmations exception:', error);
+        if (!res.headersSent) {
+            res.status(500).json({ error: error.message });
+        } else {
+            res.end();
+        }
+    }
+});
+
+router.post('/batch/confirmations/accept-all', async (req, res) => {
+    try {
+        const { sessionIds, concurrency } = req.body;
+
+        await streamBatch(res, sessionIds, concurrency, (sessionId) => acceptAllConfirmations(sessionFor(sessionId)));
+
+    } catch (error) {
+        console.error('Batch accept all confirmations exception:', error);
+        if (!res.headersSent) {
+            res.status(500).json({ error: error.message });
+        } else {
+            res.end();
+        }
+    }
+});
+
+router.post('/logout', (req, res) => {
     try {
         const { sessionId } = req.body;
         
@@ -433,6 +515,12 @@ app.post('/api/logout', (req, res) => {
             return res.status(401).json({ error: 'Invalid session' });
         }
 
+        const session = sessions.get(sessionId);
+
+        if (session.manager) {
+            session.manager.shutdown();
+        }
+
         sessions.delete(sessionId);
         res.json({ success: true });
 
@@ -441,7 +529,7 @@ app.post('/api/logout', (req, res) => {
     }
 });
 
-app.get('/api/health', (req, res) => {
+router.get('/health', (req, res) => {
     res.json({
         status: 'ok',
         activeSessions: sessions.size,
@@ -477,19 +565,28 @@ function generateDeviceId() {
     return id;
 }
 
-setInterval(() => {
-    const now = Date.now();
-    const MAX_SESSION_AGE = 12 * 60 * 60 * 1000;
+module.exports = { router, sessions };
+
+if (require.main === module) {
+    const app = express();
+    app.use(bodyParser.json());
+    app.use('/api', router);
 
-    for (const [sid, session] of sessions.entries()) {
-        if (now - session.createdAt > MAX_SESSION_AGE) {
-            sessions.delete(sid);
-            console.log(`Session ${sid} expired and removed`);
+    setInterval(() => {
+        const now = Date.now();
+        const MAX_SESSION_AGE = 12 * 60 * 60 * 1000;
+
+        for (const [sid, session] of sessions.entries()) {
+            if (now - session.createdAt > MAX_SESSION_AGE) {
+                sessions.delete(sid);
+                console.log(`Session ${sid} expired and removed`);
+            }
         }
-    }
-}, 30 * 60 * 1000);
+    }, 30 * 60 * 1000);
 
-app.listen(PORT, () => {
-    console.log(`Steam Confirmations Bridge Server running on port ${PORT}`);
-    console.log(`Health check: http://localhost:${PORT}/api/health`);
-});
+    app.listen(PORT, () => {
+        console.log(`BRIDGE_READY ${PORT}`);
+        console.log(`Steam Confirmations Bridge Server running on port ${PORT}`);
+        console.log(`Health check: http://localhost:${PORT}/api/health`);
+    });
+}
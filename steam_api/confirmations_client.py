@@ -5,9 +5,15 @@ import time
 import os
 import signal
 import json
-from typing import Optional, List, Dict, Any
+import sys
+from typing import Optional, List, Dict, Any, Callable
 from pathlib import Path
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from core import http_transport
+from .bridge_channel import DEFAULT_BATCH_CONCURRENCY, BridgeChannelError, BridgeUnavailableError
+from .bridge_supervisor import DEFAULT_HOST, DEFAULT_PORT, get_bridge_supervisor
+
 
 class ConfirmationsAPIError(Exception):
     pass
@@ -20,97 +26,80 @@ class ConfirmationsClient:
         
         
     
-    def __init__(self, host: str = "localhost", port: int = 3738, auto_start: bool = False):
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, auto_start: bool = False):
         self.host = host
         self.port = port
-        self.base_url = f"http://{host}:{port}/api"
-        self.bridge_process: Optional[subprocess.Popen] = None
+        self.api_path = "/api/mobile"
+        self.base_url = f"http://{host}:{port}{self.api_path}"
+        self.supervisor = get_bridge_supervisor(host, port)
+        self._bridge_acquired = False
         
         if auto_start:
             self.start_bridge()
     
+    @property
+    def bridge_process(self) -> Optional[subprocess.Popen]:
+        return self.supervisor.process
+    
     def start_bridge(self, wait_time: int = 3) -> bool:
         
             
-        if self.bridge_process and self.bridge_process.poll() is None:
-            print("Confirmations Bridge уже запущен")
-            return True
-        
-        script_dir = Path(__file__).parent
-        bridge_script = script_dir / "confirmations_bridge.js"
-        
-        if not bridge_script.exists():
-            raise ConfirmationsAPIError(f"Bridge script не найден: {bridge_script}")
-        
         try:
-            startupinfo = None
-            if os.name == 'nt':
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                startupinfo.wShowWindow = subprocess.SW_HIDE
-            
-            self.bridge_process = subprocess.Popen(
-                ["node", str(bridge_script)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                startupinfo=startupinfo,
-                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == 'nt' else 0
-            )
+            from .steam_client import SteamClient
+            launcher = SteamClient(self.host, self.port).bridge_command
             
-            print(f"Запуск Confirmations Bridge сервера (PID: {self.bridge_process.pid})...")
-            time.sleep(wait_time)
+            if self._bridge_acquired:
+                return self.supervisor.ensure_running(launcher, wait_time)
             
-            if self.is_alive():
-                print(f"✓ Confirmations Bridge сервер запущен на {self.base_url}")
-                return True
-            else:
-                raise ConfirmationsAPIError("Не удалось запустить bridge сервер")
+            self.supervisor.acquire(launcher, wait_time)
+            self._bridge_acquired = True
+            return True
                 
         except Exception as e:
             raise ConfirmationsAPIError(f"Ошибка запуска bridge: {str(e)}")
     
     def stop_bridge(self) -> bool:
         
-        if not self.bridge_process:
-            print("Confirmations Bridge не запущен")
+        if not self._bridge_acquired:
             return True
         
-        try:
-            if os.name == 'nt':
-                os.kill(self.bridge_process.pid, signal.CTRL_BREAK_EVENT)
-            else:
-                self.bridge_process.terminate()
-            
-            self.bridge_process.wait(timeout=5)
-            print("✓ Confirmations Bridge сервер остановлен")
-            self.bridge_process = None
-            return True
-            
-        except subprocess.TimeoutExpired:
-            self.bridge_process.kill()
-            self.bridge_process = None
-            print("✓ Confirmations Bridge сервер принудительно остановлен")
-            return True
-        except Exception as e:
-            print(f"Ошибка остановки bridge: {str(e)}")
-            return False
+        self._bridge_acquired = False
+        self.supervisor.release()
+        return True
     
     def is_alive(self) -> bool:
         
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=2)
+            response = http_transport.get(f"{self.base_url}/health", timeout=2)
             return response.status_code == 200
         except:
             return False
     
     def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         
-            
-            
+        try:
+            status, data = self.supervisor.call(
+                method, f"{self.api_path}/{endpoint}",
+                body=kwargs.get('json'), params=kwargs.get('params'), timeout=kwargs.get('timeout')
+            )
+        except BridgeUnavailableError:
+            return self._http_request(method, endpoint, **kwargs)
+        except BridgeChannelError as e:
+            raise ConfirmationsAPIError(f"Request failed: {str(e)}")
+        
+        if not isinstance(data, dict):
+            raise ConfirmationsAPIError(f"Invalid JSON response: {data!r}")
+        if status >= 400:
+            raise ConfirmationsAPIError(f"API Error: {data.get('error', 'Unknown error')}")
+        
+        return data
+    
+    def _http_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        
         url = f"{self.base_url}/{endpoint}"
         
         try:
-            response = requests.request(method, url, **kwargs)
+            response = http_transport.request(method, url, **kwargs)
             data = response.json()
             
             if response.status_code >= 400:
@@ -124,6 +113,14 @@ class ConfirmationsClient:
         except ValueError as e:
             raise ConfirmationsAPIError(f"Invalid JSON response: {str(e)}")
     
+    def _batch_request(self, endpoint: str, session_ids: List[str],
+                       on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                       concurrency: int = DEFAULT_BATCH_CONCURRENCY, **fields) -> Dict[str, Dict[str, Any]]:
+        
+        return self.supervisor.batch(
+            f"{self.api_path}/{endpoint}", session_ids, on_result, concurrency, ConfirmationsAPIError, **fields
+        )
+    
     def login_with_mafile(
         self,
         mafile_path: str,
@@ -245,6 +242,24 @@ class ConfirmationsClient:
         
         return result
     
+    def get_confirmations_many(
+        self,
+        session_ids: List[str],
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        
+        return self._batch_request("batch/confirmations", session_ids, on_result, concurrency)
+    
+    def accept_all_confirmations_many(
+        self,
+        session_ids: List[str],
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        
+        return self._batch_request("batch/confirmations/accept-all", session_ids, on_result, concurrency)
+    
     def cancel_all_confirmations(self, session_id: str) -> Dict[str, Any]:
         
             
@@ -279,7 +294,7 @@ class ConfirmationsClient:
         self.stop_bridge()
     
     def __del__(self):
-        if self.bridge_process and self.bridge_process.poll() is None:
+        if getattr(self, '_bridge_acquired', False):
             self.stop_bridge()
 
 
@@ -3,13 +3,38 @@ const TradeOfferManager = require('steam-tradeoffer-manager');
 const SteamTotp = require('steam-totp');
 const express = require('express');
 const bodyParser = require('body-parser');
+const confirmationsBridge = require('./confirmations_bridge');
+const { createIpcServer } = require('./bridge_ipc');
+const { streamBatch } = require('./bridge_batch');
 
 const app = express();
 app.use(bodyParser.json());
 
 const PORT = process.env.PORT || 3737;
 
-const sessions = new Map();
+// Один процесс обслуживает и трейды, и мобильные подтверждения: карта сессий общая
+const sessions = confirmationsBridge.sessions;
+app.use('/api/mobile', confirmationsBridge.router);
+
+const ipc = createIpcServer(app);
+
+function offerEvent(sessionId, offer) {
+    return {
+        sessionId: sessionId,
+        offerId: offer.id,
+        state: offer.state,
+        partner: offer.partner ? offer.partner.getSteamID64() : null,
+        isOurOffer: offer.isOurOffer,
+        confirmationMethod: offer.confirmationMethod
+    };
+}
+
+function forwardSessionEvents(sessionId, community, manager) {
+    manager.on('newOffer', (offer) => ipc.broadcast('newOffer', offerEvent(sessionId, offer)));
+    manager.on('sentOfferChanged', (offer) => ipc.broadcast('sentOfferChanged', offerEvent(sessionId, offer)));
+    manager.on('receivedOfferChanged', (offer) => ipc.broadcast('receivedOfferChanged', offerEvent(sessionId, offer)));
+    community.on('sessionExpired', () => ipc.broadcast('sessionExpired', { sessionId: sessionId }));
+}
 
 app.post('/api/login', async (req, res) => {
     try {
@@ -56,6 +81,7 @@ app.post('/api/login', async (req, res) => {
             });
 
             manager.setCookies(cookies);
+            forwardSessionEvents(sid, community, manager);
 
             res.json({
                 success: true,
@@ -105,6 +131,7 @@ app.post('/api/login-2fa', async (req, res) => {
             });
 
             manager.setCookies(cookies);
+            forwardSessionEvents(sid, community, manager);
 
             res.json({
                 success: true,
@@ -405,6 +432,45 @@ app.get('/api/trade/offers', async (req, res) => {
     }
 });
 
+function formatOffer(offer) {
+    return {
+        id: offer.id,
+        state: offer.state,
+        message: offer.message,
+        created: offer.created,
+        updated: offer.updated
+    };
+}
+
+app.post('/api/batch/trade/offers', async (req, res) => {
+    try {
+        const { sessionIds, filter, concurrency } = req.body;
+        const filterType = filter || 'active';
+
+        await streamBatch(res, sessionIds, concurrency, (sessionId) => new Promise((resolve, reject) => {
+            const session = sessions.get(sessionId);
+            if (!session || !session.manager) {
+                return reject(new Error('Invalid session'));
+            }
+
+            session.manager.getOffers(filterType === 'active' ? 1 : 2, (err, sent, received) => {
+                if (err) {
+                    return reject(err);
+                }
+                resolve({ sent: sent.map(formatOffer), received: received.map(formatOffer) });
+            });
+        }));
+
+    } catch (error) {
+        console.error('[ERROR] Batch trade offers error:', error);
+        if (!res.headersSent) {
+            res.status(500).json({ error: error.message });
+        } else {
+            res.end();
+        }
+    }
+});
+
 app.get('/api/inventory/:steamId/:appId/:contextId', async (req, res) => {
     try {
         const { sessionId } = req.query;
@@ -478,7 +544,8 @@ app.get('/api/health', (req, res) => {
     res.json({
         status: 'ok',
         activeSessions: sessions.size,
-        uptime: process.uptime()
+        uptime: process.uptime(),
+        services: ['trade', 'confirmations']
     });
 });
 
@@ -1030,7 +1097,10 @@ setInterval(() => {
     }
 }, 30 * 60 * 1000);
 
-app.listen(PORT, () => {
-    console.log(`Steam Bridge Server running on port ${PORT}`);
-    console.log(`Health check: http://localhost:${PORT}/api/health`);
+ipc.listen(() => {
+    app.listen(PORT, () => {
+        console.log(`BRIDGE_READY ${PORT}`);
+        console.log(`Steam Bridge Server running on port ${PORT}`);
+        console.log(`Health check: http://localhost:${PORT}/api/health`);
+    });
 });
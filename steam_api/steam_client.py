@@ -15,9 +15,17 @@ except ImportError:
 
 from pathlib import Path
 from typing import Optional, Dict, Any, List
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Tuple, Callable
 from pathlib import Path
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from core import http_transport
+from .bridge_channel import DEFAULT_BATCH_CONCURRENCY, BridgeChannelError, BridgeUnavailableError
+from .bridge_supervisor import (
+    DEFAULT_HOST, DEFAULT_PORT, BridgeCommand, BridgeOutput, cached_node_path, cached_package_check,
+    get_bridge_supervisor
+)
+
 
 class SteamAPIError(Exception):
     pass
@@ -29,15 +37,25 @@ class SteamClient:
         
         
     
-    def __init__(self, host: str = "localhost", port: int = 3737, auto_start: bool = False):
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, auto_start: bool = False):
         self.host = host
         self.port = port
-        self.base_url = f"http://{host}:{port}/api"
-        self.bridge_process: Optional[subprocess.Popen] = None
+        self.api_path = "/api"
+        self.base_url = f"http://{host}:{port}{self.api_path}"
+        self.supervisor = get_bridge_supervisor(host, port)
+        self._bridge_acquired = False
         
         if auto_start:
             self.start_bridge()
     
+    @property
+    def bridge_process(self) -> Optional[subprocess.Popen]:
+        return self.supervisor.process
+    
+    @property
+    def bridge_output(self) -> Optional[BridgeOutput]:
+        return self.supervisor.output
+    
     def _find_node_executable(self) -> Optional[str]:
         
         import shutil
@@ -159,16 +177,7 @@ class SteamClient:
             print(f"❌ Ошибка установки npm пакетов: {e}")
             return False
     
-    def start_bridge(self, wait_time: int = 5) -> bool:
-        
-            
-        if self.is_alive():
-            print("Bridge уже запущен и отвечает")
-            return True
-            
-        if self.bridge_process and self.bridge_process.poll() is None:
-            print("Bridge процесс существует, но не отвечает. Перезапускаем...")
-            self.stop_bridge()
+    def bridge_command(self) -> BridgeCommand:
         
         script_dir = Path(__file__).parent
         
@@ -183,136 +192,124 @@ class SteamClient:
             if getattr(sys, 'frozen', False):
                 working_dir = Path(sys.executable).parent / "steam_api"
                 working_dir.mkdir(exist_ok=True)
-                temp_bridge = Path(sys._MEIPASS) / "steam_api" / "steam_bridge.js"
                 
-                if temp_bridge.exists():
-                    import shutil
-                    target_bridge = working_dir / "steam_bridge.js"
-                    shutil.copy2(temp_bridge, target_bridge)
-                    bridge_script = target_bridge
-                    print(f"📄 Скопирован bridge script: {bridge_script}")
+                import shutil
+                for script_name in ("steam_bridge.js", "confirmations_bridge.js"):
+                    temp_script = Path(sys._MEIPASS) / "steam_api" / script_name
+                    if temp_script.exists():
+                        shutil.copy2(temp_script, working_dir / script_name)
+                        print(f"📄 Скопирован bridge script: {working_dir / script_name}")
+                bridge_script = working_dir / "steam_bridge.js"
             
             if not bridge_script.exists():
                 raise SteamAPIError(f"Bridge script не найден: {bridge_script}")
         
         print(f"🌉 Используется bridge script: {bridge_script}")
         
-        try:
-            node_path = self._find_node_executable()
-            if not node_path:
-                error_message = (
-                    "Node.js не найден!\n\n"
-                    "Возможные решения:\n"
-                    "1. Скачайте и установите Node.js с https://nodejs.org/\n"
-                    "2. Перезапустите программу после установки\n"
-                    "3. Если Node.js уже установлен, добавьте его в PATH\n"
-                    "4. Обратитесь в поддержку для получения портативной версии\n\n"
-                    "Программа ищет Node.js в следующих местах:\n"
-                    "- В папке приложения (node/node.exe)\n"
-                    "- В переменной PATH\n"
-                    "- C:\\Program Files\\nodejs\\node.exe\n"
-                    "- C:\\Program Files (x86)\\nodejs\\node.exe"
-                )
-                raise SteamAPIError(error_message)
-            
-            if not self._check_npm_packages():
-                print("📦 Установка необходимых npm пакетов...")
-                if not self._install_npm_packages():
-                    raise SteamAPIError("Не удалось установить npm пакеты для Steam API")
-            
-            env = os.environ.copy()
-            
-            if getattr(sys, 'frozen', False):
-                steam_api_dir = Path(sys.executable).parent / "steam_api"
-            else:
-                steam_api_dir = Path(__file__).parent
-            
-            node_modules_path = steam_api_dir / "node_modules"
-            
-            if node_modules_path.exists():
-                env['NODE_PATH'] = str(node_modules_path)
-                print(f"🔧 NODE_PATH установлен: {node_modules_path}")
-            
-            cwd = bridge_script.parent
-            
-            startupinfo = None
-            if os.name == 'nt':
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                startupinfo.wShowWindow = subprocess.SW_HIDE
-            
-            print(f"🚀 Запуск Node.js: {node_path} {bridge_script}")
-            print(f"📁 Рабочая папка: {cwd}")
-            
-            self.bridge_process = subprocess.Popen(
-                [node_path, str(bridge_script)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                startupinfo=startupinfo,
-                creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == 'nt' else 0,
-                env=env,
-                cwd=str(cwd)
+        node_path = cached_node_path(self._find_node_executable)
+        if not node_path:
+            error_message = (
+                "Node.js не найден!\n\n"
+                "Возможные решения:\n"
+                "1. Скачайте и установите Node.js с https://nodejs.org/\n"
+                "2. Перезапустите программу после установки\n"
+                "3. Если Node.js уже установлен, добавьте его в PATH\n"
+                "4. Обратитесь в поддержку для получения портативной версии\n\n"
+                "Программа ищет Node.js в следующих местах:\n"
+                "- В папке приложения (node/node.exe)\n"
+                "- В переменной PATH\n"
+                "- C:\\Program Files\\nodejs\\node.exe\n"
+                "- C:\\Program Files (x86)\\nodejs\\node.exe"
             )
+            raise SteamAPIError(error_message)
+        
+        if getattr(sys, 'frozen', False):
+            steam_api_dir = Path(sys.executable).parent / "steam_api"
+        else:
+            steam_api_dir = Path(__file__).parent
+        
+        if not cached_package_check(steam_api_dir, self._check_npm_packages):
+            print("📦 Установка необходимых npm пакетов...")
+            if not self._install_npm_packages():
+                raise SteamAPIError("Не удалось установить npm пакеты для Steam API")
+        
+        env = os.environ.copy()
+        
+        node_modules_path = steam_api_dir / "node_modules"
+        
+        if node_modules_path.exists():
+            env['NODE_PATH'] = str(node_modules_path)
+            print(f"🔧 NODE_PATH установлен: {node_modules_path}")
+        
+        cwd = bridge_script.parent
+        
+        print(f"🚀 Запуск Node.js: {node_path} {bridge_script}")
+        print(f"📁 Рабочая папка: {cwd}")
+        
+        return [node_path, str(bridge_script)], str(cwd), env
+    
+    def start_bridge(self, wait_time: int = 5) -> bool:
+        
+        try:
+            if self._bridge_acquired:
+                return self.supervisor.ensure_running(self.bridge_command, wait_time)
             
-            print(f"Запуск Steam Bridge сервера (PID: {self.bridge_process.pid})...")
-            
-            for i in range(wait_time):
-                time.sleep(1)
-                if self.is_alive():
-                    print(f"✓ Steam Bridge сервер запущен на {self.base_url}")
-                    return True
-                elif self.bridge_process.poll() is not None:
-                    stdout, stderr = self.bridge_process.communicate()
-                    error_msg = stderr.decode() if stderr else "Неизвестная ошибка"
-                    raise SteamAPIError(f"Bridge процесс завершился: {error_msg}")
-            
-            raise SteamAPIError("Steam Bridge сервер не отвечает после запуска")
+            self.supervisor.acquire(self.bridge_command, wait_time)
+            self._bridge_acquired = True
+            return True
                 
         except Exception as e:
             raise SteamAPIError(f"Ошибка запуска bridge: {str(e)}")
     
     def stop_bridge(self) -> bool:
         
-        if not self.bridge_process:
-            print("Bridge не запущен")
+        if not self._bridge_acquired:
             return True
         
+        self._bridge_acquired = False
+        self.supervisor.release()
+        return True
+    
+    def subscribe(self, event: str, callback: Callable[[str, Any], None]):
+        
         try:
-            if os.name == 'nt':
-                os.kill(self.bridge_process.pid, signal.CTRL_BREAK_EVENT)
-            else:
-                self.bridge_process.terminate()
-            
-            self.bridge_process.wait(timeout=5)
-            print("✓ Steam Bridge сервер остановлен")
-            self.bridge_process = None
-            return True
-            
-        except subprocess.TimeoutExpired:
-            self.bridge_process.kill()
-            self.bridge_process = None
-            print("✓ Steam Bridge сервер принудительно остановлен")
-            return True
-        except Exception as e:
-            print(f"Ошибка остановки bridge: {str(e)}")
-            return False
+            self.supervisor.subscribe(event, callback)
+        except BridgeChannelError as e:
+            raise SteamAPIError(f"Не удалось подписаться на события bridge: {str(e)}")
     
     def is_alive(self) -> bool:
         
         try:
-            response = requests.get(f"{self.base_url}/health", timeout=2)
+            response = http_transport.get(f"{self.base_url}/health", timeout=2)
             return response.status_code == 200
         except:
             return False
     
     def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         
-            
-            
+        try:
+            status, data = self.supervisor.call(
+                method, f"{self.api_path}/{endpoint}",
+                body=kwargs.get('json'), params=kwargs.get('params'), timeout=kwargs.get('timeout')
+            )
+        except BridgeUnavailableError:
+            return self._http_request(method, endpoint, **kwargs)
+        except BridgeChannelError as e:
+            raise SteamAPIError(f"Request failed: {str(e)}")
+        
+        if not isinstance(data, dict):
+            raise SteamAPIError(f"Invalid JSON response: {data!r}")
+        if status >= 400:
+            raise SteamAPIError(f"API Error: {data.get('error', 'Unknown error')}")
+        
+        return data
+    
+    def _http_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+        
         url = f"{self.base_url}/{endpoint}"
         
         try:
-            response = requests.request(method, url, **kwargs)
+            response = http_transport.request(method, url, **kwargs)
             data = response.json()
             
             if response.status_code >= 400:
@@ -326,6 +323,14 @@ class SteamClient:
         except ValueError as e:
             raise SteamAPIError(f"Invalid JSON response: {str(e)}")
     
+    def _batch_request(self, endpoint: str, session_ids: List[str],
+                       on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                       concurrency: int = DEFAULT_BATCH_CONCURRENCY, **fields) -> Dict[str, Dict[str, Any]]:
+        
+        return self.supervisor.batch(
+            f"{self.api_path}/{endpoint}", session_ids, on_result, concurrency, SteamAPIError, **fields
+        )
+    
     def login(
         self, 
         username: str, 
@@ -485,6 +490,18 @@ class SteamClient:
             params={"sessionId": session_id, "filter": filter_type}
         )
     
+    def get_trade_offers_many(
+        self,
+        session_ids: List[str],
+        filter_type: str = "active",
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        
+        return self._batch_request(
+            "batch/trade/offers", session_ids, on_result, concurrency, filter=filter_type
+        )
+    
     def get_inventory(
         self,
         session_id: str,
@@ -568,7 +585,7 @@ class SteamClient:
         self.stop_bridge()
     
     def __del__(self):
-        if self.bridge_process and self.bridge_process.poll() is None:
+        if getattr(self, '_bridge_acquired', False):
             self.stop_bridge()
 
 